@@ -0,0 +1,255 @@
+"""versioned JSON api (v1) for the calculators, numbers only (no plots or templates)
+
+POST a single input object or an array of input objects, e.g. to /api/v1/scf/kt. Every input is evaluated in one
+vectorised engine call and the results are returned as one array per output column (or one value per column for a
+single input object). Calculation options (e.g. load_type) are query parameters and apply to the whole request.
+Angles are in degrees, as on the pages. The fatigue endpoint takes the joints and one stress histogram, see
+fatigue_route.
+"""
+import numpy as np
+from flask import jsonify, request
+# local
+from tubularjointscfs.scfengine import K_LOAD_TYPES, K_LOCS, KT_LOCS, k_joint_scfs_arr, kt_joint_scfs_arr
+from tubularjointscfs.jointfatigue import TOE_LOCS, toe_scfs_arr, joint_fatigue, k_joint_fatigue
+from tubularjointscfs.efthymiou.damage import DamageError
+from rrfs.rrfengine import LOAD_MODES, joints_from_parameters, calc_rrfs
+from conescfs.scfs import small_junction_mask, calc_cone_scfs_sect3_arr, calc_cone_scfs_appf17_arr
+from conescfs.thktransitionscfs import calc_scf_thickness_transition_arr
+from conescfs.scfprocess import cone_tt_scf_combine_arr
+
+# input fields of each calculator, field: default (None if required). Same names as the page forms
+SCF_FIELDS = {
+    "k": {"D": None, "T": None, "dA": None, "tA": None, "thetaA": None, "dB": None, "tB": None, "thetaB": None,
+          "g_ab": None, "L": None},
+    "kt": {"D": None, "T": None, "dA": None, "tA": None, "thetaA": None, "dB": None, "tB": None, "thetaB": None,
+           "dC": None, "tC": None, "thetaC": None, "g_ab": None, "g_bc": None, "L": None},
+    "x": {"D": None, "T": None, "d": None, "t": None, "theta": None, "L": None},
+    "ty": {"D": None, "T": None, "d": None, "t": None, "theta": None, "L": None},
+}
+# load types of each joint type (the first is the default), TY joint SCFs are single brace load only
+ALLOWED_LOAD_TYPES = {"k": K_LOAD_TYPES, "kt": K_LOAD_TYPES, "x": ["balanced_forces", "single_brace_load"],
+                      "ty": ["single_brace_load"]}
+SCF_LOAD_TYPES = {jt_type: load_types[0] for jt_type, load_types in ALLOWED_LOAD_TYPES.items()}
+# decimal places, as KTJointSCFManager and XTYJointSCFManager
+SCF_NDPS = {"k": 2, "kt": 2, "x": 5, "ty": 5}
+RRF_FIELDS = {"beta": None, "gamma": None, "tau": None, "theta": 90., "zeta": np.nan}
+CONE_FIELDS = {"radius_tubular": None, "thickness_tubular": None, "thickness_cone": None, "alpha": None,
+               "weld_width": 75., "delta_m": 4., "delta_0": 1.85}
+CONE_LOCS = ["tube_in", "cone_in", "tube_out", "cone_out"]
+
+
+class ApiError(Exception):
+    """bad api request, returned as a 400 json error
+    """
+
+
+def parse_inputs(fields, data=None):
+    """numeric input arrays from a json body of one object or an array of objects
+
+    Args:
+        fields: dict of field name to default, None if the field is required
+        data: decoded json body, request.get_json() if None
+
+    Returns:
+        (dict of numpy arrays, bool), the inputs and whether a single object was posted
+    """
+    data = request.get_json(silent=True) if data is None else data
+    single = isinstance(data, dict)
+    rows = [data] if single else data
+    if not isinstance(rows, list) or not rows or not all(isinstance(row, dict) for row in rows):
+        raise ApiError("expecting a JSON object or a non-empty array of objects")
+
+    inputs = {}
+    for field, default in fields.items():
+        vals = [row.get(field, default) for row in rows]
+        if any(v is None for v in vals):
+            raise ApiError(f"required field '{field}' missing")
+        try:
+            inputs[field] = np.asarray(vals, dtype=float)
+        except (TypeError, ValueError):
+            raise ApiError(f"field '{field}' must be numeric")
+    return inputs, single
+
+
+def get_option(name, default, allowed=None):
+    """query string calculation option, checked against the allowed values
+    """
+    val = request.args.get(name, default)
+    if allowed is not None and val not in allowed:
+        raise ApiError(f"{name} must be one of {list(allowed)}")
+    return val
+
+
+def to_json_vals(arr, ndps=None, single=False):
+    """json safe values of an array, non-finite values as null
+    """
+    arr = np.asarray(arr, dtype=float)
+    if ndps is not None:
+        arr = np.round(arr, ndps)
+    vals = np.where(np.isfinite(arr), arr, None).tolist()
+    return vals[0] if single else vals
+
+
+def api_response(results, single, ndps=None):
+    """json response of named result arrays
+    """
+    n = len(next(iter(results.values())))
+    return jsonify({"status": "success",
+                    "count": n,
+                    "results": {name: to_json_vals(vals, ndps, single) for name, vals in results.items()}})
+
+
+def api_error(e, status_code=400):
+    return jsonify({"status": "error", "error": str(e)}), status_code
+
+
+def scf_route(jt_type):
+    """POST /api/v1/scf/<jt_type>, joint type k, kt, x or ty. Query option load_type (as the joint page), one of
+    ALLOWED_LOAD_TYPES[jt_type], any other value is a 400
+    """
+    if jt_type not in SCF_FIELDS:
+        return api_error(f"joint type {jt_type} not recognised, use one of {list(SCF_FIELDS)}", 404)
+    try:
+        inputs, single = parse_inputs(SCF_FIELDS[jt_type])
+        load_type = get_option("load_type", SCF_LOAD_TYPES[jt_type], allowed=ALLOWED_LOAD_TYPES[jt_type])
+        scfs, locs = calc_scfs(jt_type, inputs, load_type)
+    except (ApiError, ValueError) as e:
+        return api_error(e)
+    except Exception as e:  # engine validity checks raise Exception, e.g. zero gaps
+        return api_error(e, 422)
+    return api_response(dict(zip(locs, scfs)), single, SCF_NDPS[jt_type])
+
+
+def calc_scfs(jt_type, inputs, load_type):
+    """SCFs from the api inputs (angles in degrees), load_type one of ALLOWED_LOAD_TYPES[jt_type]
+
+    Returns:
+        (numpy array (n_locs, n), list of location names)
+    """
+    if load_type not in ALLOWED_LOAD_TYPES[jt_type]:
+        raise ValueError(f"load_type {load_type} not allowed for {jt_type} joints, use one of "
+                         f"{ALLOWED_LOAD_TYPES[jt_type]}")
+    i = inputs
+    if jt_type == "k":
+        scfs = k_joint_scfs_arr(i["D"], i["dA"], i["dB"], i["T"], i["tA"], i["tB"], np.radians(i["thetaA"]),
+                                np.radians(i["thetaB"]), i["g_ab"], i["L"], load_type)
+        return scfs, K_LOCS
+    if jt_type == "kt":
+        scfs = kt_joint_scfs_arr(i["D"], i["dA"], i["dB"], i["dC"], i["T"], i["tA"], i["tB"], i["tC"],
+                                 np.radians(i["thetaA"]), np.radians(i["thetaB"]), np.radians(i["thetaC"]),
+                                 i["g_ab"], i["g_bc"], i["L"], load_type)
+        return scfs, KT_LOCS
+    scfs = toe_scfs_arr(i["D"], i["T"], i["d"], i["t"], np.radians(i["theta"]), i["L"], jt_type, load_type)
+    return scfs, TOE_LOCS
+
+
+def fatigue_route(jt_type):
+    """POST /api/v1/fatigue/<jt_type>, weld toe and weld root fatigue damage of k, kt, x or ty joints
+    (tubularjointscfs.jointfatigue). The body is {"joints": input object or array of input objects (as /scf),
+    "histogram": [[cycles, ...], [nominal stress ranges, ...]]}. Query options load_type, toe_sncurve (default TAIR)
+    and root_sncurve (default F3AIR)
+    """
+    if jt_type not in SCF_FIELDS:
+        return api_error(f"joint type {jt_type} not recognised, use one of {list(SCF_FIELDS)}", 404)
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or "joints" not in data or "histogram" not in data:
+            raise ApiError('expecting a JSON object with "joints" and "histogram"')
+        inputs, single = parse_inputs(SCF_FIELDS[jt_type], data["joints"])
+        histogram = parse_histogram(data["histogram"])
+        load_type = get_option("load_type", SCF_LOAD_TYPES[jt_type], allowed=ALLOWED_LOAD_TYPES[jt_type])
+        sncurves = {"toe_sncurve": get_option("toe_sncurve", "TAIR"),
+                    "root_sncurve": get_option("root_sncurve", "F3AIR")}
+
+        joints = {field: np.radians(vals) if field.startswith("theta") else vals for field, vals in inputs.items()}
+        if jt_type in ("k", "kt"):
+            df = k_joint_fatigue(joints, histogram, jt_type, load_type, **sncurves)
+        else:
+            df = joint_fatigue(joints, histogram, jt_type, load_type, **sncurves)
+    except (ApiError, ValueError, DamageError) as e:  # DamageError: unknown SN curve
+        return api_error(e)
+    except Exception as e:  # engine validity checks
+        return api_error(e, 422)
+
+    results = {col: to_json_vals(df[col], single=single) for col in df.columns
+               if col not in inputs and df[col].dtype.kind == "f"}
+    results["damage_max_loc"] = df["damage_max_loc"].tolist()[0] if single else df["damage_max_loc"].tolist()
+    results["root_governed"] = df["root_governed"].tolist()[0] if single else df["root_governed"].tolist()
+    return jsonify({"status": "success", "count": len(df), "results": results})
+
+
+def parse_histogram(histogram):
+    """(2, n_bins) float array of [cycles, stress ranges] from the json histogram
+    """
+    try:
+        arr = np.asarray(histogram, dtype=float)
+    except (TypeError, ValueError):
+        raise ApiError("histogram must be two numeric arrays, [cycles, stress ranges]")
+    if arr.ndim != 2 or arr.shape[0] != 2 or not arr.shape[1]:
+        raise ApiError("histogram must be two numeric arrays of the same length, [cycles, stress ranges]")
+    return arr
+
+
+def rrf_route(jt_type):
+    """POST /api/v1/rrf/<jt_type>, joint type k, ty or x, inputs as the /rrfs page (zeta for K joints only).
+    Query option x_method, "KMethod" or "DNV"
+    """
+    if jt_type not in ("k", "ty", "x"):
+        return api_error(f"joint type {jt_type} not recognised, use one of ['k', 'ty', 'x']", 404)
+    try:
+        inputs, single = parse_inputs(RRF_FIELDS)
+        x_method = get_option("x_method", "KMethod", allowed=("KMethod", "DNV"))
+        joints = joints_from_parameters(jt_type, inputs["beta"], inputs["gamma"], inputs["tau"], inputs["theta"],
+                                        inputs["zeta"])
+        rrfs = calc_rrfs(joints, x_method=x_method)
+    except (ApiError, ValueError) as e:
+        return api_error(e)
+    except Exception as e:  # engine validity checks, e.g. beta > 1
+        return api_error(e, 422)
+    return api_response({mode: rrfs[mode] for mode in LOAD_MODES}, single)
+
+
+def cone_route():
+    """POST /api/v1/cone, cone junction and thickness transition SCFs. Each input also has cone_junction, "small" or
+    "large". Query options scf_taper_ratio, scf_weld_type, transition_side and scf_inclusion (as the /conescfs page)
+    """
+    try:
+        inputs, single = parse_inputs(CONE_FIELDS)
+        rows = [request.get_json()] if single else request.get_json()
+        small_junction = small_junction_mask([row.get("cone_junction") for row in rows])
+
+        scf_taper_ratio = get_option("scf_taper_ratio", None, allowed=(None, "3", "4", "5", "6"))
+        scf_weld_type = get_option("scf_weld_type", "single_sided", allowed=("single_sided", "double_sided"))
+        transition_side = get_option("transition_side", "outside", allowed=("inside", "outside"))
+        scf_inclusion = get_option("scf_inclusion", "yes_linear_add", allowed=("yes_multiply", "yes_linear_add", "no"))
+
+        results = calc_cone_scfs(inputs, small_junction, None if scf_taper_ratio is None else float(scf_taper_ratio),
+                                 scf_weld_type, transition_side, scf_inclusion)
+    except (ApiError, ValueError) as e:
+        return api_error(e)
+    return api_response(results, single)
+
+
+def calc_cone_scfs(inputs, small_junction, scf_taper_ratio, scf_weld_type, transition_side, scf_inclusion):
+    """cone (Section 3 and App F.17) and thickness transition SCFs from the api inputs, as the /conescfs page
+
+    Returns:
+        dict of result name to numpy array
+    """
+    i = inputs
+    radius, thk_tubular, thk_cone, alpha = i["radius_tubular"], i["thickness_tubular"], i["thickness_cone"], i["alpha"]
+    cone_scfs = {"sect3": calc_cone_scfs_sect3_arr(radius, thk_tubular, thk_cone, alpha, small_junction),
+                 "appf17": calc_cone_scfs_appf17_arr(radius, thk_tubular, thk_cone, alpha, small_junction)}
+
+    thk_thick, thk_thin = np.maximum(thk_tubular, thk_cone), np.minimum(thk_tubular, thk_cone)
+    scf_inside_tt, scf_outside_tt, _ = calc_scf_thickness_transition_arr(2 * radius, thk_thick, thk_thin,
+                                                                         i["weld_width"], i["delta_m"], i["delta_0"],
+                                                                         scf_taper_ratio, scf_weld_type,
+                                                                         transition_side)
+    results = {"scf_inside_tt": scf_inside_tt, "scf_outside_tt": scf_outside_tt}
+    for method, scfs in cone_scfs.items():
+        cone_tt_scfs = cone_tt_scf_combine_arr(scfs, scf_inside_tt, scf_outside_tt, scf_inclusion)
+        for loc, cone_scf, cone_tt_scf in zip(CONE_LOCS, scfs, cone_tt_scfs):
+            results[f"{method}_{loc}"] = cone_scf
+            results[f"{method}_{loc}_tt"] = cone_tt_scf
+    return results
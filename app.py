@@ -1,54 +1,22 @@
 import os
-from flask import Flask, render_template, session
-from jktdesign.architect import jacket_architect
-from jktdesign.jktsections import jacket_sections, jacket_sections_plot
-from mto.mto import gen_mto
-from tubularjointscfs.routes_home import home
-from tubularjointscfs.routes_kjoint import k_joint_route
-from tubularjointscfs.routes_xjoint import x_joint_route
-from tubularjointscfs.routes_tyjoint import ty_joint_route
-from tubularjointscfs.routes_ktjoint import kt_joint_route
-from tubularjointscfs.jointdetailing_route import joint_detailing
-from gcdesign.gc_route import gc_route
-from boltedconn.boltedconn_route import boltedconn_route
-from kitesurf.kitesurf_route import kitesurf_route
-from conescfs.cone_route import cone_route
-from rrfs.rrfs_route import rrfs_route
+from flask import Flask
+from blueprints import register_tools, preload_views, mark_app_ready, import_report
+from profiling import init_profiling
 
 # initialise app variable for Flask obj
 app = Flask(__name__, template_folder='templates', static_folder='static')
 app.secret_key = 'your_secret_key_here'
 
 
-# register routes
-app.add_url_rule('/', 'home', home)
-# architect and sections tubularjointscfs
-app.add_url_rule('/architect', 'architect', jacket_architect, methods=['GET', 'POST'])
-app.add_url_rule('/jktsections', 'jacket_sections', jacket_sections, methods=['GET'])
-app.add_url_rule('/jktsections', 'jacket_sections_plot', jacket_sections_plot, methods=['POST'])
-# mto tubularjointscfs
-app.add_url_rule('/mto', 'gen_mto', gen_mto, methods=['GET', 'POST'])
-# scf tubularjointscfs
-app.add_url_rule('/k_joint', 'k_joint', k_joint_route, methods=['GET', 'POST'])
-app.add_url_rule('/x_joint', 'x_joint', x_joint_route, methods=['GET', 'POST'])
-app.add_url_rule('/ty_joint', 'ty_joint', ty_joint_route, methods=['GET', 'POST'])
-app.add_url_rule('/kt_joint', 'kt_joint', kt_joint_route, methods=['GET', 'POST'])
-# rrfs
-app.add_url_rule('/rrfs', 'rrfs_route', rrfs_route, methods=['GET', 'POST'])
-# conicals
-app.add_url_rule('/conescfs', 'cone_route', cone_route, methods=['GET', 'POST'])
-# joint detailing
-app.add_url_rule('/joint_detailing', 'joint_detailing', joint_detailing, methods=['GET', 'POST'])
-# gc and bolted connection
-app.add_url_rule('/gc', 'gc_route', gc_route, methods=['GET', 'POST'])
-app.add_url_rule('/boltedconn', 'boltedconn_route', boltedconn_route, methods=['GET', 'POST'])
-# kitesurf
-app.add_url_rule('/kitesurf', 'kitesurf_route', kitesurf_route, methods=['GET', 'POST'])
-# onshape CAD viewing
-
-from onshape.onshape_route import onshape_route, onshape_model_glb
-app.add_url_rule('/cad_tp',           'onshape',           onshape_route,      methods=['GET'])
-app.add_url_rule('/cad_tp/model.glb', 'onshape_model_glb', onshape_model_glb,  methods=['GET'])
+# register routes, one blueprint per tool (see blueprints.TOOLS). The tool modules are imported on first request,
+# set PRELOAD_VIEWS=1 to import them all at startup instead
+register_tools(app)
+# request and engine timings, served at /metrics (see profiling)
+init_profiling(app)
+if os.environ.get("PRELOAD_VIEWS") == "1":
+    preload_views(app)
+mark_app_ready()
+app.logger.info("app import report: %s", import_report())
 
 
 if __name__ == '__main__':
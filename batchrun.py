@@ -0,0 +1,461 @@
+"""offline batch runner for the design checks, a CSV or Parquet table in and a Parquet (or CSV) table out
+
+    python batchrun.py joints.csv -o joints_scfs.parquet --record-type kt --workers 8
+
+Each row is one record of the record type (given with --record-type or a record_type column). The input columns use
+the field names of the JSON api (api.v1) for joints and cones, the argument names of
+bolt_connection_uls_strength_check for flanges and of gc_processor for grouted connections. Angles are in degrees.
+
+Rows are split into chunks that run on a process pool. Joint SCFs and cone SCFs are calculated a chunk at a time with
+the array engines (the ones KTJointSCFManager and cone_scf_single results are checked against), flanges and grouted
+connections a row at a time. Missing columns stop the run before it starts, a row with missing, non-numeric or
+non-positive dimensions or that fails gets its message in the error column instead of stopping the run.
+Chunks are written as they complete (in input order) so the output of a partial run is still readable.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+import numpy as np
+import pandas as pd
+
+SCF_RECORD_TYPES = ["k", "kt", "x", "ty"]
+RECORD_TYPES = SCF_RECORD_TYPES + ["cone", "flange", "gc"]
+
+FLANGE_FIELDS = ["outer_diameter", "wall_thickness", "bolt_steel_grade", "flange_steel_grade", "tower_steel_grade",
+                 "ULS_bending_moment", "ULS_axial_force", "flange_height", "flange_length", "bolt_size"]
+FLANGE_OPTIONAL_FIELDS = ["n_bolts", "b_star"]
+FLANGE_RESULTS = ["valid_geom", "Fu_convergence", "bolt_sector_force", "Fu_A", "Fu_B", "Fu_D", "Fu_E",
+                  "failure_mode_governing", "util", "a_b_ratio", "n_bolts", "n_bolts_max", "b_star", "a", "alpha"]
+# read as text from csv, e.g. bolt grade 10.9
+TEXT_FIELDS = ["record_type", "bolt_steel_grade", "flange_steel_grade", "tower_steel_grade", "bolt_size",
+               "cone_junction"]
+GC_FIELDS = ["leg_od", "leg_t", "pile_od", "pile_t", "gc_length", "n_sks", "sk_width", "sk_height", "sk_spacing",
+             "fx", "fy", "fz", "mx", "my", "grout_E", "grout_strength"]
+# dimensions and material properties, > 0 (the other numeric fields, e.g. gaps and loads, only need to be finite)
+POSITIVE_FIELDS = {"D", "T", "d", "t", "theta", "L", "dA", "tA", "thetaA", "dB", "tB", "thetaB", "dC", "tC", "thetaC",
+                   "radius_tubular", "thickness_tubular", "thickness_cone", "outer_diameter", "wall_thickness",
+                   "flange_height", "flange_length", "leg_od", "leg_t", "pile_od", "pile_t", "gc_length", "n_sks",
+                   "sk_width", "sk_height", "sk_spacing", "grout_E", "grout_strength"}
+CONE_JUNCTIONS = ["small", "large"]
+# flag columns as text, e.g. maintain_a_b_ratio_1_25 of a csv with some rows blank
+FLAG_TEXT = {"true": True, "1": True, "yes": True, "false": False, "0": False, "no": False, "": False}
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# record handlers, each takes a chunk (pd.DataFrame) and returns a results pd.DataFrame with the same index
+# ----------------------------------------------------------------------------------------------------------------------
+def run_scf_chunk(df, record_type, options):
+    """joint SCFs of a chunk, one vectorised call (see _run_vectorised where rows fail)
+    """
+    from api.v1 import SCF_FIELDS, SCF_LOAD_TYPES, calc_scfs
+
+    load_type = options.get("load_type") or SCF_LOAD_TYPES[record_type]
+
+    def _calc(inputs):
+        scfs, locs = calc_scfs(record_type, inputs, load_type)
+        return {f"scf_{loc}": scf for loc, scf in zip(locs, scfs)}
+
+    inputs = column_inputs(df, SCF_FIELDS[record_type])
+    return _run_vectorised(df, inputs, _calc, row_errors(inputs))
+
+
+def run_cone_chunk(df, options):
+    """cone and thickness transition SCFs of a chunk (the /conescfs page results), one vectorised call
+    """
+    from api.v1 import CONE_FIELDS, calc_cone_scfs
+    from conescfs.scfs import small_junction_mask
+
+    taper_ratio = options.get("scf_taper_ratio")
+
+    def _calc(inputs):
+        return calc_cone_scfs(inputs, small_junction_mask(inputs["cone_junction"]),
+                              None if taper_ratio is None else float(taper_ratio),
+                              options.get("scf_weld_type", "single_sided"),
+                              options.get("transition_side", "outside"),
+                              options.get("scf_inclusion", "yes_linear_add"))
+
+    inputs = column_inputs(df, CONE_FIELDS)
+    errors = row_errors(inputs)
+    junction = df["cone_junction"].astype("string").str.strip().str.lower().fillna("")
+    bad_junction = ~junction.isin(CONE_JUNCTIONS).to_numpy()
+    errors[bad_junction & pd.isna(errors)] = f"ValueError: cone_junction must be one of {CONE_JUNCTIONS}"
+    inputs["cone_junction"] = junction.to_numpy(dtype=str)
+    return _run_vectorised(df, inputs, _calc, errors)
+
+
+def required_columns(record_type):
+    """input columns without a default of the record type
+    """
+    if record_type in SCF_RECORD_TYPES:
+        from api.v1 import SCF_FIELDS
+        return [field for field, default in SCF_FIELDS[record_type].items() if default is None]
+    if record_type == "cone":
+        from api.v1 import CONE_FIELDS
+        return [field for field, default in CONE_FIELDS.items() if default is None] + ["cone_junction"]
+    if record_type == "flange":
+        return FLANGE_FIELDS
+    if record_type == "gc":
+        return GC_FIELDS
+    raise ValueError(f"record type {record_type} not recognised, use one of {RECORD_TYPES}")
+
+
+def missing_columns(df, record_type):
+    return [field for field in required_columns(record_type) if field not in df]
+
+
+def column_inputs(df, fields):
+    """numeric input arrays from the columns of df, fields as api.v1 (field: default, None if required). Values that
+    are not numbers are read as nan (see row_errors)
+    """
+    inputs = {}
+    for field, default in fields.items():
+        if field in df:
+            inputs[field] = pd.to_numeric(df[field], errors="coerce").to_numpy(dtype=float)
+        elif default is not None:
+            inputs[field] = np.full(len(df), default, dtype=float)
+        else:
+            raise ValueError(f"required column '{field}' missing")
+    return inputs
+
+
+def row_errors(inputs):
+    """error message of each row (None where the row is valid): inputs missing, not numbers or infinite, and
+    POSITIVE_FIELDS <= 0. The engines return inf or nan for these rather than raising
+
+    Args:
+        inputs: dict of numeric arrays (column_inputs), or of scalars for one row
+    """
+    n = len(next(iter(inputs.values())))
+    errors = np.full(n, None, dtype=object)
+    for field, vals in inputs.items():
+        vals = np.asarray(vals, dtype=float)
+        invalid = ~np.isfinite(vals)
+        errors[invalid & pd.isna(errors)] = f"ValueError: {field} missing or not a number"
+        if field in POSITIVE_FIELDS:
+            with np.errstate(invalid="ignore"):
+                errors[~invalid & (vals <= 0) & pd.isna(errors)] = f"ValueError: {field} must be > 0"
+    return errors
+
+
+def run_flange_row(row):
+    """bolted flange ULS strength check of one row, see bolt_connection_uls_strength_check
+    """
+    from boltedconn.boltuls import bolt_connection_uls_strength_check
+
+    _check_row(row, [field for field in FLANGE_FIELDS if field not in TEXT_FIELDS])
+    args = [str(row[field]) if field in TEXT_FIELDS else float(row[field]) for field in FLANGE_FIELDS]
+    optional = [None if pd.isna(row.get(field)) else row.get(field) for field in FLANGE_OPTIONAL_FIELDS]
+    if optional[0] is not None:
+        optional[0] = int(optional[0])
+    maintain_a_b_ratio_1_25 = row_flag(row.get("maintain_a_b_ratio_1_25"), "maintain_a_b_ratio_1_25")
+    flange_obj = bolt_connection_uls_strength_check(*args, *optional, maintain_a_b_ratio_1_25)
+    return {res: getattr(flange_obj, res, None) for res in FLANGE_RESULTS}
+
+
+def run_gc_row(row):
+    """grouted connection checks of one row, see gc_processor. Validity checks as <reference> (PASS or FAIL) columns
+    """
+    from gcdesign.gc_processor import gc_processor
+
+    _check_row(row, GC_FIELDS)
+    args = [int(row[field]) if field == "n_sks" else float(row[field]) for field in GC_FIELDS]
+    res, validity_chks, le = gc_processor(*args)
+    results = {"le": le, **res}
+    for reference, (value, chkpass, _) in validity_chks.items():
+        results[f"validity {reference}"] = chkpass
+    results["validity_all_pass"] = all(chkpass == "PASS" for _, chkpass, _ in validity_chks.values())
+    return results
+
+
+def row_flag(value, field):
+    """True/False of a flag column value. Missing (None or nan) is False, text is true/false, 1/0 or yes/no (any case)
+    """
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in FLAG_TEXT:
+            return FLAG_TEXT[text]
+        raise ValueError(f"{field} must be one of true/false, 1/0 or yes/no, not {value!r}")
+    if value is None or pd.isna(value):
+        return False
+    return bool(value)
+
+
+def _check_row(row, fields):
+    """raise ValueError with the first row_errors message of the numeric fields of one row
+    """
+    inputs = {field: pd.to_numeric(pd.Series([row[field]]), errors="coerce").to_numpy(dtype=float)
+              for field in fields}
+    error = row_errors(inputs)[0]
+    if error is not None:
+        raise ValueError(error.removeprefix("ValueError: "))
+
+
+def _run_vectorised(df, inputs, calc, errors=None):
+    """calc(inputs) over the valid rows at once, where it raises the rows are halved until the failing rows are
+    isolated. Rows with non-finite results get an error as well
+
+    Args:
+        inputs: dict of numpy arrays, one value per row of df
+        calc: function of an inputs dict returning a dict of result arrays
+        errors: object array of input errors (row_errors), rows with an error are not calculated
+    """
+    n = len(df)
+    results = {}
+    errors = np.full(n, None, dtype=object) if errors is None else errors.copy()
+
+    def _run(idx):
+        try:
+            res = calc({name: vals[idx] for name, vals in inputs.items()})
+        except Exception as e:
+            if len(idx) == 1:
+                errors[idx[0]] = f"{type(e).__name__}: {e}"
+            else:
+                _run(idx[:len(idx) // 2])
+                _run(idx[len(idx) // 2:])
+            return
+        for name, vals in res.items():
+            results.setdefault(name, np.full(n, np.nan))[idx] = vals
+
+    valid = np.flatnonzero(pd.isna(errors))
+    if len(valid):
+        _run(valid)
+    for name, vals in results.items():
+        with np.errstate(invalid="ignore"):
+            nonfinite = ~np.isfinite(vals.astype(float))
+        nonfinite[~pd.isna(errors)] = False
+        errors[nonfinite] = f"ValueError: {name} not finite, check the inputs"
+    return pd.DataFrame({**results, "error": errors}, index=df.index)
+
+
+def _run_each_row(df, run_row):
+    rows = []
+    for idx, row in df.iterrows():
+        try:
+            with open(os.devnull, "w") as fnull, redirect_stdout(fnull):  # engines print progress messages
+                results = run_row(row)
+            results["error"] = None
+        except Exception as e:
+            results = {"error": f"{type(e).__name__}: {e}"}
+        rows.append(pd.Series(results, name=idx))
+    return pd.DataFrame(rows)
+
+
+def process_chunk(chunk, record_type, options):
+    """inputs and results of one chunk. Run in the worker processes so must be importable (module level)
+    """
+    if record_type in SCF_RECORD_TYPES:
+        results = run_scf_chunk(chunk, record_type, options)
+    elif record_type == "cone":
+        results = run_cone_chunk(chunk, options)
+    elif record_type == "flange":
+        results = _run_each_row(chunk, run_flange_row)
+    elif record_type == "gc":
+        results = _run_each_row(chunk, run_gc_row)
+    else:
+        raise ValueError(f"record type {record_type} not recognised, use one of {RECORD_TYPES}")
+
+    results = results.reindex(chunk.index)
+    if record_type == "flange":
+        results = results.reindex(columns=FLANGE_RESULTS + ["error"])
+    results = _typed(results)
+    # results with the same name as an input, e.g. the flange n_bolts assessed
+    results = results.rename(columns=lambda col: f"{col}_result" if col in chunk.columns else col)
+    return pd.concat([chunk, results], axis=1)
+
+
+def _typed(results):
+    """nullable dtypes for object columns (e.g. the error column or failure modes), so that every chunk has the same
+    parquet schema even where a column is all null in one chunk
+    """
+    for col in results.columns[results.dtypes == object]:
+        vals = results[col].dropna()
+        if col == "error" or vals.map(lambda v: isinstance(v, str)).all():
+            results[col] = results[col].astype("string")
+        elif vals.map(lambda v: isinstance(v, (bool, np.bool_))).all():
+            results[col] = results[col].astype("boolean")
+        else:
+            results[col] = pd.to_numeric(results[col], errors="coerce").astype(float)
+    return results
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# io
+# ----------------------------------------------------------------------------------------------------------------------
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise RuntimeError("parquet files need pyarrow (pip install -r requirements.txt), or use .csv") from None
+
+
+def read_table(path):
+    """pd.DataFrame from a .csv or .parquet file
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return pd.read_csv(path, dtype={field: str for field in TEXT_FIELDS})
+    if ext in (".parquet", ".pq"):
+        _require_pyarrow()
+        return pd.read_parquet(path)
+    raise ValueError(f"input file type {ext} not supported, use .csv or .parquet")
+
+
+class TableWriter:
+    """writes result chunks to one .parquet file (one row group per chunk, needs pyarrow) or .csv file as they arrive.
+    The columns of the first chunk are used for all chunks
+    """
+    def __init__(self, path):
+        self.path = path
+        self.is_parquet = os.path.splitext(path)[1].lower() in (".parquet", ".pq")
+        self._writer, self._schema, self._columns = None, None, None
+        self.rows = 0
+        if self.is_parquet:
+            _require_pyarrow()  # fail before any chunk is run
+
+    def write(self, df):
+        if self._columns is None:
+            self._columns = list(df.columns)
+        df = df.reindex(columns=self._columns)
+        if self.is_parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._schema = table.schema
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            self._writer.write_table(table.cast(self._schema))
+        else:
+            df.to_csv(self.path, mode="w" if self.rows == 0 else "a", header=self.rows == 0, index=False)
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def output_path(output, record_type, n_record_types):
+    """output path, suffixed with the record type where the input has several
+    """
+    if n_record_types == 1:
+        return output
+    root, ext = os.path.splitext(output)
+    return f"{root}_{record_type}{ext}"
+
+
+def report_progress(record_type, done, total, t0, errors, stream=sys.stderr):
+    elapsed = time.perf_counter() - t0
+    rate = done / elapsed if elapsed > 0 else 0.
+    eta = (total - done) / rate if rate > 0 else float("nan")
+    print(f"[{record_type}] {done}/{total} rows ({100 * done / total:.0f}%), {rate:.0f} rows/s, "
+          f"{errors} errors, eta {eta:.0f} s", file=stream, flush=True)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# runner
+# ----------------------------------------------------------------------------------------------------------------------
+def run_batch(df, record_type, output, options=None, chunk_size=500, workers=None, progress=True):
+    """run all rows of one record type and stream the inputs and results to output
+
+    Args:
+        df: pd.DataFrame of inputs
+        record_type: one of RECORD_TYPES
+        output: .parquet or .csv path
+        options: dict of calculation options, e.g. load_type, scf_inclusion
+        chunk_size: rows per task
+        workers: number of processes, os.cpu_count() if None, 0 runs in this process
+
+    Returns:
+        int, number of rows with errors
+    """
+    missing = missing_columns(df, record_type)
+    if missing:
+        raise ValueError(f"{record_type} records: required columns {missing} missing")
+    options = options or {}
+    chunks = [df.iloc[i:i + chunk_size] for i in range(0, len(df), chunk_size)]
+    writer = TableWriter(output)
+    t0, done, errors = time.perf_counter(), 0, 0
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers != 0 else None
+    try:
+        if executor is None:
+            results = (process_chunk(chunk, record_type, options) for chunk in chunks)
+        else:
+            results = executor.map(process_chunk, chunks, [record_type] * len(chunks), [options] * len(chunks))
+        for res in results:  # in input order
+            writer.write(res)
+            done += len(res)
+            errors += int(res["error"].notna().sum())
+            if progress:
+                report_progress(record_type, done, len(df), t0, errors)
+    finally:
+        writer.close()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="batch run joint SCF, cone SCF, bolted flange and grouted "
+                                                 "connection checks from a CSV or Parquet table")
+    parser.add_argument("input", help="input .csv or .parquet file")
+    parser.add_argument("-o", "--output", required=True, help="output .parquet or .csv file")
+    parser.add_argument("--record-type", choices=RECORD_TYPES,
+                        help="record type of all rows, otherwise read from the record_type column")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=None, help="processes, default cpu count, 0 for no pool")
+    parser.add_argument("--load-type", help="joint SCF load type, default as the joint pages")
+    parser.add_argument("--scf-taper-ratio", choices=["3", "4", "5", "6"], help="cone thickness transition taper")
+    parser.add_argument("--scf-weld-type", choices=["single_sided", "double_sided"], default="single_sided")
+    parser.add_argument("--transition-side", choices=["inside", "outside"], default="outside")
+    parser.add_argument("--scf-inclusion", choices=["yes_multiply", "yes_linear_add", "no"], default="yes_linear_add")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress reporting")
+    args = parser.parse_args(argv)
+
+    try:
+        df = read_table(args.input)
+    except (RuntimeError, ValueError) as e:
+        parser.error(str(e))
+    if args.record_type is not None:
+        groups = {args.record_type: df}
+    elif "record_type" in df:
+        # columns of the other record types are dropped
+        groups = {record_type: grp.drop(columns="record_type").dropna(axis=1, how="all")
+                  for record_type, grp in df.groupby(df["record_type"].str.lower(), sort=False)}
+    else:
+        parser.error("give --record-type or a record_type column")
+    unknown = set(groups) - set(RECORD_TYPES)
+    if unknown:
+        parser.error(f"record types {sorted(unknown)} not recognised, use {RECORD_TYPES}")
+    # checked for all record types before any is run
+    for record_type, grp in groups.items():
+        missing = missing_columns(grp, record_type)
+        if missing:
+            parser.error(f"{record_type} records: required columns {missing} missing from {args.input}")
+    if any(os.path.splitext(output_path(args.output, record_type, len(groups)))[1].lower() in (".parquet", ".pq")
+           for record_type in groups):
+        try:
+            _require_pyarrow()
+        except RuntimeError as e:
+            parser.error(str(e))
+
+    options = {"load_type": args.load_type, "scf_taper_ratio": args.scf_taper_ratio,
+               "scf_weld_type": args.scf_weld_type, "transition_side": args.transition_side,
+               "scf_inclusion": args.scf_inclusion}
+    total_errors = 0
+    for record_type, grp in groups.items():
+        path = output_path(args.output, record_type, len(groups))
+        total_errors += run_batch(grp, record_type, path, options, args.chunk_size, args.workers, not args.quiet)
+        if not args.quiet:
+            print(f"[{record_type}] written to {path}", file=sys.stderr)
+
+    return 1 if total_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
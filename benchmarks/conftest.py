@@ -0,0 +1,48 @@
+"""benchmarks of the engine hot paths with fixed representative inputs, run with pytest-benchmark
+
+    python -m pytest benchmarks                                 # run every case and print the timings
+    python -m pytest benchmarks -k "scf or rrf"                 # cases whose name contains scf or rrf
+    python -m pytest benchmarks --benchmark-autosave            # and save the run to .benchmarks (per commit)
+    python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:20%
+                                                                # compare with the last saved run, fail on a regression
+
+Each case sets up its inputs once and times one call, pytest-benchmark calibrates the rounds and reports the median
+and best time per call. Where a call returns a string or bytes (e.g. plotly JSON) its size is kept in the extra info
+of the run. Saved runs hold the commit, machine, python and numpy versions, so a run can be compared with any earlier
+commit measured on the same machine (pytest-benchmark compare). Route level result caching (see resultcache) is
+bypassed, the engines are called directly. Not part of the tests (pytest.ini testpaths), needs pytest-benchmark.
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+
+def pytest_collection_modifyitems(items):
+    # engine prints are captured by pytest, numpy and engine warnings are not of interest here
+    for item in items:
+        item.add_marker(pytest.mark.filterwarnings("ignore"))
+
+
+def pytest_benchmark_update_machine_info(config, machine_info):
+    machine_info["numpy"] = np.__version__
+
+
+@pytest.fixture
+def run(benchmark):
+    """time func, with the size of its output where that is a string or bytes
+    """
+    def _run(func, *args, **kwargs):
+        result = benchmark(func, *args, **kwargs)
+        if isinstance(result, (str, bytes)):
+            benchmark.extra_info["output_bytes"] = len(result)
+        return result
+    return _run
+
+
+@pytest.fixture(scope="session")
+def jacket():
+    from jktdesign.architect import get_default_config
+    from jktdesign.jktsections import sectioned_jacket
+
+    return sectioned_jacket(get_default_config())
@@ -0,0 +1,27 @@
+"""cones, bolted flanges and grouted connections"""
+import numpy as np
+
+
+def test_cone_scf_sweep_1001(run):
+    from conescfs.scfprocess import cone_scf_sweep
+
+    numeric_inputs = {"radius_tubular": 850., "thickness_tubular": 85., "thickness_cone": 37., "alpha": 1.72}
+    x_arr = np.linspace(0.5 * 1.72, 1.5 * 1.72, 1001)
+    run(cone_scf_sweep, "large", "alpha", x_arr, numeric_inputs)
+
+
+def test_flange_search_5mm(run):
+    """flange geometry search of the /boltedconn design mode at 5 mm steps (heights and lengths up to 1000 mm)
+    """
+    from boltedconn.boltuls import flange_searching_geometry
+
+    run(flange_searching_geometry, 7500., 85., "10.9", "355", "355", 511e9, 14.7e6, False, 0.95, 1000, 1000, 5, "M72")
+
+
+def test_grout_matrix_plot_vals(run):
+    from gcdesign.gc_route import get_gc_defaults
+    from gcdesign.groutuls.groutuls import get_grout_matrix_failure_plot_vals
+
+    d = get_gc_defaults()
+    run(get_grout_matrix_failure_plot_vals, d["leg_od"], d["leg_t"], d["pile_od"], d["pile_t"], d["sk_height"],
+        d["grout_E"], d["grout_strength"], 5000, 0.01, d["sk_spacing"])
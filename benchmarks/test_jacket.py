@@ -0,0 +1,46 @@
+"""jacket construction, mass take off and plot"""
+import contextlib
+import json
+
+
+@contextlib.contextmanager
+def jacket_request_context():
+    """request context of the app with the architect page default jacket in the session
+    """
+    from flask import session
+    from app import app
+    from jktdesign.architect import get_default_config
+
+    with app.test_request_context():
+        session["jkt_json"] = json.dumps(get_default_config())
+        yield
+
+
+def test_jacket_sections(run):
+    """Jacket construction and the /jktsections section assembly (in a request context, as the route)
+    """
+    from jktdesign.architect import get_default_config
+    from jktdesign.jktsections import build_jacket_sections, default_sections_form, jacket_from_config
+
+    form = default_sections_form(jacket_from_config(get_default_config()))
+
+    def call():
+        with jacket_request_context():
+            return build_jacket_sections(form)
+    run(call)
+
+
+def test_jacket_mto(run, jacket):
+    from jktdesign.mass import calculate_jkt_mto
+
+    run(calculate_jkt_mto, jacket)
+
+
+def test_jacket_plotter(run, jacket):
+    """plotly json of the sectioned jacket (its size is kept in the extra info)
+    """
+    from jktdesign.architect import get_default_config
+    from jktdesign.plotter import jacket_plotter
+
+    d = get_default_config()
+    run(jacket_plotter, jacket, 0., d["msl"], d["splash_lower"], d["splash_upper"], show_tower=False)
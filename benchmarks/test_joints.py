@@ -0,0 +1,85 @@
+"""joint SCFs, RRFs and damage"""
+import numpy as np
+import pytest
+
+# fixed joint inputs (page defaults), angles in radians as KTJointSCFManager and XTYJointSCFManager take them
+K_JOINT = {"D": 1000., "T": 20., "dA": 500., "tA": 15., "thetaA": np.radians(45.), "dB": 500., "tB": 15.,
+           "thetaB": np.radians(45.), "g_ab": 75., "L": 5000., "C": 0.7}
+KT_JOINT = {"D": 1000., "T": 20., "dA": 500., "tA": 15., "thetaA": np.radians(45.), "dB": 500., "tB": 15.,
+            "thetaB": np.radians(90.), "dC": 500., "tC": 15., "thetaC": np.radians(45.), "g_ab": 75., "g_bc": 75.,
+            "L": 5000., "C": 0.7}
+XTY_JOINT = {"D": 1000., "T": 20., "d": 500., "t": 15., "theta": np.radians(45.), "L": 5000., "C": 0.7}
+SCF_LOAD_TYPES = {"k": "balanced_axial_unbalanced_moment", "kt": "balanced_axial_unbalanced_moment",
+                  "x": "balanced_forces", "ty": "balanced_forces"}
+
+
+def scf_manager_call(joint_type, x_axis_desc, stress_adjusted=False):
+    from tubularjointscfs.scfs_kt_jts import KTJointSCFManager
+    from tubularjointscfs.scfs_xty_jts import XTYJointSCFManager
+
+    manager = KTJointSCFManager if joint_type in ("k", "kt") else XTYJointSCFManager
+    input_fields = {"k": K_JOINT, "kt": KT_JOINT}.get(joint_type, XTY_JOINT)
+
+    def call():
+        jt_obj = manager(x_axis_desc, dict(input_fields), stress_adjusted, joint_type=joint_type)
+        jt_obj.get_joint_scfs(SCF_LOAD_TYPES[joint_type])
+        return jt_obj
+    return call
+
+
+@pytest.mark.parametrize("joint_type, x_axis_desc, stress_adjusted", [
+    ("k", "D", False), ("k", "thetaA", True), ("kt", "D", False), ("kt", "g_ab", False), ("x", "D", False),
+    ("x", "theta", True), ("ty", "D", False)])
+def test_scf_manager(run, joint_type, x_axis_desc, stress_adjusted):
+    run(scf_manager_call(joint_type, x_axis_desc, stress_adjusted))
+
+
+def test_scf_k_plots(run):
+    """matplotlib plots of the K joint page
+    """
+    from tubularjointscfs.core import create_joint_plots
+
+    jt_obj = scf_manager_call("k", "D")()
+    jt_obj.convert_angles_to_degrees("D")
+    run(create_joint_plots, jt_obj, "D", False, no_braces=2)
+
+
+def test_scf_kt_batch_10k(run):
+    """vectorised KT joint SCFs of 10000 joints (the api and batchrun engine)
+    """
+    from api.v1 import calc_scfs
+
+    rng = np.random.default_rng(0)
+    n = 10000
+    inputs = {"D": rng.uniform(800., 2000., n), "T": rng.uniform(20., 80., n),
+              "dA": rng.uniform(400., 700., n), "tA": rng.uniform(12., 30., n), "thetaA": rng.uniform(35., 60., n),
+              "dB": rng.uniform(400., 700., n), "tB": rng.uniform(12., 30., n), "thetaB": rng.uniform(80., 90., n),
+              "dC": rng.uniform(400., 700., n), "tC": rng.uniform(12., 30., n), "thetaC": rng.uniform(35., 60., n),
+              "g_ab": rng.uniform(50., 150., n), "g_bc": rng.uniform(50., 150., n), "L": rng.uniform(5e3, 2e4, n)}
+    run(calc_scfs, "kt", inputs, SCF_LOAD_TYPES["kt"])
+
+
+@pytest.mark.parametrize("jt_type", ["x", "ty", "k"])
+def test_rrf_sweep(run, jt_type):
+    from rrfs.rrfs_route import get_jt_RRFs_data
+
+    # unwrapped, the RRF data is cached on the route
+    run(get_jt_RRFs_data.__wrapped__, jt_type, 0.6, 20., 0.5, 45., 0.1, "rrfs_beta")
+
+
+def test_rrf_map_x(run):
+    """beta x tau RRF maps (201 x 201) and their plotly json
+    """
+    from rrfs.rrfs_route import get_jt_RRFs_map
+
+    run(get_jt_RRFs_map, "x", 20., 45., 0.1)
+
+
+def test_damage_histogram_100k(run):
+    """Damage of a 100000 bin stress range histogram
+    """
+    from tubularjointscfs.efthymiou.damage import Damage
+
+    rng = np.random.default_rng(0)
+    histogram = np.column_stack([rng.uniform(1e2, 1e6, 100000), np.linspace(0.5, 250., 100000)])
+    run(lambda: Damage(histogram, "TAIR", 40., scf=2.5).damage)
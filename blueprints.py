@@ -0,0 +1,188 @@
+"""Flask blueprints for each tool, with the view modules imported on first request.
+
+The route modules pull in pandas, matplotlib, plotly etc. at import time, so importing them all in app.py made every
+gunicorn worker pay for every tool. Here each view is registered as a LazyView ("module:function") and only imported
+when first called. import_report() gives the app import time, the load time of each view and the worker RSS.
+
+The admin blueprint (cache stats and clearing, slow request profiles, the import report) is off unless ADMIN_TOKEN is
+set in the environment, requests must then give the token in the X-Admin-Token header.
+"""
+import hmac
+import importlib
+import os
+import threading
+import time
+
+from flask import Blueprint, jsonify, request
+
+# blueprint name: [(rule, endpoint, "module:view function", methods)]
+TOOLS = {
+    "home": [
+        ("/", "home", "tubularjointscfs.routes_home:home", ["GET"]),
+    ],
+    # architect and sections
+    "jktdesign": [
+        ("/architect", "architect", "jktdesign.architect:jacket_architect", ["GET", "POST"]),
+        ("/jktsections", "jacket_sections", "jktdesign.jktsections:jacket_sections", ["GET"]),
+        ("/jktsections", "jacket_sections_plot", "jktdesign.jktsections:jacket_sections_plot", ["POST"]),
+        ("/jktsections/export/<fmt>", "jacket_export", "jktdesign.jktsections:jacket_export", ["GET"]),
+        ("/jktsections/cones", "jacket_cones", "jktdesign.jktsections:jacket_cones", ["GET"]),
+    ],
+    "mto": [
+        ("/mto", "gen_mto", "mto.mto:gen_mto", ["GET", "POST"]),
+    ],
+    # scfs and joint detailing
+    "tubularjointscfs": [
+        ("/k_joint", "k_joint", "tubularjointscfs.routes_kjoint:k_joint_route", ["GET", "POST"]),
+        ("/x_joint", "x_joint", "tubularjointscfs.routes_xjoint:x_joint_route", ["GET", "POST"]),
+        ("/ty_joint", "ty_joint", "tubularjointscfs.routes_tyjoint:ty_joint_route", ["GET", "POST"]),
+        ("/kt_joint", "kt_joint", "tubularjointscfs.routes_ktjoint:kt_joint_route", ["GET", "POST"]),
+        ("/joint_detailing", "joint_detailing", "tubularjointscfs.jointdetailing_route:joint_detailing",
+         ["GET", "POST"]),
+    ],
+    "rrfs": [
+        ("/rrfs", "rrfs_route", "rrfs.rrfs_route:rrfs_route", ["GET", "POST"]),
+    ],
+    # conicals
+    "conescfs": [
+        ("/conescfs", "cone_route", "conescfs.cone_route:cone_route", ["GET", "POST"]),
+    ],
+    # gc and bolted connection
+    "gcdesign": [
+        ("/gc", "gc_route", "gcdesign.gc_route:gc_route", ["GET", "POST"]),
+    ],
+    "boltedconn": [
+        ("/boltedconn", "boltedconn_route", "boltedconn.boltedconn_route:boltedconn_route", ["GET", "POST"]),
+    ],
+    "kitesurf": [
+        ("/kitesurf", "kitesurf_route", "kitesurf.kitesurf_route:kitesurf_route", ["GET", "POST"]),
+        ("/kitesurf/rank", "kitesurf_rank_route", "kitesurf.kitesurf_route:kitesurf_rank_route", ["GET"]),
+    ],
+    # versioned json api, numbers only
+    "api": [
+        ("/api/v1/scf/<jt_type>", "scf", "api.v1:scf_route", ["POST"]),
+        ("/api/v1/rrf/<jt_type>", "rrf", "api.v1:rrf_route", ["POST"]),
+        ("/api/v1/fatigue/<jt_type>", "fatigue", "api.v1:fatigue_route", ["POST"]),
+        ("/api/v1/cone", "cone", "api.v1:cone_route", ["POST"]),
+    ],
+    # onshape CAD viewing
+    "onshape": [
+        ("/cad_tp", "onshape", "onshape.onshape_route:onshape_route", ["GET"]),
+        ("/cad_tp/model.glb", "onshape_model_glb", "onshape.onshape_route:onshape_model_glb", ["GET"]),
+        ("/cad_tp/jacket.glb", "jacket_model_glb", "onshape.onshape_route:jacket_model_glb", ["GET"]),
+    ],
+    # result cache hit rates and slow request profiles of the worker that answers
+    "admin": [
+        ("/admin/cache", "cache_stats", "resultcache:cache_stats_route", ["GET"]),
+        ("/admin/cache/clear", "cache_clear", "resultcache:cache_clear_route", ["POST"]),
+        ("/admin/profiles", "profiles", "profiling:profiles_route", ["GET"]),
+        ("/admin/import_report", "import_report", "blueprints:import_report_route", ["GET"]),
+    ],
+}
+
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN") or None
+
+# process start reference for the report, set when this module is first imported (i.e. by app.py)
+_T0 = time.perf_counter()
+_REPORT = {"app_import_s": None, "rss_mb_at_startup": None, "views": {}}
+_REPORT_LOCK = threading.Lock()
+
+
+def rss_mb():
+    """current resident set size of this process [MB], None where /proc is not available (e.g. windows)
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return round(pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2, 1)
+
+
+class LazyView:
+    """view function given as "module:function", imported the first time it is called
+    """
+    def __init__(self, import_name):
+        self.import_name = import_name
+        self._view = None
+
+    def load(self):
+        if self._view is None:
+            module_name, func_name = self.import_name.split(":")
+            t0 = time.perf_counter()
+            view = getattr(importlib.import_module(module_name), func_name)
+            with _REPORT_LOCK:
+                _REPORT["views"][self.import_name] = {"load_s": round(time.perf_counter() - t0, 4),
+                                                      "rss_mb_after": rss_mb()}
+            self._view = view
+        return self._view
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+
+def admin_guard():
+    """before_request of the admin blueprint: 404 unless ADMIN_TOKEN is set, 403 unless the request gives it
+    """
+    if ADMIN_TOKEN is None:
+        return jsonify({"error": "not found"}), 404
+    if not hmac.compare_digest(request.headers.get("X-Admin-Token", "").encode(), ADMIN_TOKEN.encode()):
+        return jsonify({"error": "admin token missing or wrong"}), 403
+    return None
+
+
+# blueprint name: function run before each request of the blueprint, a response to refuse the request
+GUARDS = {"admin": admin_guard}
+
+
+def create_blueprint(name, rules):
+    """blueprint of lazily imported views, rules as in TOOLS
+    """
+    bp = Blueprint(name, __name__)
+    for rule, endpoint, import_name, methods in rules:
+        bp.add_url_rule(rule, endpoint, LazyView(import_name), methods=methods)
+    if name in GUARDS:
+        bp.before_request(GUARDS[name])
+    return bp
+
+
+def register_tools(app, tools=TOOLS):
+    """register a blueprint per tool on the app
+    """
+    for name, rules in tools.items():
+        app.register_blueprint(create_blueprint(name, rules))
+
+
+def preload_views(app):
+    """import every view now, e.g. with gunicorn --preload so that forked workers share the loaded modules
+    """
+    for view in app.view_functions.values():
+        if isinstance(view, LazyView):
+            view.load()
+
+
+def mark_app_ready():
+    """record the app import time and RSS, called once app.py has set up the app
+    """
+    _REPORT["app_import_s"] = round(time.perf_counter() - _T0, 4)
+    _REPORT["rss_mb_at_startup"] = rss_mb()
+
+
+def import_report():
+    """cold-start and memory report of this worker
+
+    Returns:
+        dict, app import time [s], RSS [MB] at startup and now, and the load time of each view imported so far
+    """
+    with _REPORT_LOCK:
+        views = dict(_REPORT["views"])
+    return {"pid": os.getpid(),
+            "app_import_s": _REPORT["app_import_s"],
+            "rss_mb_at_startup": _REPORT["rss_mb_at_startup"],
+            "rss_mb": rss_mb(),
+            "views_loaded": len(views),
+            "views": views}
+
+
+def import_report_route():
+    return jsonify(import_report())
@@ -5,9 +5,16 @@ from boltedconn.boltdata import BoltLibrary
 from boltedconn.boltuls import bolt_connection_uls_strength_check, flange_searching_geometry
 from boltedconn.plotterflange import l_flange_plotter
 from boltedconn.plotterutils import bolt_util_plotter_process
+from resultcache import cached
 
 app = Flask(__name__)
 
+# the ULS check, flange search and util plot are cached on their inputs, a cached flange_obj is a copy so the route can
+# update it (e.g. util)
+bolt_connection_uls_strength_check = cached("boltedconn")(bolt_connection_uls_strength_check)
+flange_searching_geometry = cached("boltedconn")(flange_searching_geometry)
+bolt_util_plotter_process = cached("boltedconn")(bolt_util_plotter_process)
+
 @app.route('/boltedconn', methods=['GET', 'POST'])
 def boltedconn_route():
 
@@ -8,6 +8,7 @@ from boltedconn.boltdata import BoltLibrary, BoltMaterialLibrary
 from boltedconn.flange import BoltedFlange
 from boltedconn.steel import SteelMaterial
 from boltedconn.tensionerdata import BoltTensionerLibrary
+from timing import timed
 
 
 def bolt_connection_uls_strength_check(outer_diameter, wall_thickness,
@@ -43,6 +44,7 @@ def bolt_connection_uls_strength_check(outer_diameter, wall_thickness,
     flange_obj.calc_util()
     return flange_obj
 
+@timed()
 def flange_searching_geometry(outer_diameter, wall_thickness, bolt_steel_grade, flange_steel_grade, tower_steel_grade,
                               ULS_bending_moment, ULS_axial_force, maintain_a_b_ratio_1_25,
                               target_util,
@@ -3,6 +3,7 @@ from flask import Flask, request, jsonify, render_template, url_for
 # local
 from conescfs.coneplotter import cone_scfs_plot
 from conescfs.scfprocess import cone_scf_single, cone_scf_sweep, tt_scf_process, cone_tt_scf_process
+from resultcache import cached
 
 app = Flask(__name__)
 
@@ -59,8 +60,9 @@ def cone_route():
         xlim = float(cone_x_axis_lims.split("t")[-1]) # "t25", "t50", "t100"
         x_arr = np.linspace(base_val * (1 - xlim/100), base_val * (1 + xlim/100), 21)  # +/- 50% of the nominal value
 
-        single_results = cone_scf_single(radius_tubular, thickness_tubular, thickness_cone, alpha, junction_type)
-        sweep_results = cone_scf_sweep(junction_type, cone_x_axis_vary, x_arr, cone_scf_numeric_fields)
+        # single and sweep SCFs and the inside and outside plots, cached on the inputs
+        single_results, conescfs_plot_json_in, conescfs_plot_json_out = get_cone_scf_results(
+            radius_tubular, thickness_tubular, thickness_cone, alpha, junction_type, cone_x_axis_vary, x_arr)
 
         # single (one off) SCF results---------------------
         # --- Section 3 ---
@@ -75,19 +77,6 @@ def cone_route():
         scf_tube_out_appf = single_results["appf17"]["tube_out"]
         scf_cone_out_appf = single_results["appf17"]["cone_out"]
 
-        # sweep results SCF curves-----------------------
-        # --- Section 3 curves ---
-        scf_tube_ins = sweep_results["sect3"]["tube_in"]
-        scf_cone_ins = sweep_results["sect3"]["cone_in"]
-        scf_tube_outs = sweep_results["sect3"]["tube_out"]
-        scf_cone_outs = sweep_results["sect3"]["cone_out"]
-
-        # --- App F curves ---
-        scf_tube_in_appfs = sweep_results["appf17"]["tube_in"]
-        scf_cone_in_appfs = sweep_results["appf17"]["cone_in"]
-        scf_tube_out_appfs = sweep_results["appf17"]["tube_out"]
-        scf_cone_out_appfs = sweep_results["appf17"]["cone_out"]
-
         # thickness transition SCF processing--------------------------------------------------------------------------
         # scfs inside and outside
         scf_inside_tt, scf_outside_tt, length = tt_scf_process(thickness_tubular, thickness_cone, radius_tubular,
@@ -107,10 +96,6 @@ def cone_route():
         scf_tube_out_appf_tt = cone_tt_single_results["appf17"]["tube_out_tt"]
         scf_cone_out_appf_tt = cone_tt_single_results["appf17"]["cone_out_tt"]
 
-        # plot the inside SCFs (outside and inside curves)---------------------------------------------------------------
-        conescfs_plot_json_in = cone_scfs_plot(x_arr.tolist(), scf_tube_ins, scf_tube_in_appfs, scf_cone_ins, scf_cone_in_appfs, junction_type, cone_x_axis_vary, "INSIDE")
-        conescfs_plot_json_out = cone_scfs_plot(x_arr.tolist(), scf_tube_outs, scf_tube_out_appfs, scf_cone_outs, scf_cone_out_appfs, junction_type, cone_x_axis_vary, "OUTSIDE")
-
         # scf messages re. implementation approach
         scf_msgs = get_scf_implementation_msgs(scf_inclusion, length)
 
@@ -177,6 +162,26 @@ def cone_route():
         return render_template("conescfs.html", **default_data)
 
 
+@cached("cone")
+def get_cone_scf_results(radius_tubular, thickness_tubular, thickness_cone, alpha, junction_type, cone_x_axis_vary,
+                         x_arr):
+    """single cone SCFs and the inside and outside plots of the SCFs swept over x_arr (values of cone_x_axis_vary)
+    """
+    single_results = cone_scf_single(radius_tubular, thickness_tubular, thickness_cone, alpha, junction_type)
+    cone_scf_numeric_fields = {"radius_tubular": radius_tubular, "thickness_tubular": thickness_tubular,
+                               "thickness_cone": thickness_cone, "alpha": alpha}
+    sweep_results = cone_scf_sweep(junction_type, cone_x_axis_vary, x_arr, cone_scf_numeric_fields)
+
+    # plot the inside and outside SCFs (tube and cone curves)
+    sect3, appf = sweep_results["sect3"], sweep_results["appf17"]
+    plot_json_in = cone_scfs_plot(x_arr.tolist(), sect3["tube_in"], appf["tube_in"], sect3["cone_in"], appf["cone_in"],
+                                  junction_type, cone_x_axis_vary, "INSIDE")
+    plot_json_out = cone_scfs_plot(x_arr.tolist(), sect3["tube_out"], appf["tube_out"], sect3["cone_out"],
+                                   appf["cone_out"], junction_type, cone_x_axis_vary, "OUTSIDE")
+
+    return single_results, plot_json_in, plot_json_out
+
+
 def get_cone_and_tt_imgs(junction_type, transition_side, scf_weld_type, thickness_transition):
 
     # get correct cone image
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+# local
+from jktdesign.jacket import Jacket
+from conescfs.scfs import calc_cone_scfs_sect3_arr, calc_cone_scfs_appf17_arr
+from conescfs.thktransitionscfs import calc_scf_thickness_transition_arr
+from conescfs.scfprocess import cone_scf_batch_sweep, cone_tt_scf_combine_arr
+
+SCF_LOCS = ["tube_in", "cone_in", "tube_out", "cone_out"]
+JUNCTION_COLUMNS = ["name", "member_type", "junction", "radius_tubular", "thickness_tubular", "thickness_cone",
+                    "alpha", "x", "elevation"]
+
+
+def get_jkt_cone_junctions(jkt_obj: Jacket):
+    """get every cone junction (large and small diameter end) from the jacket section model i.e. after the legs and
+    bay braces have been added to the Jacket obj. Mirrored leg sections are skipped as they are identical.
+
+    The tubular and cone thicknesses are both the Leg thickness, alpha [degrees] follows from the cone taper ratio.
+
+    Returns:
+        pd.DataFrame, one row per cone junction
+    """
+    rows = []
+    for leg_obj in jkt_obj.leg_objs + jkt_obj.brace_a_objs + jkt_obj.brace_b_objs:
+        if leg_obj.mirror or not leg_obj.is_cone:
+            continue
+        d_large, d_small = max(leg_obj.width1, leg_obj.width2), min(leg_obj.width1, leg_obj.width2)
+        alpha = np.degrees(np.arctan(0.5 * (d_large - d_small) / leg_obj.cone_length))
+        # cone_pt1 is always at the large diameter end of the cone (see Leg._create_cone_segment)
+        for junction, d, pt in (("large", d_large, leg_obj.cone_pt1), ("small", d_small, leg_obj.cone_pt2)):
+            rows.append({"name": leg_obj.leg_name,
+                         "member_type": leg_obj.member_type,
+                         "junction": junction,
+                         "radius_tubular": d / 2,
+                         "thickness_tubular": leg_obj.thk,
+                         "thickness_cone": leg_obj.thk,
+                         "alpha": alpha,
+                         "x": pt[0],
+                         "elevation": pt[1]})
+
+    return pd.DataFrame(rows, columns=JUNCTION_COLUMNS)
+
+
+def screen_jkt_cones(jkt_obj: Jacket, weld_width=75., delta_m=4., delta_0=1.85, scf_taper_ratio=4.,
+                     scf_weld_type="single_sided", transition_side="outside", scf_inclusion="yes_linear_add",
+                     nominal_stress_range=None):
+    """SCF screening of all cone junctions in the jacket. Section 3 and App F.17 cone SCFs, and the thickness
+    transition SCFs, are calculated for all junctions at once and combined as on the /conescfs page.
+
+    Args:
+        jkt_obj (Jacket): jacket with legs and bay braces added
+        weld_width, delta_m, delta_0, scf_taper_ratio, scf_weld_type, transition_side: thickness transition inputs
+        scf_inclusion (str): "yes_multiply", "yes_linear_add" or "no"
+        nominal_stress_range (float, optional): if given, hot spot stress ranges are added to the table
+
+    Returns:
+        pd.DataFrame, one row per cone junction ranked by the governing (max) SCF
+    """
+    df = get_jkt_cone_junctions(jkt_obj)  # no cones gives an empty table with all the columns below
+    radius_tubular, alpha = df["radius_tubular"].to_numpy(), df["alpha"].to_numpy()
+    thickness_tubular, thickness_cone = df["thickness_tubular"].to_numpy(), df["thickness_cone"].to_numpy()
+    small_junction = (df["junction"] == "small").to_numpy()
+
+    cone_scfs = {"sect3": calc_cone_scfs_sect3_arr(radius_tubular, thickness_tubular, thickness_cone, alpha,
+                                                   small_junction),
+                 "appf17": calc_cone_scfs_appf17_arr(radius_tubular, thickness_tubular, thickness_cone, alpha,
+                                                     small_junction)}
+
+    # thickness transition, thick and thin member
+    thk_thick, thk_thin = np.maximum(thickness_tubular, thickness_cone), np.minimum(thickness_tubular, thickness_cone)
+    scf_inside_tt, scf_outside_tt, _ = calc_scf_thickness_transition_arr(2 * radius_tubular, thk_thick, thk_thin,
+                                                                         weld_width, delta_m, delta_0, scf_taper_ratio,
+                                                                         scf_weld_type, transition_side)
+    df["scf_inside_tt"], df["scf_outside_tt"] = scf_inside_tt, scf_outside_tt
+
+    # combined cone and thickness transition SCFs, the governing one is the max over all methods and locations
+    scf_cols = []
+    for method, scfs in cone_scfs.items():
+        cone_tt_scfs = cone_tt_scf_combine_arr(scfs, scf_inside_tt, scf_outside_tt, scf_inclusion)
+        for loc, cone_scf, cone_tt_scf in zip(SCF_LOCS, scfs, cone_tt_scfs):
+            df[f"{method}_{loc}"] = cone_scf
+            df[f"{method}_{loc}_tt"] = cone_tt_scf
+            scf_cols.append(f"{method}_{loc}_tt")
+
+    scf_all = df[scf_cols].to_numpy()
+    gov_idx = np.argmax(scf_all, axis=1)
+    df["scf_max"] = scf_all[np.arange(len(df)), gov_idx]
+    df["scf_max_loc"] = np.array(scf_cols)[gov_idx]
+    if nominal_stress_range is not None:
+        df["hot_spot_stress_range"] = df["scf_max"] * nominal_stress_range
+
+    df = df.sort_values(by="scf_max", ascending=False).reset_index(drop=True)
+    df.insert(0, "rank", np.arange(1, len(df) + 1))
+    return df
+
+
+def sweep_jkt_cones(df, cone_x_axis_vary, xlim=10., n_pts=21):
+    """Section 3 and App F.17 cone SCFs of every junction of a jacket swept over ±xlim% of one variable, in one call
+
+    Args:
+        df (pd.DataFrame): cone junctions, get_jkt_cone_junctions or screen_jkt_cones (the rows keep their order)
+        cone_x_axis_vary (str): "radius_tubular", "thickness_tubular", "thickness_cone" or "alpha"
+        xlim (float): ± variation in % of the value of each junction
+        n_pts (int): number of points in each sweep
+
+    Returns:
+        dict, "x" of shape (n_junctions, n_pts), "sect3" and "appf17" dicts of SCF_LOCS: arrays of the same shape
+    """
+    sweep = cone_scf_batch_sweep(df["radius_tubular"].to_numpy(), df["thickness_tubular"].to_numpy(),
+                                 df["thickness_cone"].to_numpy(), df["alpha"].to_numpy(), df["junction"].to_numpy(),
+                                 cone_x_axis_vary, xlim, n_pts)
+    return {"x": sweep["x"], **{method: dict(zip(SCF_LOCS, sweep[method])) for method in ("sect3", "appf17")}}
@@ -1,4 +1,6 @@
-from conescfs.scfs import calc_cone_scfs_sect3, calc_cone_scfs_appf17
+import numpy as np
+from conescfs.scfs import (calc_cone_scfs_sect3, calc_cone_scfs_appf17, calc_cone_scfs_sect3_arr,
+                           calc_cone_scfs_appf17_arr, small_junction_mask)
 from conescfs.thktransitionscfs import calc_scf_thickness_transition
 
 
@@ -20,25 +22,54 @@ def cone_scf_sweep(junction_type, cone_x_axis_vary, x_arr, numeric_inputs):
     """
 
     keys = ["tube_in", "cone_in", "tube_out", "cone_out"]
-    results = {"x": x_arr, "sect3": {k: [] for k in keys}, "appf17": {k: [] for k in keys}}
+    args = {k: np.asarray(v, dtype=float) for k, v in numeric_inputs.items()}
+    args[cone_x_axis_vary] = np.asarray(x_arr, dtype=float)
+    small_junction = small_junction_mask(junction_type)
+
+    sect3_vals = calc_cone_scfs_sect3_arr(args["radius_tubular"], args["thickness_tubular"], args["thickness_cone"],
+                                          args["alpha"], small_junction)
+    appf_vals = calc_cone_scfs_appf17_arr(args["radius_tubular"], args["thickness_tubular"], args["thickness_cone"],
+                                          args["alpha"], small_junction)
+
+    # lists, as the plotter concatenates the curves
+    return {"x": x_arr,
+            "sect3": dict(zip(keys, sect3_vals.tolist())),
+            "appf17": dict(zip(keys, appf_vals.tolist()))
+            }
+
 
-    for x in x_arr:
-        args = numeric_inputs.copy()
-        args[cone_x_axis_vary] = x
+def cone_scf_batch_sweep(radius_tubular, thickness_tubular, thickness_cone, alpha, junction_type, cone_x_axis_vary,
+                         xlim=0., n_pts=21):
+    """Returns SCFs for many cone junctions at once, each swept over ±xlim% of the selected variable.
 
-        sect3_vals = calc_cone_scfs_sect3(args["radius_tubular"], args["thickness_tubular"], args["thickness_cone"],
-            args["alpha"], junction_type)
+    Args:
+        radius_tubular, thickness_tubular, thickness_cone, alpha: array_like of shape (n_cones,)
+        junction_type: "small"/"large" or array of these of shape (n_cones,)
+        cone_x_axis_vary (str): variable to sweep, one of "radius_tubular", "thickness_tubular", "thickness_cone", "alpha"
+        xlim (float): ± variation in % of the nominal value (0. gives the nominal SCFs only)
+        n_pts (int): number of points in each sweep
 
-        appf_vals = calc_cone_scfs_appf17(args["radius_tubular"], args["thickness_tubular"], args["thickness_cone"],
-            args["alpha"], junction_type)
+    Returns:
+        dict, "x" of shape (n_cones, n_pts), "sect3" and "appf17" of shape (4, n_cones, n_pts) stacked as
+        tube_in, cone_in, tube_out, cone_out
+    """
+    args = {"radius_tubular": radius_tubular, "thickness_tubular": thickness_tubular,
+            "thickness_cone": thickness_cone, "alpha": alpha}
+    if cone_x_axis_vary not in args:
+        raise ValueError(f"cone_x_axis_vary must be one of {list(args)}, got {cone_x_axis_vary}")
+    args = {k: np.atleast_1d(np.asarray(v, dtype=float))[:, None] for k, v in args.items()}
+    small_junction = np.atleast_1d(small_junction_mask(junction_type))[:, None]
 
-        for key, val in zip(keys, sect3_vals):
-            results["sect3"][key].append(val)
+    factors = np.linspace(1 - xlim / 100, 1 + xlim / 100, n_pts if xlim else 1)
+    args[cone_x_axis_vary] = args[cone_x_axis_vary] * factors
 
-        for key, val in zip(keys, appf_vals):
-            results["appf17"][key].append(val)
+    x = np.broadcast_to(args[cone_x_axis_vary], (len(small_junction), len(factors)))
+    sect3_vals = calc_cone_scfs_sect3_arr(args["radius_tubular"], args["thickness_tubular"], args["thickness_cone"],
+                                          args["alpha"], small_junction)
+    appf_vals = calc_cone_scfs_appf17_arr(args["radius_tubular"], args["thickness_tubular"], args["thickness_cone"],
+                                          args["alpha"], small_junction)
 
-    return results
+    return {"x": x, "sect3": sect3_vals, "appf17": appf_vals}
 
 def tt_scf_process(thickness_tubular, thickness_cone, radius_tubular, transition_side, weld_width, delta_m, delta_0,
                    scf_taper_ratio, scf_weld_type):
@@ -88,3 +119,20 @@ def cone_tt_scf_process(single_results, scf_inside_tt, scf_outside_tt, scf_inclu
     return cone_tt_single_results
 
 
+def cone_tt_scf_combine_arr(cone_scfs, scf_inside_tt, scf_outside_tt, scf_inclusion):
+    """Array version of cone_tt_scf_process for one set of stacked cone SCFs.
+
+    Args:
+        cone_scfs (np.ndarray): shape (4, ...) stacked as tube_in, cone_in, tube_out, cone_out
+        scf_inside_tt, scf_outside_tt (array_like): thickness transition SCFs, broadcast against cone_scfs[0]
+        scf_inclusion (str): "yes_multiply", "yes_linear_add" or "no"
+
+    Returns:
+        np.ndarray of shape (4, ...) of the combined SCFs
+    """
+    scf_tt = np.stack(np.broadcast_arrays(scf_inside_tt, scf_inside_tt, scf_outside_tt, scf_outside_tt))
+    if scf_inclusion == "yes_multiply":
+        return cone_scfs * scf_tt
+    elif scf_inclusion == "yes_linear_add":
+        return cone_scfs + (scf_tt - 1.)
+    return np.array(cone_scfs, dtype=float)
@@ -1,6 +1,50 @@
 from typing import Literal
 import numpy as np
-import math
+
+
+def small_junction_mask(junction_type):
+    """Boolean mask, True where the junction is at the small diameter end of the cone.
+
+    Args:
+        junction_type (str or array of str): "small" or "large" junction(s)
+
+    Returns:
+        np.ndarray (bool) of same shape as junction_type
+    """
+    junction_type = np.asarray(junction_type)
+    if not np.isin(junction_type, ["small", "large"]).all():
+        raise ValueError(f"junction_type must be 'small' or 'large', got {junction_type}")
+    return junction_type == "small"
+
+
+def calc_cone_scfs_sect3_arr(radius_tubular, thickness_tubular, thickness_cone, alpha, small_junction):
+    """Array version of calc_cone_scfs_sect3. All inputs are broadcast against each other.
+
+    Args:
+        radius_tubular (array_like): Tube radius
+        thickness_tubular (array_like): Tube thickness
+        thickness_cone (array_like): Cone thickness
+        alpha (array_like): Cone angle in degrees
+        small_junction (array_like of bool): True for small diameter junction, False for large (see small_junction_mask)
+
+    Returns:
+        np.ndarray of shape (4, *broadcast shape) stacked as scf_tube_in, scf_cone_in, scf_tube_out, scf_cone_out
+    """
+    radius_tubular, thickness_tubular, thickness_cone, alpha, small_junction = np.broadcast_arrays(
+        radius_tubular, thickness_tubular, thickness_cone, alpha, small_junction)
+
+    alpha = np.radians(np.abs(alpha))
+    tube_OD = radius_tubular * 2
+    numerator = 0.6 * thickness_tubular * np.sqrt(tube_OD * (thickness_tubular + thickness_cone)) * np.tan(alpha)
+    tube_term = numerator / (thickness_tubular ** 2)
+    cone_term = numerator / (thickness_cone ** 2)
+
+    # inside is the 1 - term (eqn 2) at the small junction and 1 + term (eqn 1) at the large junction
+    sign_in = np.where(small_junction, -1., 1.)
+
+    return np.stack([1 + sign_in * tube_term, 1 + sign_in * cone_term,
+                     1 - sign_in * tube_term, 1 - sign_in * cone_term])
+
 
 def calc_cone_scfs_sect3(radius_tubular: float, thickness_tubular: float, thickness_cone: float, alpha: float,
                         junction_type: Literal["small", "large"]):
@@ -15,46 +59,34 @@ def calc_cone_scfs_sect3(radius_tubular: float, thickness_tubular: float, thickn
     Returns:
         scf_tube (float), scf_cone (float)
     """
-    alpha = np.radians(abs(alpha))
-    tube_OD = radius_tubular * 2
-    numerator = 0.6 * thickness_tubular * math.sqrt(tube_OD * (thickness_tubular + thickness_cone)) * math.tan(alpha)
-    scf_tube_1 = 1 + numerator / (thickness_tubular ** 2)
-    scf_cone_1 = 1 + numerator / (thickness_cone ** 2)
-
-    scf_tube_2 = 1 - numerator / (thickness_tubular ** 2)
-    scf_cone_2 = 1 - numerator / (thickness_cone ** 2)
-
-    # calculate inside and outside SCFs at the small and large diameter cone junctions
-    if junction_type == "small":
-        scf_tube_in, scf_cone_in = scf_tube_2, scf_cone_2
-        scf_tube_out, scf_cone_out = scf_tube_1, scf_cone_1
-
-    elif junction_type == "large":
-        scf_tube_in, scf_cone_in = scf_tube_1, scf_cone_1
-        scf_tube_out, scf_cone_out = scf_tube_2, scf_cone_2
+    scfs = calc_cone_scfs_sect3_arr(radius_tubular, thickness_tubular, thickness_cone, alpha,
+                                    small_junction_mask(junction_type))
 
     # scfs inside and outside (cone- and tube- side)
+    scf_tube_in, scf_cone_in, scf_tube_out, scf_cone_out = (float(v) for v in scfs)
     return scf_tube_in, scf_cone_in, scf_tube_out, scf_cone_out
 
-### app F DNV eqns to do
-def calc_cone_scfs_appf17(radius_tubular: float,  thickness_tubular: float, thickness_cone: float, alpha: float,
-                      junction_type: Literal["small", "large"],
-                      poisson_ratio: float = 0.3, elastic_modulus: float = 210000000000):
-    """Conical SCFs see 2025 DNV-RP-C203 Section Appendix F.17 (see commentary from 3.3.9)
+
+def calc_cone_scfs_appf17_arr(radius_tubular, thickness_tubular, thickness_cone, alpha, small_junction,
+                              poisson_ratio: float = 0.3, elastic_modulus: float = 210000000000):
+    """Array version of calc_cone_scfs_appf17. All inputs are broadcast against each other.
 
     Args:
-        radius_tubular (float): outer radius of tubular [m]
-        thickness_tubular (float): thickness of tubular [m]
-        thickness_cone (float): thickness of conical [m]
-        alpha (float): angle of cone [radians]
-        junction_type (str): type of junction ("small" or "large")
+        radius_tubular (array_like): outer radius of tubular [m]
+        thickness_tubular (array_like): thickness of tubular [m]
+        thickness_cone (array_like): thickness of conical [m]
+        alpha (array_like): angle of cone [degrees]
+        small_junction (array_like of bool): True for small diameter junction, False for large (see small_junction_mask)
         poisson_ratio (float, optional): Poisson's ratio, defaults 0.3
         elastic_modulus (float, optional): Young's modulus, defaults 2.1E11 Pa
 
-    Returns: SCF cone (outer, inner) and SCF tubular (outer, inner)
+    Returns:
+        np.ndarray of shape (4, *broadcast shape) stacked as scf_tube_in, scf_cone_in, scf_tube_out, scf_cone_out
     """
+    radius_tubular, thickness_tubular, thickness_cone, alpha, small_junction = np.broadcast_arrays(
+        radius_tubular, thickness_tubular, thickness_cone, alpha, small_junction)
 
-    alpha = np.radians(abs(alpha))
+    alpha = np.radians(np.abs(alpha))
 
     r = radius_tubular - thickness_tubular / 2  # centreline radius of tubular
 
@@ -80,24 +112,38 @@ def calc_cone_scfs_appf17(radius_tubular: float,  thickness_tubular: float, thic
 
     eta = (phi * lambda_ * (2 * k + 2) - k * epsilon * np.tan(alpha)) / ((2 * k + 2) * (nu * phi - epsilon))
 
-    scf_tube_1 = 1 + ((6 * eta * l_et) / thickness_tubular)
-    scf_tube_2 = 1 - ((6 * eta * l_et) / thickness_tubular)
+    tube_bending = (6 * eta * l_et) / thickness_tubular
+
+    cone_membrane = (((nu * eta - lambda_) / epsilon) * (l_et / l_ec) * np.tan(alpha)
+                     + (1 / np.cos(alpha)) * (thickness_tubular / thickness_cone))
+    cone_bending = ((6 * eta * l_et) / thickness_cone) * (thickness_tubular / thickness_cone)
 
-    scf_cone_1 = (((nu * eta - lambda_) / epsilon) * (l_et / l_ec) * np.tan(alpha)
-                  + (1 / np.cos(alpha)) * (thickness_tubular / thickness_cone)
-                  + ((6 * eta * l_et) / thickness_cone) * (thickness_tubular / thickness_cone))
+    # inside is the "- bending" SCF (2) at the small junction and the "+ bending" SCF (1) at the large junction
+    sign_in = np.where(small_junction, -1., 1.)
 
-    scf_cone_2 = (((nu * eta - lambda_) / epsilon) * (l_et / l_ec) * np.tan(alpha)
-                  + (1 / np.cos(alpha)) * (thickness_tubular / thickness_cone)
-                  - ((6 * eta * l_et) / thickness_cone) * (thickness_tubular / thickness_cone))
+    return np.stack([1 + sign_in * tube_bending, cone_membrane + sign_in * cone_bending,
+                     1 - sign_in * tube_bending, cone_membrane - sign_in * cone_bending])
 
-    # calculate inside and outside SCFs at the small and large diameter cone junctions
-    if junction_type == "small":
-        scf_tube_in, scf_cone_in = scf_tube_2, scf_cone_2
-        scf_tube_out, scf_cone_out = scf_tube_1, scf_cone_1
 
-    elif junction_type == "large":
-        scf_tube_in, scf_cone_in = scf_tube_1, scf_cone_1
-        scf_tube_out, scf_cone_out = scf_tube_2, scf_cone_2
+### app F DNV eqns to do
+def calc_cone_scfs_appf17(radius_tubular: float,  thickness_tubular: float, thickness_cone: float, alpha: float,
+                      junction_type: Literal["small", "large"],
+                      poisson_ratio: float = 0.3, elastic_modulus: float = 210000000000):
+    """Conical SCFs see 2025 DNV-RP-C203 Section Appendix F.17 (see commentary from 3.3.9)
 
-    return scf_tube_in, scf_cone_in, scf_tube_out, scf_cone_out
\ No newline at end of file
+    Args:
+        radius_tubular (float): outer radius of tubular [m]
+        thickness_tubular (float): thickness of tubular [m]
+        thickness_cone (float): thickness of conical [m]
+        alpha (float): angle of cone [radians]
+        junction_type (str): type of junction ("small" or "large")
+        poisson_ratio (float, optional): Poisson's ratio, defaults 0.3
+        elastic_modulus (float, optional): Young's modulus, defaults 2.1E11 Pa
+
+    Returns: SCF cone (outer, inner) and SCF tubular (outer, inner)
+    """
+    scfs = calc_cone_scfs_appf17_arr(radius_tubular, thickness_tubular, thickness_cone, alpha,
+                                     small_junction_mask(junction_type), poisson_ratio, elastic_modulus)
+
+    scf_tube_in, scf_cone_in, scf_tube_out, scf_cone_out = (float(v) for v in scfs)
+    return scf_tube_in, scf_cone_in, scf_tube_out, scf_cone_out
@@ -70,4 +70,46 @@ def calc_scf_thickness_transition(
 
 
 
+    return scf_inside, scf_outside, length
+
+
+def calc_scf_thickness_transition_arr(D, T, t, weld_width, delta_m, delta_0, taper_ratio,
+                                      weld_type: Literal["single_sided", "double_sided"],
+                                      transition: Literal["inside", "outside"]):
+    """Array version of calc_scf_thickness_transition (DNV-RP-C203 Section 3.3.7). D, T, t, weld_width, delta_m and
+    delta_0 are broadcast against each other, taper_ratio, weld_type and transition apply to all.
+
+    Returns:
+        scf_inside (np.ndarray), scf_outside (np.ndarray), length (np.ndarray)
+    """
+    D, T, t, weld_width, delta_m, delta_0 = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in
+                                                                 (D, T, t, weld_width, delta_m, delta_0)))
+    dt = 0.5 * (T - t)
+    if weld_type == "single_sided":
+        delta_0 = np.zeros_like(delta_0)
+
+    thickness_transition = T - t
+    if taper_ratio is None:
+        length = weld_width
+    else:
+        length = np.where(thickness_transition != 0, taper_ratio * thickness_transition, weld_width)
+
+    beta = (1.5 - 1 / np.log10(D / t) + 3 / (np.log10(D / t)) ** 2)
+    alpha = (1.82 * length / np.sqrt(D * t) / (1 + (T / t) ** beta))
+
+    scf1 = 1 + (6 * (dt + delta_m - delta_0) / t) * (1. / (1. + (T / t) ** beta)) * np.exp(-alpha)  # Eq 3.10
+    scf2 = 1 - (6 * (dt - delta_m + delta_0) / t) * (1. / (1. + (T / t) ** beta)) * np.exp(-alpha)  # Eq 3.11
+    if transition == "inside":
+        scf_inside, scf_outside = scf1, scf2
+    elif transition == "outside":
+        scf_inside, scf_outside = scf2, scf1
+    else:
+        scf_inside, scf_outside = scf1, scf1
+
+    # butt welds between members with equal thickness, 3.3.7.2 in DNV RP C203 2025
+    equal_thk = np.isclose(thickness_transition, 0.)
+    scf_butt = 1 + 3 * (delta_m - delta_0) * np.exp(-0.91 * weld_width / np.sqrt(D * t)) / t
+    scf_inside = np.where(equal_thk, 1. if weld_type == "single_sided" else scf_butt, scf_inside)
+    scf_outside = np.where(equal_thk, scf_butt, scf_outside)
+
     return scf_inside, scf_outside, length
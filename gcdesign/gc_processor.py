@@ -1,10 +1,12 @@
 from gcdesign.groutuls.groutuls import axial, pnom_calc, axial_and_bending, axial_fea_calibration_load
 from gcdesign.groutuls.groutvalidity import validity
+from timing import timed
 
 
 
 
 
+@timed()
 def gc_processor(leg_od, leg_t, pile_od, pile_t, gc_length, n_sks, sk_width, sk_height, sk_spacing, fx, fy, fz, mx, my, grout_E, grout_strength):
 
     # SK axial and axial+bending UR
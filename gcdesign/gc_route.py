@@ -5,6 +5,7 @@ from gcdesign.plotterbm import bm_plotter
 from gcdesign.plotterfbk import skspacing_vs_fbk_plot
 from gcdesign.plottergc import gc_plotter
 from gcdesign.plottergrtmtx import shear_capacity_plotter
+from resultcache import cached
 
 app = Flask(__name__)
 
@@ -45,23 +46,12 @@ def gc_route():
             geom_warnings.append(f"Error: SK length ({n_sks * sk_spacing}) exceeds GC length ({gc_length})")
 
 
-        # pass to the gc processor for all the calcs
-        res, validity_chks, elastic_length = gc_processor(leg_od, leg_t, pile_od, pile_t, gc_length, n_sks, sk_width,
-                                                          sk_height, sk_spacing, fx, fy, fz, mx, my, grout_E, grout_strength)
-
-        # generate the plots
-        gc_plot_json = gc_plotter(leg_od, leg_t, pile_od, pile_t, gc_length, n_sks, sk_width, sk_height, sk_spacing, elastic_length)
-        bm_plot_json = bm_plotter(fx, fy, mx, my, gc_length, pile_od)
-        gc_shrcap_plot_json = shear_capacity_plotter(leg_od, leg_t, pile_od, pile_t, sk_height, sk_spacing, grout_E, grout_strength)
-        gc_fbk_plot_json = skspacing_vs_fbk_plot(leg_od, leg_t, pile_od, pile_t, sk_height, sk_spacing, grout_E, grout_strength)
+        # gc processor calcs and plots, cached on the inputs
+        gc_results = get_gc_results(leg_od, leg_t, pile_od, pile_t, gc_length, n_sks, sk_width, sk_height, sk_spacing,
+                                    fx, fy, fz, mx, my, grout_E, grout_strength)
 
         return jsonify({'gc_message': 'Plot updated successfully',
-                        'gc_plot_json': gc_plot_json,
-                        'bm_plot_json': bm_plot_json,
-                        'gc_shrcap_plot_json': gc_shrcap_plot_json,
-                        'gc_fbk_plot_json': gc_fbk_plot_json,
-                        "res": res,
-                        "validity_chks": validity_chks,
+                        **gc_results,
                         "geom_warnings": geom_warnings
                         })
 
@@ -72,6 +62,29 @@ def gc_route():
                            defaults=defaults)
 
 
+@cached("gc")
+def get_gc_results(leg_od, leg_t, pile_od, pile_t, gc_length, n_sks, sk_width, sk_height, sk_spacing, fx, fy, fz, mx,
+                   my, grout_E, grout_strength):
+    """gc_processor results and the plot jsons of the grouted connection, keyed as in the /gc response
+    """
+    # pass to the gc processor for all the calcs
+    res, validity_chks, elastic_length = gc_processor(leg_od, leg_t, pile_od, pile_t, gc_length, n_sks, sk_width,
+                                                      sk_height, sk_spacing, fx, fy, fz, mx, my, grout_E, grout_strength)
+
+    # generate the plots
+    gc_plot_json = gc_plotter(leg_od, leg_t, pile_od, pile_t, gc_length, n_sks, sk_width, sk_height, sk_spacing, elastic_length)
+    bm_plot_json = bm_plotter(fx, fy, mx, my, gc_length, pile_od)
+    gc_shrcap_plot_json = shear_capacity_plotter(leg_od, leg_t, pile_od, pile_t, sk_height, sk_spacing, grout_E, grout_strength)
+    gc_fbk_plot_json = skspacing_vs_fbk_plot(leg_od, leg_t, pile_od, pile_t, sk_height, sk_spacing, grout_E, grout_strength)
+
+    return {'gc_plot_json': gc_plot_json,
+            'bm_plot_json': bm_plot_json,
+            'gc_shrcap_plot_json': gc_shrcap_plot_json,
+            'gc_fbk_plot_json': gc_fbk_plot_json,
+            "res": res,
+            "validity_chks": validity_chks}
+
+
 def get_gc_defaults():
 
     # test ones
@@ -130,6 +130,9 @@ def pnom_calc(leg_od, leg_t, pile_od, pile_t, grout_E, fx, fy, mxo, myo, gc_leng
 
 def fbk_vs_grout_matrix_failure(leg_od, leg_t, pile_od, pile_t, sk_spacing, sk_height, grout_E, grout_strength):
     """ get vals for grout matrix failure plot
+
+        sk_spacing may be a numpy array of shear key spacings, the radial stiffness k is calculated once for the
+        geometry and fbk, fbk_limit are returned for all spacings (units: Pa)
     """
     mm_to_m = 1e-3
     mpa_to_pa = 1e6
@@ -139,11 +142,12 @@ def fbk_vs_grout_matrix_failure(leg_od, leg_t, pile_od, pile_t, sk_spacing, sk_h
     tp = pile_t * mm_to_m
     es, eg = STEEL_E * mpa_to_pa, grout_E * mpa_to_pa
     fck = grout_strength * mpa_to_pa
-    h, s = sk_height * mm_to_m, sk_spacing * mm_to_m
+    h, s = sk_height * mm_to_m, np.asarray(sk_spacing, dtype=float) * mm_to_m
 
     pile_ir = rp - tp
     if pile_ir <= rj:
-        return 999., 999.
+        invalid = np.full(s.shape, 999.)[()]
+        return invalid, invalid
     # nominal thickness of grout
     tg = rp - tp - rj
     # radial stiffness parameter, C.1.4.3
@@ -152,43 +156,40 @@ def fbk_vs_grout_matrix_failure(leg_od, leg_t, pile_od, pile_t, sk_spacing, sk_h
     fbk = (((800 / (2 * (rj * 1e3)) + 140 * (h / s) ** 0.8)) * (k ** 0.6) * ((fck / 1e6) ** 0.3)) * mpa_to_pa
     # codified fbk_limit
     fbk_limit = (0.75 - 1.4 * (h / s)) * ((fck / mpa_to_pa) ** 0.5) * mpa_to_pa
-    return fbk, fbk_limit
+    return fbk[()], fbk_limit[()]
 
 
 def get_grout_matrix_failure_plot_vals(leg_od, leg_t, pile_od, pile_t, sk_height, grout_E, grout_strength,
                                        max_sk_spacing, min_sk_spacing, sk_spacing_actual):
     """calculate shear capacity, fbk, and shear capacity grout matrix failure limit ,fbk_limit
 
-    Create array of h/s vals and fbk vals for plotting
+    Create array of h/s vals and fbk vals for plotting. fbk increases and fbk_limit decreases with h/s, the h/s limit
+    is the first h/s (on the spacing grid) where fbk >= fbk_limit. Values are truncated beyond twice the h/s limit
+    (and the actual h/s)
     """
     Pa_to_mpa = 1e-6
     # first work out actual f_bk (shear capacity)
     fbka, fbk_limita = fbk_vs_grout_matrix_failure(leg_od, leg_t, pile_od, pile_t, sk_spacing_actual, sk_height, grout_E, grout_strength)
     f_bk_actual = fbk_limita*Pa_to_mpa if fbka*Pa_to_mpa > fbk_limita*Pa_to_mpa else fbka*Pa_to_mpa
 
-    # then create a range
+    # then create a range, all spacings at once
     max_sk_spacing2 = max(max_sk_spacing, sk_spacing_actual)
     sk_spacings = np.linspace(max_sk_spacing2, min_sk_spacing, num=5000)
-    h_over_s_vals = []
-    fbks, fbk_limits = [], []
-    gmf_flag = False
-    hs_limit = None
-    for idx, sk_spacing in enumerate(sk_spacings):
-        fbk, fbk_limit = fbk_vs_grout_matrix_failure(leg_od, leg_t, pile_od, pile_t, sk_spacing, sk_height, grout_E, grout_strength)
-        fbks.append(fbk*Pa_to_mpa)
-        fbk_limits.append(fbk_limit*Pa_to_mpa)
-        h_over_s = sk_height / sk_spacing
-        h_over_s_vals.append(sk_height / sk_spacing)
-
-        if fbk * Pa_to_mpa >= fbk_limit * Pa_to_mpa and gmf_flag is False:
-            hs_limit = h_over_s
-            gmf_flag = True
+    fbks, fbk_limits = fbk_vs_grout_matrix_failure(leg_od, leg_t, pile_od, pile_t, sk_spacings, sk_height, grout_E, grout_strength)
+    fbks, fbk_limits = fbks * Pa_to_mpa, fbk_limits * Pa_to_mpa
+    h_over_s_vals = sk_height / sk_spacings
 
-
-        if hs_limit is not None and h_over_s > 2 * hs_limit and h_over_s > sk_height / sk_spacing_actual:
-            break
-
-    return fbks, fbk_limits, h_over_s_vals, f_bk_actual, hs_limit
+    hs_limit = None
+    n_vals = len(sk_spacings)
+    gmf_mask = fbks >= fbk_limits
+    if gmf_mask.any():
+        hs_limit = h_over_s_vals[np.argmax(gmf_mask)]
+        # h/s increases along the spacings, stop after the first value beyond 2 x limit and the actual h/s
+        stop_mask = (h_over_s_vals > 2 * hs_limit) & (h_over_s_vals > sk_height / sk_spacing_actual)
+        if stop_mask.any():
+            n_vals = np.argmax(stop_mask) + 1
+
+    return fbks[:n_vals].tolist(), fbk_limits[:n_vals].tolist(), h_over_s_vals[:n_vals].tolist(), f_bk_actual, hs_limit
 
 
 def axial_and_bending(leg_od, leg_t, pile_od, pile_t, n_sks, sk_spacing, sk_height, fz, grout_E, grout_strength, fx, fy, mxo, myo, gc_length):
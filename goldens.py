@@ -0,0 +1,649 @@
+"""golden value regression checks of the engine formulas, random valid inputs and their outputs kept in .npz files
+
+    python goldens.py record --ref a151a24            # record every family with the scalar code of a commit
+    python goldens.py record -k grout --n 2000        # re-record one family (current code) with more samples
+    python goldens.py check                           # evaluate the recorded inputs again, exit 1 on a deviation
+    python goldens.py check -k scf --rtol 1e-6        # families whose name contains scf, looser tolerance
+    python goldens.py check -k rrfs --impl mymodule:rrfs_outputs   # a candidate implementation of one family
+
+Each family samples n random valid inputs (seeded, so a re-record of an unchanged engine is identical) and evaluates
+every output of its formulas at them: the Efthymiou equations (tubularjointscfs/efthymiou/scf.py), the K, KT, X and
+TY joint pages (KTJointSCFManager and XTYJointSCFManager, nominal SCFs, their variations and the stress adjusted
+ones), the RRF equations (rrfs/requations.py), the cone SCFs (conescfs/scfs.py), the grouted connection checks
+(gcdesign/groutuls/groutuls.py) and the bolted flange ULS check (BoltedFlange through
+bolt_connection_uls_strength_check). The inputs and outputs are saved compressed to <dir>/<family>.npz.
+
+record evaluates the reference of each family, the scalar functions called a sample at a time, so that the goldens
+don't depend on the vectorised engines they check. With --ref the reference runs on the tree of that commit
+(git archive, in a subprocess) instead of the working tree; the goldens in the repo are recorded with
+--ref a151a24, the scalar code before the vectorised engines, and can be recorded again the same way.
+
+check evaluates the current code (or --impl, a function taking the dict of input arrays and returning the dict of
+output arrays) at the recorded inputs and compares every output element-wise: values are equal within
+atol + rtol * |golden|, nan matches nan, text and flags must be equal. The worst absolute and relative deviations of
+each output are reported with the inputs at the worst sample. Record the goldens before a rewrite, check after it.
+
+Families are recorded with N_SAMPLES (2000) samples, enough for the rarer branches: about 1 in 10 grouted connections
+has the pile inside the leg (the 999 results), about 1 in 5 RRF samples has beta > 0.85 (the KMethod and DNV X joint
+extensions, nan T/Y joint axial RRFs) and about half of the flanges fail the geometry check. joint_scfs is recorded
+with 100: each sample is 7 joint page calculations, ~2500 values with the 11 point variation lists (14 MB at 2000
+samples), the equations underneath are checked at 2000 samples by efthymiou_scf and the varied parameter cycles
+through every x axis of the pages (7 or more samples each). No flange fails to converge: the Fu iteration only sets
+Fu_convergence after 1000 steps and bolt_connection_uls_strength_check reads it before the iteration runs, so that
+branch can't be reached from the inputs.
+"""
+import argparse
+import contextlib
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+import warnings
+import zlib
+
+import numpy as np
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "goldens")
+N_SAMPLES = 2000
+SEED = 20240601
+
+# name: (sample function (rng, n) -> dict of input arrays, evaluate function (inputs) -> dict of output arrays,
+# reference function, as evaluate but calling the scalar code a sample at a time, number of samples)
+FAMILIES = {}
+# modules of the working tree a reference (--ref) may import, they don't evaluate anything
+REFERENCE_HELPERS = {"__main__", "__mp_main__", "goldens", "batchrun"}
+
+# scf.py argument names of brace A (T, Y and X joint equations) and of the K joint gap
+SCF_ALIASES = {"d2": "d2_a", "thk2": "thk2_a", "theta": "theta_a", "g": "g_ab"}
+
+
+def family(name, evaluate, reference=None, n=N_SAMPLES):
+    """register the decorated sample function, with evaluate and reference (evaluate where that is scalar already),
+    as the family called name, recorded with n samples by default
+    """
+    def decorator(sample):
+        FAMILIES[name] = (sample, evaluate, reference or evaluate, n)
+        return sample
+    return decorator
+
+
+@contextlib.contextmanager
+def quiet():
+    """suppress engine prints, warnings and numpy floating point warnings
+    """
+    with open(os.devnull, "w") as fnull, contextlib.redirect_stdout(fnull), warnings.catch_warnings(), \
+            np.errstate(all="ignore"):
+        warnings.simplefilter("ignore")
+        yield
+
+
+def rowwise(func, inputs, names, n_outputs=1):
+    """func called for each sample (row) of the inputs in names, for the engines that take one value at a time
+
+    Returns:
+        list of n_outputs float arrays
+    """
+    rows = zip(*(inputs[name].tolist() for name in names))
+    res = np.array([func(*row) for row in rows], dtype=float)
+    return [res] if n_outputs == 1 else list(res.T)
+
+
+def per_sample(evaluate_func):
+    """reference of evaluate_func: called with the inputs of one sample at a time (Python scalars), outputs stacked
+    """
+    def reference(inputs):
+        n = len(next(iter(inputs.values())))
+        rows = [evaluate_func({key: val[i].item() for key, val in inputs.items()}) for i in range(n)]
+        return {name: np.array([row[name] for row in rows]) for name in rows[0]}
+    return reference
+
+
+def public_functions(module):
+    """name: function of the functions defined in module, without the _ prefixed ones
+    """
+    return {name: func for name, func in inspect.getmembers(module, inspect.isfunction)
+            if func.__module__ == module.__name__ and not name.startswith("_")}
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# joint SCFs and RRFs
+# ----------------------------------------------------------------------------------------------------------------------
+def joint_inputs(rng, n):
+    """chords with braces A, B and C within the Efthymiou validity ranges (beta, tau 0.2 to 1, gamma 8 to 32, theta
+    20 to 90 deg, alpha 4 to 40), positive gaps. Angles in radians, argument names of scf.py
+    """
+    d1 = rng.uniform(500., 3000., n)
+    thk1 = d1 / (2 * rng.uniform(8., 32., n))
+    inputs = {"d1": d1, "thk1": thk1, "length": d1 / 2 * rng.uniform(4., 40., n), "c": rng.uniform(0.5, 1., n)}
+    for brace in "abc":
+        inputs[f"d2_{brace}"] = d1 * rng.uniform(0.2, 1., n)
+        inputs[f"thk2_{brace}"] = thk1 * rng.uniform(0.2, 1., n)
+        inputs[f"theta_{brace}"] = np.radians(rng.uniform(20., 90., n))
+    inputs["g_ab"], inputs["g_bc"] = d1 * rng.uniform(0.05, 1., n), d1 * rng.uniform(0.05, 1., n)
+    inputs["scf_chord"] = rng.uniform(1., 10., n)
+    return inputs
+
+
+def efthymiou_outputs(inputs):
+    """every equation of tubularjointscfs/efthymiou/scf.py, with its required arguments and, where it has optional
+    ones (the KT joint brace C of k1 and k2), again with all of them as <name>_all. Tuples are split into <name>_<i>
+    """
+    from tubularjointscfs.efthymiou import scf
+
+    outputs = {}
+    for name, func in public_functions(scf).items():
+        params = inspect.signature(func).parameters
+        required = [p for p in params if params[p].default is inspect.Parameter.empty]
+        calls = {name: required, f"{name}_all": list(params)} if len(required) < len(params) else {name: required}
+        for out_name, args in calls.items():
+            res = func(*(inputs[SCF_ALIASES.get(arg, arg)] for arg in args))
+            if isinstance(res, tuple):
+                outputs.update({f"{out_name}_{i}": val for i, val in enumerate(res)})
+            else:
+                outputs[out_name] = res
+    return outputs
+
+
+# x_axis_desc of the joint pages, the parameter varied 0.8 to 1.2 times
+K_X_AXES = ["D", "T", "dA", "tA", "thetaA", "dB", "tB", "thetaB", "g_ab", "L"]
+KT_X_AXES = K_X_AXES + ["dC", "tC", "thetaC", "g_bc"]
+XTY_X_AXES = ["D", "T", "d", "t", "theta", "L"]
+# joint type: load types of the joint pages
+JOINT_LOAD_TYPES = {"k": ["balanced_axial_unbalanced_moment", "single_brace_load"],
+                    "kt": ["balanced_axial_unbalanced_moment", "single_brace_load"],
+                    "x": ["balanced_forces", "single_brace_load"], "ty": ["single_brace_load"]}
+
+
+def manager_scfs(manager, load_type):
+    """the scf_ attributes (nominal SCFs, variation lists and stress adjusted lists) and params of a joint manager
+    after get_joint_scfs, without those the joint type doesn't set (None or empty)
+    """
+    manager.get_joint_scfs(load_type)
+    return {name: val for name, val in vars(manager).items()
+            if (name.startswith("scf_") or name == "params") and val is not None and np.size(val)}
+
+
+def joint_scf_outputs(inputs):
+    """the K, KT, X and TY joint pages, KTJointSCFManager and XTYJointSCFManager for each load type, a joint at a
+    time. Variation lists are (n, 11) outputs
+    """
+    from tubularjointscfs.scfs_kt_jts import KTJointSCFManager
+    from tubularjointscfs.scfs_xty_jts import XTYJointSCFManager
+
+    rows = []
+    for i in range(len(inputs["d1"])):
+        row = {key: val[i].item() for key, val in inputs.items()}
+        k_fields = {"D": row["d1"], "T": row["thk1"], "dA": row["d2_a"], "tA": row["thk2_a"],
+                    "thetaA": row["theta_a"], "dB": row["d2_b"], "tB": row["thk2_b"], "thetaB": row["theta_b"],
+                    "g_ab": row["g_ab"], "L": row["length"], "C": row["c"]}
+        kt_fields = {**k_fields, "dC": row["d2_c"], "tC": row["thk2_c"], "thetaC": row["theta_c"],
+                     "g_bc": row["g_bc"]}
+        xty_fields = {"D": row["d1"], "T": row["thk1"], "d": row["d2_a"], "t": row["thk2_a"],
+                      "theta": row["theta_a"], "L": row["length"], "C": row["c"]}
+        outputs = {}
+        for joint_type, load_types in JOINT_LOAD_TYPES.items():
+            for load_type in load_types:
+                if joint_type in ("k", "kt"):
+                    fields = k_fields if joint_type == "k" else kt_fields
+                    manager = KTJointSCFManager(row[f"x_axis_{joint_type}"], fields, False, joint_type=joint_type)
+                else:
+                    manager = XTYJointSCFManager(row["x_axis_xty"], xty_fields, False, joint_type=joint_type)
+                outputs.update({f"{joint_type}_{load_type}__{name}": val
+                                for name, val in manager_scfs(manager, load_type).items()})
+        rows.append(outputs)
+    return {name: np.array([row[name] for row in rows], dtype=float) for name in rows[0]}
+
+
+def joint_manager_inputs(rng, n):
+    """joint_inputs with the parameter varied by the K, KT and X/TY joint managers
+    """
+    inputs = joint_inputs(rng, n)
+    # every x axis in turn (shuffled), so that each is checked with few samples
+    inputs.update({f"x_axis_{name}": rng.permutation(np.resize(x_axes, n))
+                   for name, x_axes in [("k", K_X_AXES), ("kt", KT_X_AXES), ("xty", XTY_X_AXES)]})
+    return inputs
+
+
+family("efthymiou_scf", efthymiou_outputs, per_sample(efthymiou_outputs))(joint_inputs)
+# fewer joints, each has 11 values of ~40 variation lists per load type (see the module docstring)
+family("joint_scfs", joint_scf_outputs, n=100)(joint_manager_inputs)
+
+
+def nan_on_error(func, *args, **kwargs):
+    """func(*args, **kwargs), nan where it raises: the scalar RRFs leave the result unassigned out of their beta
+    range, the vectorised ones return nan
+    """
+    try:
+        return func(*args, **kwargs)
+    except (ArithmeticError, UnboundLocalError, ValueError):
+        return np.nan
+
+
+def rrf_outputs(inputs, call=None):
+    """every RRF of rrfs/requations.py, the X joint ones with a method argument for both methods
+
+    Args:
+        call: function (func, *args, **kwargs) calling each RRF, e.g. nan_on_error
+    """
+    from rrfs import requations
+
+    call = call or (lambda func, *args, **kwargs: func(*args, **kwargs))
+    outputs = {}
+    for name, func in public_functions(requations).items():
+        params = inspect.signature(func).parameters
+        args = [inputs[p] for p in params if p != "method"]
+        if "method" in params:
+            outputs.update({f"{name}_{method}": call(func, *args, method=method) for method in ["KMethod", "DNV"]})
+        else:
+            outputs[name] = call(func, *args)
+    return outputs
+
+
+@family("rrfs", rrf_outputs, per_sample(lambda inputs: rrf_outputs(inputs, nan_on_error)))
+def rrf_inputs(rng, n):
+    """beta, gamma, tau in the Efthymiou ranges, theta [deg] 20 to 90, zeta 0.05 to 1
+    """
+    return {"beta": rng.uniform(0.2, 1., n), "gamma": rng.uniform(8., 32., n), "tau": rng.uniform(0.2, 1., n),
+            "theta": rng.uniform(20., 90., n), "zeta": rng.uniform(0.05, 1., n)}
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# cones, grouted connections and bolted flanges
+# ----------------------------------------------------------------------------------------------------------------------
+CONE_SCFS = ["scf_tube_in", "scf_cone_in", "scf_tube_out", "scf_cone_out"]
+
+
+def cone_outputs(inputs):
+    """the DNV-RP-C203 section 3 and appendix F.17 cone SCFs
+    """
+    from conescfs.scfs import calc_cone_scfs_appf17_arr, calc_cone_scfs_sect3_arr, small_junction_mask
+
+    args = [inputs["radius_tubular"], inputs["thickness_tubular"], inputs["thickness_cone"], inputs["alpha"],
+            small_junction_mask(inputs["junction_type"])]
+    outputs = {}
+    for method, func in [("sect3", calc_cone_scfs_sect3_arr), ("appf17", calc_cone_scfs_appf17_arr)]:
+        outputs.update({f"{method}__{name}": row for name, row in zip(CONE_SCFS, func(*args))})
+    return outputs
+
+
+def cone_reference(inputs):
+    """cone_outputs with the scalar calc_cone_scfs_sect3 and calc_cone_scfs_appf17, a cone at a time
+    """
+    from conescfs.scfs import calc_cone_scfs_appf17, calc_cone_scfs_sect3
+
+    names = ["radius_tubular", "thickness_tubular", "thickness_cone", "alpha", "junction_type"]
+    outputs = {}
+    for method, func in [("sect3", calc_cone_scfs_sect3), ("appf17", calc_cone_scfs_appf17)]:
+        outputs.update({f"{method}__{name}": row for name, row in zip(CONE_SCFS, rowwise(func, inputs, names, 4))})
+    return outputs
+
+
+@family("cone_scfs", cone_outputs, cone_reference)
+def cone_inputs(rng, n):
+    return {"radius_tubular": rng.uniform(500., 4000., n), "thickness_tubular": rng.uniform(20., 120., n),
+            "thickness_cone": rng.uniform(20., 120., n), "alpha": rng.uniform(0.5, 15., n),
+            "junction_type": rng.choice(["small", "large"], n)}
+
+
+def grout_outputs(inputs):
+    """the groutuls checks, a connection at a time
+    """
+    from gcdesign.groutuls import groutuls
+
+    geom = ["leg_od", "leg_t", "pile_od", "pile_t"]
+    keys = geom + ["n_sks", "sk_spacing", "sk_height"]
+    outputs = {"axial": rowwise(groutuls.axial, inputs, keys + ["fz", "grout_E", "grout_strength"])[0],
+               "axial_and_bending": rowwise(groutuls.axial_and_bending, inputs,
+                                            keys + ["fz", "grout_E", "grout_strength", "fx", "fy", "mx", "my",
+                                                    "gc_length"])[0],
+               "axial_fea_calibration_load": rowwise(groutuls.axial_fea_calibration_load, inputs,
+                                                     keys + ["grout_E", "grout_strength"])[0]}
+    outputs["pnom_top"], outputs["pnom_btm"], outputs["le"] = rowwise(
+        groutuls.pnom_calc, inputs, geom + ["grout_E", "fx", "fy", "mx", "my", "gc_length"], 3)
+    outputs["fbk"], outputs["fbk_limit"] = rowwise(
+        groutuls.fbk_vs_grout_matrix_failure, inputs, geom + ["sk_spacing", "sk_height", "grout_E", "grout_strength"],
+        2)
+    return outputs
+
+
+@family("grout", grout_outputs)
+def grout_inputs(rng, n):
+    """grouted connections around the page defaults [mm, N, Nmm, MPa], about 1 in 9 with the pile inside the leg (the
+    999 branch)
+    """
+    leg_od, pile_t = rng.uniform(1500., 4000., n), rng.uniform(50., 110., n)
+    return {"leg_od": leg_od, "leg_t": rng.uniform(40., 100., n),
+            "pile_od": leg_od + 2 * (rng.uniform(-50., 400., n) + pile_t), "pile_t": pile_t,
+            "gc_length": rng.uniform(5000., 15000., n), "n_sks": rng.integers(5, 26, n),
+            "sk_spacing": rng.uniform(200., 600., n), "sk_height": rng.uniform(10., 30., n),
+            "fx": rng.uniform(-15e6, 15e6, n), "fy": rng.uniform(-15e6, 15e6, n), "fz": rng.uniform(-60e6, 0., n),
+            "mx": rng.uniform(-1e11, 1e11, n), "my": rng.uniform(-1e11, 1e11, n),
+            "grout_E": rng.uniform(30000., 45000., n), "grout_strength": rng.uniform(60., 120., n)}
+
+
+def flange_outputs(inputs):
+    """the batchrun flange results of bolt_connection_uls_strength_check, a flange at a time. Results a flange
+    doesn't reach (invalid geometry, no convergence) are nan, the governing failure mode is text
+    """
+    from batchrun import FLANGE_FIELDS, FLANGE_RESULTS
+    from boltedconn.boltuls import bolt_connection_uls_strength_check
+
+    values = {res: [] for res in FLANGE_RESULTS}
+    for row in zip(*(inputs[field].tolist() for field in FLANGE_FIELDS)):
+        flange_obj = bolt_connection_uls_strength_check(*row, None, None)
+        for res in FLANGE_RESULTS:
+            values[res].append(getattr(flange_obj, res, None))
+    return {res: np.array(["" if val is None else val for val in vals]) if res == "failure_mode_governing"
+            else np.array([np.nan if val is None else val for val in vals], dtype=float)
+            for res, vals in values.items()}
+
+
+@family("bolted_flange", flange_outputs)
+def flange_inputs(rng, n):
+    """flanges of 4 to 9 m towers in any of the steel and bolt grades and bolt sizes [mm, Nmm, N], the number of bolts
+    and b* left to the check (as the /boltedconn page does)
+    """
+    from boltedconn.boltdata import BoltLibrary, BoltMaterialLibrary
+    from boltedconn.steel import SteelMaterial
+
+    steel_grades = list(SteelMaterial._yield_table)
+    return {"outer_diameter": rng.uniform(4000., 9000., n), "wall_thickness": rng.uniform(40., 110., n),
+            "bolt_steel_grade": rng.choice(list(BoltMaterialLibrary._materials), n),
+            "flange_steel_grade": rng.choice(steel_grades, n), "tower_steel_grade": rng.choice(steel_grades, n),
+            "ULS_bending_moment": rng.uniform(1e10, 8e11, n), "ULS_axial_force": rng.uniform(0., 3e7, n),
+            "flange_height": rng.uniform(80., 400., n), "flange_length": rng.uniform(200., 700., n),
+            "bolt_size": rng.choice(list(BoltLibrary._bolts), n)}
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# golden files
+# ----------------------------------------------------------------------------------------------------------------------
+def golden_path(name, directory=GOLDEN_DIR):
+    return os.path.join(directory, f"{name}.npz")
+
+
+def evaluate(evaluate_func, inputs, n):
+    """outputs of evaluate_func at inputs, each an array of the n samples (first axis)
+    """
+    with quiet():
+        outputs = evaluate_func(inputs)
+    return {name: np.broadcast_to(np.asarray(val), (n,) + np.shape(val)[1:]) for name, val in outputs.items()}
+
+
+def export_tree(rev, directory):
+    """the files of commit rev (git archive) extracted to directory
+
+    Returns:
+        str, the commit hash of rev
+    """
+    import subprocess
+    import tarfile
+
+    repo = os.path.dirname(os.path.abspath(__file__))
+    commit = subprocess.run(["git", "rev-parse", "--short", f"{rev}^{{commit}}"], cwd=repo, capture_output=True,
+                            text=True, check=True).stdout.strip()
+    archive = subprocess.Popen(["git", "archive", "--format=tar", commit], cwd=repo, stdout=subprocess.PIPE)
+    with tarfile.open(fileobj=archive.stdout, mode="r|") as tar:
+        tar.extractall(directory, filter="data")
+    if archive.wait():
+        raise RuntimeError(f"git archive {commit} failed")
+    return commit
+
+
+def evaluate_reference(name, inputs, tree):
+    """outputs of the reference of the family at inputs, evaluated in a subprocess importing the engines of tree
+    (an export_tree directory)
+    """
+    import subprocess
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        in_path, out_path = os.path.join(tmp, "inputs.npz"), os.path.join(tmp, "outputs.npz")
+        np.savez(in_path, **inputs)
+        subprocess.run([sys.executable, os.path.abspath(__file__), "_reference", name, tree, in_path, out_path],
+                       check=True)
+        with np.load(out_path) as data:
+            return {key: data[key] for key in data.files}
+
+
+def _reference_main(name, tree, in_path, out_path):
+    """subprocess of evaluate_reference: the engines are imported from tree, only REFERENCE_HELPERS (constants) may
+    come from the working tree
+    """
+    repo = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, os.path.abspath(tree))
+    with np.load(in_path) as data:
+        inputs = {key: data[key] for key in data.files}
+    outputs = evaluate(FAMILIES[name][2], inputs, len(next(iter(inputs.values()))))
+    outside = sorted(mod_name for mod_name, module in list(sys.modules.items())
+                     if mod_name not in REFERENCE_HELPERS
+                     and os.path.abspath(getattr(module, "__file__", None) or "").startswith(repo + os.sep))
+    if outside:
+        raise RuntimeError(f"{name} reference imported {', '.join(outside)} from the working tree, not {tree}")
+    np.savez(out_path, **outputs)
+    return 0
+
+
+def git_commit():
+    """(short commit hash, True if the working tree has changes), (None, None) outside a git repo
+    """
+    import subprocess
+
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=cwd, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=cwd,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(status.strip())
+
+
+def record_family(name, n=None, seed=SEED, directory=GOLDEN_DIR, ref=None):
+    """sample the inputs of the family, evaluate its reference at them and save both to <directory>/<name>.npz
+
+    Args:
+        n: number of samples, the family default if None
+        ref: (commit, tree), evaluate the reference of the commit exported to tree, the working tree if None
+
+    Returns:
+        the meta data saved with the goldens
+    """
+    sample, _, reference, n_default = FAMILIES[name]
+    n = n or n_default
+    # each family has its own stream so that adding a family doesn't change the inputs of the others
+    rng = np.random.default_rng([seed, zlib.crc32(name.encode())])
+    with quiet():
+        inputs = {key: np.asarray(val) for key, val in sample(rng, n).items()}
+    t0 = time.perf_counter()
+    if ref is None:
+        outputs = evaluate(reference, inputs, n)
+        commit, dirty = git_commit()
+    else:
+        outputs = evaluate_reference(name, inputs, ref[1])
+        commit, dirty = ref[0], False
+    meta = {"family": name, "n": n, "seed": seed, "commit": commit, "dirty": dirty,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "numpy": np.__version__,
+            "evaluate_s": round(time.perf_counter() - t0, 3)}
+    os.makedirs(directory, exist_ok=True)
+    np.savez_compressed(golden_path(name, directory), meta=np.array(json.dumps(meta)),
+                        **{f"in__{key}": val for key, val in inputs.items()},
+                        **{f"out__{key}": val for key, val in outputs.items()})
+    return meta
+
+
+def load_golden(name, directory=GOLDEN_DIR):
+    """(inputs, outputs, meta) recorded for the family
+    """
+    with np.load(golden_path(name, directory)) as data:
+        inputs = {key[4:]: data[key] for key in data.files if key.startswith("in__")}
+        outputs = {key[5:]: data[key] for key in data.files if key.startswith("out__")}
+        meta = json.loads(str(data["meta"]))
+    return inputs, outputs, meta
+
+
+def worst_sample(score):
+    """sample (index of the first axis) of the largest score
+    """
+    return int(np.unravel_index(np.argmax(score), score.shape)[0])
+
+
+def compare_arrays(golden, new, rtol, atol):
+    """element-wise comparison of an output with its golden values
+
+    Returns:
+        dict, the number of failing values, the worst absolute and relative deviations, the sample with the largest
+        deviation relative to the tolerance (worst) and the samples where only one of the two is nan
+    """
+    if golden.shape != new.shape:
+        return {"status": "shape", "message": f"shape {new.shape}, golden {golden.shape}"}
+    if golden.dtype.kind not in "biuf" or new.dtype.kind not in "biuf":
+        bad = golden.astype(str) != new.astype(str)
+        n_bad = int(bad.sum())
+        return {"status": "fail" if n_bad else "ok", "n_bad": n_bad, "max_abs": None, "max_rel": None,
+                "worst": worst_sample(bad) if n_bad else None, "nan_mismatch": 0}
+
+    golden, new = golden.astype(float), new.astype(float)
+    with np.errstate(all="ignore"):
+        same = (golden == new) | (np.isnan(golden) & np.isnan(new))
+        nan_mismatch = np.isnan(golden) != np.isnan(new)
+        dev = np.where(same, 0., np.abs(new - golden))
+        # relative to non zero golden values only
+        rel = np.where(same, 0., np.where(golden == 0., np.nan, dev / np.abs(golden)))
+        score = np.where(same, 0., dev / (atol + rtol * np.abs(golden)))
+    # one sided nans and infs are failures whatever the tolerance
+    score = np.where(np.isnan(score) | nan_mismatch, np.inf, score)
+    rel[nan_mismatch] = np.nan
+    n_bad = int((score > 1.).sum())
+    return {"status": "fail" if n_bad else "ok", "n_bad": n_bad,
+            "max_abs": float(dev[~nan_mismatch].max()) if (~nan_mismatch).any() else None,
+            "max_rel": float(np.nanmax(rel)) if (~np.isnan(rel)).any() else None,
+            "worst": worst_sample(score) if score.max() > 0 else None, "nan_mismatch": int(nan_mismatch.sum())}
+
+
+def check_family(name, evaluate_func=None, rtol=1e-9, atol=1e-12, directory=GOLDEN_DIR):
+    """evaluate the family (or evaluate_func, a candidate implementation) at its recorded inputs and compare the
+    outputs with the goldens
+
+    Returns:
+        dict, meta data of the goldens, the inputs and, per output, the compare_arrays result ("missing" where the
+        output isn't evaluated any more, "new" where it has no goldens)
+    """
+    inputs, goldens, meta = load_golden(name, directory)
+    outputs = evaluate(evaluate_func or FAMILIES[name][1], inputs, meta["n"])
+    results = {}
+    for out_name in list(goldens) + [key for key in outputs if key not in goldens]:
+        if out_name not in outputs:
+            results[out_name] = {"status": "missing"}
+        elif out_name not in goldens:
+            results[out_name] = {"status": "new"}
+        else:
+            results[out_name] = compare_arrays(goldens[out_name], outputs[out_name], rtol, atol)
+    return {"meta": meta, "inputs": inputs, "results": results}
+
+
+def family_passed(check):
+    """True where every golden output is within tolerance (new outputs are allowed)
+    """
+    return all(res["status"] in ("ok", "new") for res in check["results"].values())
+
+
+def format_check(name, check, verbose=False):
+    meta, results = check["meta"], check["results"]
+    statuses = [res["status"] for res in results.values()]
+    rels = [(res["max_rel"], out_name) for out_name, res in results.items() if res.get("max_rel") is not None]
+    worst_rel, worst_out = max(rels) if rels else (0., None)
+    lines = [f"{name}: {'ok' if family_passed(check) else 'FAIL'}, {len(results)} outputs x {meta['n']} samples "
+             f"(goldens of commit {meta['commit']}{' (modified)' if meta['dirty'] else ''}), "
+             f"{statuses.count('fail') + statuses.count('shape')} failing, {statuses.count('missing')} missing, "
+             f"{statuses.count('new')} new, worst relative deviation {worst_rel:.3g}"
+             + (f" ({worst_out})" if worst_rel else "")]
+    for out_name, res in results.items():
+        if res["status"] == "ok" and not verbose:
+            continue
+        if res["status"] in ("missing", "new"):
+            lines.append(f"  {out_name:50s} {res['status']}")
+            continue
+        if res["status"] == "shape":
+            lines.append(f"  {out_name:50s} {res['message']}")
+            continue
+        max_abs = "-" if res["max_abs"] is None else f"{res['max_abs']:.3g}"
+        max_rel = "-" if res["max_rel"] is None else f"{res['max_rel']:.3g}"
+        lines.append(f"  {out_name:50s} {res['status']:4s} {res['n_bad']:6d} bad, max abs {max_abs}, "
+                     f"max rel {max_rel}, {res['nan_mismatch']} nan mismatches")
+        if res["status"] == "fail" and res["worst"] is not None:
+            idx = res["worst"]
+            at = ", ".join(f"{key}={val[idx]!r}" if val.dtype.kind not in "f" else f"{key}={val[idx]:.6g}"
+                           for key, val in check["inputs"].items())
+            lines.append(f"    worst sample {idx}: {at}")
+    return "\n".join(lines)
+
+
+def select_families(patterns=None):
+    if not patterns:
+        return list(FAMILIES)
+    return [name for name in FAMILIES if any(pattern in name for pattern in patterns)]
+
+
+def load_impl(spec):
+    """the function of "module:function"
+    """
+    module_name, _, func_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="golden value regression checks of the engine formulas")
+    parser.add_argument("command", choices=["record", "check", "list"])
+    parser.add_argument("-k", dest="patterns", action="append", help="families whose name contains this (repeatable)")
+    parser.add_argument("--dir", default=GOLDEN_DIR, help="directory of the .npz golden files")
+    parser.add_argument("--n", type=int, help="samples per family (record), default of each family")
+    parser.add_argument("--seed", type=int, default=SEED, help="seed of the inputs (record)")
+    parser.add_argument("--rtol", type=float, default=1e-9, help="relative tolerance (check)")
+    parser.add_argument("--atol", type=float, default=1e-12, help="absolute tolerance (check)")
+    parser.add_argument("--ref", help="commit whose scalar code records the goldens, e.g. a151a24 (record)")
+    parser.add_argument("--impl", help="module:function evaluating the inputs of the one selected family (check)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="report every output, not only failures")
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["_reference"]:
+        return _reference_main(*argv[1:])
+    args = parser.parse_args(argv)
+
+    names = select_families(args.patterns)
+    if not names:
+        parser.error(f"no family matches {args.patterns}, families: {', '.join(FAMILIES)}")
+    if args.command == "list":
+        print("\n".join(names))
+        return 0
+    if args.command == "record":
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tree:
+            ref = None if args.ref is None else (export_tree(args.ref, tree), tree)
+            for name in names:
+                meta = record_family(name, args.n, args.seed, args.dir, ref)
+                print(f"{name}: {meta['n']} samples of commit {meta['commit']} recorded to "
+                      f"{golden_path(name, args.dir)} ({meta['evaluate_s']} s)")
+        return 0
+
+    if args.impl and len(names) != 1:
+        parser.error(f"--impl needs one family, -k matches {', '.join(names)}")
+    impl = load_impl(args.impl) if args.impl else None
+    passed = True
+    for name in names:
+        if not os.path.exists(golden_path(name, args.dir)):
+            print(f"{name}: no goldens in {args.dir}, run record first")
+            passed = False
+            continue
+        check = check_family(name, impl, args.rtol, args.atol, args.dir)
+        print(format_check(name, check, args.verbose))
+        passed &= family_passed(check)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
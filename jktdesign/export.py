@@ -0,0 +1,236 @@
+"""exporters of the 3D jacket model (JacketSpaceFrame) for FE and CAD tools
+
+Beam model: node and member tables as CSV or JSON, and a SACS-like fixed column beam deck (JOINT, PGRUP and MEMBER
+cards). Tessellated geometry: binary glTF (GLB) of the tubular members, joint Cans and stubs.
+
+Every exporter is a generator of str (text formats) or bytes (GLB) chunks, written chunk_size rows (or members) at a
+time, so that large models are never held as one string. Use write_export to write them to a file, or stream them
+as a response (see jktsections.jacket_export).
+"""
+import json
+import struct
+
+import numpy as np
+# local imports
+from jktdesign.spaceframe import JacketSpaceFrame
+
+CHUNK_ROWS = 2000
+NODE_COLUMNS = ["x", "y", "z", "kind", "name", "leg", "face"]
+MEMBER_COLUMNS = ["node_1", "node_2", "member_type", "section", "leg", "face", "bay", "length", "D", "D_2", "t"]
+# member, joint Can and stub colours of the GLBs (rgba), in the order of the GLB primitives
+GLB_COLOURS = {"LEG": [0.12, 0.55, 1., 1.], "BRC": [0.2, 0.8, 0.2, 1.], "CAN": [1., 0.6, 0.1, 1.],
+               "STUB": [0.85, 0.3, 0.2, 1.]}
+
+
+def _row_chunks(df, chunk_size):
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def iter_nodes_csv(sf: JacketSpaceFrame, chunk_size=CHUNK_ROWS):
+    """node table CSV (node id, x, y, z [mm], kind, name, leg, face)
+    """
+    for idx, chunk in enumerate(_row_chunks(sf.nodes[NODE_COLUMNS], chunk_size)):
+        yield chunk.to_csv(header=idx == 0, lineterminator="\n")
+
+
+def iter_members_csv(sf: JacketSpaceFrame, chunk_size=CHUNK_ROWS):
+    """member (element) table CSV, member id, end node ids, type, section and sizes [mm]
+    """
+    for idx, chunk in enumerate(_row_chunks(sf.members[MEMBER_COLUMNS], chunk_size)):
+        yield chunk.to_csv(header=idx == 0, lineterminator="\n")
+
+
+def iter_model_json(sf: JacketSpaceFrame, chunk_size=CHUNK_ROWS):
+    """node and member tables as one JSON object {"units", "n_legs", "nodes": [...], "members": [...]}, each row an
+    object with its id, non-finite values as null
+    """
+    yield json.dumps({"units": "mm", "n_legs": sf.n_legs})[:-1]
+    for key, df in (("nodes", sf.nodes[NODE_COLUMNS]), ("members", sf.members[MEMBER_COLUMNS])):
+        yield f', "{key}": ['
+        for idx, chunk in enumerate(_row_chunks(df.reset_index(), chunk_size)):
+            yield ("" if idx == 0 else ", ") + chunk.to_json(orient="records")[1:-1]
+        yield "]"
+    yield "}\n"
+
+
+def section_groups(sf: JacketSpaceFrame):
+    """3 character group name of each section, L01, L02 .. for leg sections and B01 .. for brace sections
+    """
+    groups = {}
+    for member_type, sections in sf.members.groupby("member_type", sort=False)["section"]:
+        for idx, section in enumerate(sections.unique()):
+            groups[section] = f"{member_type[0]}{idx + 1:02d}"
+    return groups
+
+
+def iter_beam_deck(sf: JacketSpaceFrame, chunk_size=CHUNK_ROWS):
+    """SACS-like beam deck: JOINT cards (coordinates in m), PGRUP cards (OD and wall thickness in cm) and MEMBER cards.
+    Joints are numbered from 1 (4 characters), groups as section_groups. Sections without sizes are written with
+    blank OD and thickness
+    """
+    groups = section_groups(sf)
+    yield f"* jacket beam model, {sf.n_legs} legs, {len(sf.nodes)} joints, {len(sf.members)} members\n"
+    yield "* JOINT: joint, x, y, z [m]. PGRUP: group, OD, WT [cm]. MEMBER: joint A, joint B, group\n"
+
+    yield "JOINT\n"
+    for chunk in _row_chunks(sf.nodes, chunk_size):
+        xyz = chunk[["x", "y", "z"]].to_numpy() / 1000.
+        yield "".join(f"JOINT {node + 1:4d} {x:9.3f}{y:9.3f}{z:9.3f}\n"
+                      for node, (x, y, z) in zip(chunk.index, xyz))
+
+    yield "PGRUP\n"
+    sizes = sf.members.groupby("section", sort=False)[["D", "t"]].first()
+    for section, group in groups.items():
+        D, t = sizes.loc[section]
+        od_wt = "" if np.isnan(D) or np.isnan(t) else f"{D / 10:6.2f}{t / 10:6.3f}"
+        yield f"PGRUP {group} {od_wt:<12s} * {section}\n"
+
+    yield "MEMBER\n"
+    for chunk in _row_chunks(sf.members, chunk_size):
+        yield "".join(f"MEMBER {a + 1:4d}{b + 1:4d} {groups[section]}\n"
+                      for a, b, section in zip(chunk["node_1"], chunk["node_2"], chunk["section"]))
+    yield "END\n"
+
+
+def tube_vertices(p1, p2, r1, r2, n_sides):
+    """vertex positions and normals of open tubes (cones if r1 != r2) between points p1 and p2
+
+    Args:
+        p1, p2: arrays (n, 3) of the tube end points
+        r1, r2: arrays (n,) of the tube end radii
+
+    Returns:
+        (positions, normals), arrays (n, 2 * n_sides, 3), ring at p1 then ring at p2
+    """
+    axis = p2 - p1
+    axis /= np.linalg.norm(axis, axis=1)[:, None]
+    # perpendicular of the axis, from the vertical unless the member is vertical
+    ref = np.where(np.abs(axis[:, 2:3]) > 0.9, [[1., 0., 0.]], [[0., 0., 1.]])
+    u = np.cross(axis, ref)
+    u /= np.linalg.norm(u, axis=1)[:, None]
+    v = np.cross(axis, u)
+    angles = 2 * np.pi * np.arange(n_sides) / n_sides
+    ring = np.cos(angles)[None, :, None] * u[:, None, :] + np.sin(angles)[None, :, None] * v[:, None, :]
+    positions = np.concatenate([p1[:, None, :] + r1[:, None, None] * ring,
+                                p2[:, None, :] + r2[:, None, None] * ring], axis=1)
+    return positions, np.concatenate([ring, ring], axis=1)
+
+
+def tube_indices(first_member, n_members, n_sides):
+    """triangle vertex indices (uint32) of n_members tubes from first_member, 2 triangles per side
+    """
+    k = np.arange(n_sides)
+    k_next = (k + 1) % n_sides
+    # ring 1 vertices k, ring 2 vertices n_sides + k
+    quads = np.stack([k, k_next, n_sides + k_next, k, n_sides + k_next, n_sides + k], axis=1).ravel()
+    base = (first_member + np.arange(n_members)) * 2 * n_sides
+    return (base[:, None] + quads[None, :]).astype(np.uint32)
+
+
+def _glb_segment_chunks(sf, segments, n_sides, default_diameter, chunk_size):
+    """interleaved positions and normals (float32, as written to the GLB) of chunk_size segments at a time
+    """
+    # gltf is y up and in m, the model is z up (elevation) in mm
+    xyz = sf.nodes[["x", "y", "z"]].to_numpy() / 1000.
+    xyz = np.stack([xyz[:, 0], xyz[:, 2], -xyz[:, 1]], axis=1)
+    members = sf.members
+    for start in range(0, len(segments), chunk_size):
+        chunk = segments.iloc[start:start + chunk_size]
+        member = chunk["member"].to_numpy()
+        n1, n2 = xyz[members["node_1"].to_numpy()[member]], xyz[members["node_2"].to_numpy()[member]]
+        t_1, t_2 = chunk["t_1"].to_numpy()[:, None], chunk["t_2"].to_numpy()[:, None]
+        D_1 = chunk["D_1"].fillna(default_diameter).to_numpy()
+        D_2 = chunk["D_2"].fillna(chunk["D_1"]).fillna(default_diameter).to_numpy()
+        positions, normals = tube_vertices(n1 + t_1 * (n2 - n1), n1 + t_2 * (n2 - n1), D_1 / 2000., D_2 / 2000.,
+                                           n_sides)
+        yield np.concatenate([positions, normals], axis=2).astype("<f4")
+
+
+def glb_material(member_type):
+    """glTF material of a member type (open tubes, so double sided)
+    """
+    return {"name": member_type, "doubleSided": True,
+            "pbrMetallicRoughness": {"baseColorFactor": GLB_COLOURS.get(member_type, [0.5] * 3 + [1.]),
+                                     "metallicFactor": 0.2, "roughnessFactor": 0.7}}
+
+
+def glb_header(gltf, bin_length):
+    """GLB file header, JSON chunk and BIN chunk header, to be followed by bin_length bytes of buffer data (float32 and
+    uint32 data, always 4 byte aligned)
+    """
+    json_chunk = json.dumps(gltf, separators=(",", ":")).encode()
+    json_chunk += b" " * (-len(json_chunk) % 4)
+    return (struct.pack("<4sII", b"glTF", 2, 12 + 8 + len(json_chunk) + 8 + bin_length) +
+            struct.pack("<I4s", len(json_chunk), b"JSON") + json_chunk +
+            struct.pack("<I4s", bin_length, b"BIN\x00"))
+
+
+def iter_glb(sf: JacketSpaceFrame, n_sides=16, default_diameter=1000., chunk_size=CHUNK_ROWS):
+    """binary glTF of the tubular segments of the members (see JacketSpaceFrame.segments: member sections, joint
+    Cans and stubs) as open tubes with n_sides, one primitive per kind (GLB_COLOURS) sharing one interleaved position
+    and normal buffer. Sections without a diameter use default_diameter [mm]
+
+    The GLB header needs the total length and the position bounds, so the tube vertices are generated twice (one
+    pass for the bounds, one to write), chunk_size segments at a time. The bounds are of the float32 positions written
+    """
+    segments = sf.segments()
+    order = {kind: idx for idx, kind in enumerate(GLB_COLOURS)}
+    segments = segments.sort_values("kind", key=lambda kind: kind.map(order), kind="stable")
+    n_segments, n_verts = len(segments), len(segments) * 2 * n_sides
+    counts = segments["kind"].value_counts(sort=False)
+
+    pos_min, pos_max = np.full(3, np.inf, dtype=np.float32), np.full(3, -np.inf, dtype=np.float32)
+    for vertices in _glb_segment_chunks(sf, segments, n_sides, default_diameter, chunk_size):
+        pos_min = np.minimum(pos_min, vertices[:, :, :3].reshape(-1, 3).min(axis=0))
+        pos_max = np.maximum(pos_max, vertices[:, :, :3].reshape(-1, 3).max(axis=0))
+
+    vertex_bytes, index_bytes = n_verts * 24, n_segments * 6 * n_sides * 4
+    # float32 to float, exactly representable as json numbers
+    accessors = [{"bufferView": 0, "byteOffset": 0, "componentType": 5126, "count": n_verts, "type": "VEC3",
+                  "min": [float(val) for val in pos_min], "max": [float(val) for val in pos_max]},
+                 {"bufferView": 0, "byteOffset": 12, "componentType": 5126, "count": n_verts, "type": "VEC3"}]
+    primitives, materials, index_offset = [], [], 0
+    for kind in segments["kind"].unique():
+        n_indices = int(counts[kind]) * 6 * n_sides
+        accessors.append({"bufferView": 1, "byteOffset": index_offset, "componentType": 5125, "count": n_indices,
+                          "type": "SCALAR"})
+        primitives.append({"attributes": {"POSITION": 0, "NORMAL": 1}, "indices": len(accessors) - 1,
+                           "material": len(materials)})
+        materials.append(glb_material(kind))
+        index_offset += n_indices * 4
+    gltf = {"asset": {"version": "2.0", "generator": "oswdesigntools jktdesign.export"},
+            "scene": 0, "scenes": [{"nodes": [0]}], "nodes": [{"mesh": 0, "name": "jacket"}],
+            "meshes": [{"name": "jacket", "primitives": primitives}], "materials": materials,
+            "buffers": [{"byteLength": vertex_bytes + index_bytes}],
+            "bufferViews": [{"buffer": 0, "byteOffset": 0, "byteLength": vertex_bytes, "byteStride": 24,
+                             "target": 34962},
+                            {"buffer": 0, "byteOffset": vertex_bytes, "byteLength": index_bytes, "target": 34963}],
+            "accessors": accessors}
+
+    yield glb_header(gltf, vertex_bytes + index_bytes)
+
+    for vertices in _glb_segment_chunks(sf, segments, n_sides, default_diameter, chunk_size):
+        yield vertices.tobytes()
+    for start in range(0, n_segments, chunk_size):
+        yield tube_indices(start, min(chunk_size, n_segments - start), n_sides).astype("<u4", copy=False).tobytes()
+
+
+# format: (exporter, mimetype, file name)
+EXPORT_FORMATS = {
+    "nodes_csv": (iter_nodes_csv, "text/csv", "jacket_nodes.csv"),
+    "members_csv": (iter_members_csv, "text/csv", "jacket_members.csv"),
+    "json": (iter_model_json, "application/json", "jacket_model.json"),
+    "deck": (iter_beam_deck, "text/plain", "jacket_model.inp"),
+    "glb": (iter_glb, "model/gltf-binary", "jacket_model.glb"),
+}
+
+
+def write_export(sf: JacketSpaceFrame, fmt, path, **kwargs):
+    """write the export format (see EXPORT_FORMATS) of the space frame model to path, chunk by chunk
+    """
+    exporter = EXPORT_FORMATS[fmt][0]
+    chunks = exporter(sf, **kwargs)
+    with open(path, "wb" if fmt == "glb" else "w", newline=None if fmt == "glb" else "") as f:
+        for chunk in chunks:
+            f.write(chunk)
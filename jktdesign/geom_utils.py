@@ -235,6 +235,18 @@ def check_is_horizontal_rectangle(arr, tol=1e-6):
     return len(unique) == 2
 
 
+def mirror_pt_x(pt):
+    """mirror a point [x, y] about the x=0 (y-axis) line, None stays None
+    """
+    return None if pt is None else [-pt[0], pt[1]]
+
+
+def mirror_coords_x(coords):
+    """mirror polygon coords [[x, ..], [y, ...]] about the x=0 (y-axis) line. The y list is shared with coords
+    """
+    return None if coords is None else [[-x for x in coords[0]], coords[1]]
+
+
 if __name__ == "__main__":
 
     # Define points and width
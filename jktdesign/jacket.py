@@ -1,8 +1,7 @@
 import numpy as np
-import copy
 from jktdesign.geom_utils import line_intersection, calculate_angle_3pts, extend_middle_points_to_target_y
-from jktdesign.joint import Joint2D
-from jktdesign.leg import Leg
+from jktdesign.joint import Joint2D, MirroredJoint2D
+from jktdesign.leg import Leg, MirroredLeg
 
 
 class Jacket:
@@ -63,6 +62,9 @@ class Jacket:
         self.brace_a_objs = []  # list to store Leg objects (for brace a sections)
         self.brace_b_objs = []  # list to store Leg objects (for brace b sections)
         self.brace_hz_objs = []  # list to store Leg objects (for braze horizontals)
+        # Joint2D objects indexed by (jt_type, jt number, mirror) e.g. ("kjt", 2, True), see _register_joint
+        self.joint_index = {}
+        self.stub_end_arrs = {}  # same keys, (stub names, array of stub end pts (n_stubs, 2))
         self.cone_taper = None
         self.section_alignment = None
         self.warnings = {}  # todo
@@ -294,12 +296,11 @@ class Jacket:
             kjt_wps = self.kjt_wps[jt_name]  # get kjt wp
             # create the joint and transform it
             jnt_obj.create_joint()
-            # create a copy of the joint and mirror it to get k joint on both legs in 2D
-            jnt_obj_mirr = copy.deepcopy(jnt_obj)
-            jnt_obj_mirr.jt_name = jt_name + "_mirr"
             jnt_obj.transform_joint(batter_angle=kjt_batter_angle, translate_by=kjt_wps, mirror=False)
-            jnt_obj_mirr.transform_joint(batter_angle=kjt_batter_angle, translate_by=kjt_wps, mirror=True)
+            # mirrored view of the joint to get k joint on both legs in 2D (follows any later edits of the joint)
+            jnt_obj_mirr = MirroredJoint2D(jnt_obj, jt_name + "_mirr")
             self.joint_objs.append(jnt_obj_mirr)
+            self._register_joint(jnt_obj_mirr)
 
         elif jt_type == "xjt":
             xjt_angle = self.xjt_angles[jt_name]
@@ -311,6 +312,30 @@ class Jacket:
             jnt_obj.transform_joint(batter_angle=xjt_angle, translate_by=xjt_wp, mirror=False)
 
         self.joint_objs.append(jnt_obj)
+        self._register_joint(jnt_obj)
+
+    def _register_joint(self, jnt_obj: Joint2D):
+        """index a transformed joint by (jt_type, jt number, mirror) and store its stub end pts as an array, so that
+        the sections (legs and braces) find their joints without scanning self.joint_objs.
+        Stub ends are final once transformed (Can edits only move the Can end pts)
+        """
+        key = (jnt_obj.jt_type, int(jnt_obj.jt_name.split("_")[1]), bool(jnt_obj.mirror))
+        self.joint_index[key] = jnt_obj
+        stub_names = list(jnt_obj.stub_end_pts)
+        self.stub_end_arrs[key] = stub_names, np.array([jnt_obj.stub_end_pts[k] for k in stub_names], dtype=float)
+
+    def get_joint(self, jt_type, jt_no, mirror=False):
+        """Joint2D object e.g. get_joint("kjt", 2, mirror=True), None if not added
+        """
+        return self.joint_index.get((jt_type, jt_no, mirror))
+
+    def _stub_end_pt(self, jt_type, jt_no, mirror=False, lowest=True):
+        """lowest (or highest) elevation stub end pt of a joint, first stub if stub ends are at the same elevation
+        """
+        key = (jt_type, jt_no, mirror)
+        stub_names, stub_end_arr = self.stub_end_arrs[key]
+        idx = np.argmin(stub_end_arr[:, 1]) if lowest else np.argmax(stub_end_arr[:, 1])
+        return self.joint_index[key].stub_end_pts[stub_names[idx]]
 
     def kjt_warnings_check(self):
         """public method to check for errors and warnings for the K joint design e.g. interaction with batter elevations
@@ -330,22 +355,14 @@ class Jacket:
         """
         leg_name = leg_obj.leg_name  # get the name
         leg_no = int(leg_name.split("_")[1])
-        pt2_found = False
-        for jnt_obj in self.joint_objs:
-            if jnt_obj.jt_type != "kjt":  # only require kjts to create a leg
-                continue
-
-            jt_name = jnt_obj.jt_name
-            jt_no = int(jt_name.split("_")[1])
-
-            if jt_no == leg_no:
-                pt1 = jnt_obj.can_pt_btm
-            elif jt_no == leg_no + 1:
-                pt2 = jnt_obj.can_pt_top
-                pt2_found = True  # found pt2, so leg is definitely between 2 k joints :)
-
-        # for the leg bottom section (between bottom k and top of pile), the pt2 resides at top of pile
-        if pt2_found is False:
+        # only require kjts to create a leg, the kjt above and the kjt below
+        kjt_above, kjt_below = self.joint_index[("kjt", leg_no, False)], self.get_joint("kjt", leg_no + 1)
+        jt_name = kjt_above.jt_name
+        pt1 = kjt_above.can_pt_btm
+        pt2_found = kjt_below is not None  # found pt2, so leg is definitely between 2 k joints :)
+        if pt2_found:
+            pt2 = kjt_below.can_pt_top
+        else:  # for the leg bottom section (between bottom k and top of pile), the pt2 resides at top of pile
             pt2 = [-self.jacket_footprint / 2, self.pile_top_elev]
 
         # legs pt1 and pt2 are ALWAYS constructed from top to bottom i.e. k1 -> k2, then k2 -> k3 (descending elevation)
@@ -369,10 +386,9 @@ class Jacket:
         # create the leg polygons, call all public methods
         leg_obj.construct_leg(split_len1=leg_cone_split_len, cone_taper=self.cone_taper)
 
-        # create copy of leg object and mirror it
-        leg_obj_mirr = copy.deepcopy(leg_obj)
-        leg_obj_mirr.mirror_leg()
-        leg_obj_mirr.leg_name = leg_name + "_mirr"  # todo do not need to name it mirror as now have mirror bool in obj
+        # mirrored view of the leg object, named apart from the source as leg sections are looked up by name (e.g.
+        # tessellate, spaceframe), the mirror flag marks it for the mass take off and the plot legend
+        leg_obj_mirr = MirroredLeg(leg_obj, leg_name + "_mirr")
 
         self.leg_objs.append(leg_obj)
         self.leg_objs.append(leg_obj_mirr)
@@ -384,44 +400,17 @@ class Jacket:
         brace_name = brace_obj.leg_name  # get the name
         brace_no = int(brace_name.split("_")[1])
         bay_side = brace_obj.bay_side
-        for jnt_obj in self.joint_objs:
-            jt_name = jnt_obj.jt_name
-            kjt_mirror_flag = True if "mirr" in jt_name else False  # check if mirror
-            jt_no = int(jt_name.split("_")[1])
-            jt_type = jt_name.split("_")[0]
-            # find k joint that attaches to bay brace e.g. bay 1 'brace a' attaches to k1
-            if jt_type == "kjt" and jt_no == brace_no:
-                # Initialize variables to track the lowest elevation stub
-                min_y, lowest_stub = None, None
-
-                # Loop through all stub end points to find the one with the lowest elevation (smallest y)
-                for pt in jnt_obj.stub_end_pts.values():
-                    x, y = pt[0], pt[1]
-                    if min_y is None or y < min_y:
-                        min_y = y
-                        lowest_stub = pt
-
-                # Assign to appropriate variable based on bay side and mirror flag
-                if bay_side == "L" and not kjt_mirror_flag:
-                    k_stub_pt = lowest_stub
-                elif bay_side == "R" and kjt_mirror_flag:
-                    k_stub_pt_mirr = lowest_stub
-
-            # find x joint that attaches to bay brace e.g. bay 1 'brace a' attaches to x1
-            if jt_type == "xjt" and jt_no == brace_no:
-                # get the x brace stub with the highest elevation in the same bay (which will attach to original k joint stub)
-                max_y, min_y = None, None
-                for k, v in jnt_obj.stub_end_pts.items():
-                    x, y = v[0], v[1]
-                    if max_y is None or y > max_y:
-                        max_y = y
-                        x_stub_pt = v
-
-                x_can_pt_top = jnt_obj.can_pt_top
+        # k joint that attaches to bay brace e.g. bay 1 'brace a' attaches to k1 (lowest stub), the mirrored k joint
+        # for the right side of the bay
+        k_stub_pt = self._stub_end_pt("kjt", brace_no, mirror=bay_side != "L", lowest=True)
 
         # define brace start and end pts - use descending order approach
-        if bay_side == "L": brace_obj.define_leg_pts(k_stub_pt, x_stub_pt)
-        else: brace_obj.define_leg_pts(k_stub_pt_mirr, x_can_pt_top)
+        # x joint that attaches to bay brace e.g. bay 1 'brace a' attaches to x1
+        if bay_side == "L":
+            # the x brace stub with the highest elevation in the same bay (which will attach to original k joint stub)
+            brace_obj.define_leg_pts(k_stub_pt, self._stub_end_pt("xjt", brace_no, lowest=False))
+        else:
+            brace_obj.define_leg_pts(k_stub_pt, self.joint_index[("xjt", brace_no, False)].can_pt_top)
         brace_obj.set_tubular_section_alignment(self.section_alignment)
 
         brace_obj.construct_leg(split_len1=brace_cone_split_len, cone_taper=self.cone_taper)  # construct obj using public method
@@ -435,39 +424,17 @@ class Jacket:
         brace_name = brace_obj.leg_name  # get the name
         bay_side = brace_obj.bay_side
         brace_no = int(brace_name.split("_")[1])
-        for jnt_obj in self.joint_objs:
-            jt_name = jnt_obj.jt_name
-            kjt_mirror_flag = True if "mirr" in jt_name else False
-            jt_no = int(jt_name.split("_")[1])
-            jt_type = jt_name.split("_")[0]
-            # find x joint that attaches to bay brace e.g. bay 1 'brace b' attaches to x1
-            if jt_type == "xjt" and jt_no == brace_no:
-                # get the x brace bottom most Can point (i.e. bottom of Can)
-                x_can_pt = jnt_obj.can_pt_btm
-                # get the x brace stub with lowest point
-                min_y = None
-                for k, v in jnt_obj.stub_end_pts.items():
-                    x, y = v[0], v[1]
-                    if min_y is None or y < min_y:
-                        min_y = y
-                        x_stub_pt = v
-
-            # Find k joint that attaches to bay brace (e.g. bay 1 'brace b' attaches to k2)
-            if jt_type == "kjt" and jt_no == brace_no + 1:
-                # Get the K brace stub with the highest elevation
-                max_y, max_stub = None, None
-                for _, (x, y) in jnt_obj.stub_end_pts.items():
-                    if max_y is None or y > max_y:
-                        max_y = y
-                        max_stub = (x, y)
-
-                if kjt_mirror_flag:
-                    k_stub_pt_mirr = max_stub
-                else:
-                    k_stub_pt = max_stub
-
-        if bay_side == "L": brace_obj.define_leg_pts(x_can_pt, k_stub_pt)
-        else: brace_obj.define_leg_pts(x_stub_pt, k_stub_pt_mirr)
+        # k joint that attaches to bay brace (e.g. bay 1 'brace b' attaches to k2), the K brace stub with the highest
+        # elevation, the mirrored k joint for the right side of the bay
+        k_stub_pt = tuple(self._stub_end_pt("kjt", brace_no + 1, mirror=bay_side != "L", lowest=False))
+
+        # x joint that attaches to bay brace e.g. bay 1 'brace b' attaches to x1
+        if bay_side == "L":
+            # the x brace bottom most Can point (i.e. bottom of Can)
+            brace_obj.define_leg_pts(self.joint_index[("xjt", brace_no, False)].can_pt_btm, k_stub_pt)
+        else:
+            # the x brace stub with lowest point
+            brace_obj.define_leg_pts(self._stub_end_pt("xjt", brace_no, lowest=True), k_stub_pt)
         brace_obj.set_tubular_section_alignment(self.section_alignment)
         brace_obj.construct_leg(split_len1=brace_cone_split_len, cone_taper=self.cone_taper)  # construct obj using public method
         self.brace_b_objs.append(brace_obj)
@@ -477,15 +444,8 @@ class Jacket:
         """
         brace_name = brace_obj.leg_name  # get the name
         bay_no = int(brace_name.split("_")[1])
-        for jnt_obj in self.joint_objs:
-            jt_name = jnt_obj.jt_name
-            kjt_mirror_flag = True if "mirr" in jt_name else False
-            jt_no = int(jt_name.split("_")[1])
-            jt_type = jt_name.split("_")[0]
-            if jt_no == bay_no + 1 and jt_type == "kjt" and not kjt_mirror_flag:
-                k_stub_pt_L = jnt_obj.stub_end_pts["brc2"]
-            if jt_no == bay_no + 1 and jt_type == "kjt" and kjt_mirror_flag:
-                k_stub_pt_R = jnt_obj.stub_end_pts["brc2"]
+        k_stub_pt_L = self.joint_index[("kjt", bay_no + 1, False)].stub_end_pts["brc2"]
+        k_stub_pt_R = self.joint_index[("kjt", bay_no + 1, True)].stub_end_pts["brc2"]
 
         brace_obj.define_leg_pts(k_stub_pt_L, k_stub_pt_R)
         brace_obj.set_tubular_section_alignment(self.section_alignment)
@@ -498,18 +458,15 @@ class Jacket:
         if not extend_k1:
             return None
 
-        for jnt_obj in self.joint_objs:
-            jt_name = jnt_obj.jt_name
-            jt_type = jt_name.split("_")[0]
-            jt_no = int(jt_name.split("_")[1])
-            if jt_type == "kjt" and jt_no == 1:
-                for idx, (k, v) in enumerate(jnt_obj.joint_poly_coords_transf.items()):
-                    if "can" in k:
-                        xnew, ynew, can_pt_top = extend_middle_points_to_target_y(v[0], v[1], self.tp_btm)
-                        jnt_obj.joint_poly_coords_transf[k] = xnew, ynew
-                        # update the co-ordinate of the top of the Can and can length
-                        jnt_obj.can_pt_top = can_pt_top
-                        jnt_obj.can_length = np.linalg.norm(np.array(jnt_obj.can_pt_top) - np.array(jnt_obj.can_pt_btm))
+        jnt_obj = self.get_joint("kjt", 1)  # the mirrored k1 is a view of k1 so is extended too
+        if jnt_obj is not None:
+            for idx, (k, v) in enumerate(jnt_obj.joint_poly_coords_transf.items()):
+                if "can" in k:
+                    xnew, ynew, can_pt_top = extend_middle_points_to_target_y(v[0], v[1], self.tp_btm)
+                    jnt_obj.joint_poly_coords_transf[k] = xnew, ynew
+                    # update the co-ordinate of the top of the Can and can length
+                    jnt_obj.can_pt_top = can_pt_top
+                    jnt_obj.can_length = np.linalg.norm(np.array(jnt_obj.can_pt_top) - np.array(jnt_obj.can_pt_btm))
 
     def _check_batter_elevs_not_in_kjts(self):
         batter_1_elev, batter_2_elev = self.batter_1_elev, self.batter_2_elev
@@ -557,32 +514,22 @@ class Jacket:
 
                         self.warnings[f"batter_{idx+1}_kjt_interaction"] = {"flag": "warning", "message": message}
 
-                        # joint name: [batter_elev, "above"]
+                        # joint name: [batter_elev, "above"], only the source joints are edited (mirrors are views)
                         kink_loc = "above_kjt" if location == "Top" else "below_kjt"
-                        self.kjt_edits[jnt_obj] = [f"batter_{idx + 1}", kink_loc]
+                        if not jnt_obj.mirror:
+                            self.kjt_edits[jnt_obj] = [f"batter_{idx + 1}", kink_loc]
 
         if self.kjt_edits:
             self._edit_kjt_Can(extension_beyond_kink)
 
     def _edit_kjt_Can(self, extension_beyond_kink):
-        # original points all with negative x coord points
-        base_batter_1_pt = [-self.batter_1_width / 2, self.batter_1_elev]
-        base_batter_2_pt = [-self.batter_2_width / 2, self.batter_2_elev]
-        base_jkt_top_pt = [-self.tp_width / 2, self.tp_btm]
-        base_pile_top_pt = [-self.jacket_footprint / 2, self.pile_top_elev]
+        # original points all with negative x coord points (kjt_edits only holds the unmirrored joints)
+        batter_1_pt = [-self.batter_1_width / 2, self.batter_1_elev]
+        batter_2_pt = [-self.batter_2_width / 2, self.batter_2_elev]
+        jkt_top_pt = [-self.tp_width / 2, self.tp_btm]
+        pile_top_pt = [-self.jacket_footprint / 2, self.pile_top_elev]
 
         for jnt_obj, (batter, kink_loc) in self.kjt_edits.items():
-            if jnt_obj.mirror:
-                batter_1_pt = [-base_batter_1_pt[0], base_batter_1_pt[1]]
-                batter_2_pt = [-base_batter_2_pt[0], base_batter_2_pt[1]]
-                jkt_top_pt = [-base_jkt_top_pt[0], base_jkt_top_pt[1]]
-                pile_top_pt = [-base_pile_top_pt[0], base_pile_top_pt[1]]
-            else:
-                batter_1_pt = base_batter_1_pt[:]
-                batter_2_pt = base_batter_2_pt[:]
-                jkt_top_pt = base_jkt_top_pt[:]
-                pile_top_pt = base_pile_top_pt[:]
-
             # define pt1 i.e. the point at which the kink is
             pt1 = batter_1_pt if batter == "batter_1" else batter_2_pt
             # calculate point in far distance to define the vector between the kink point and the location
@@ -1,9 +1,12 @@
-from flask import Flask, render_template, session, request, jsonify
+from flask import Flask, render_template, session, request, jsonify, Response
 import json
 import pandas as pd
 from jktdesign.jacket import Jacket
 from jktdesign.mass import calculate_jkt_mto
 from jktdesign.plotter import jacket_plotter
+from jktdesign.spaceframe import JacketSpaceFrame
+from jktdesign.export import EXPORT_FORMATS
+from conescfs.jktcones import screen_jkt_cones, sweep_jkt_cones
 from jktdesign.create2Dsections import (get_kjt_geom_form_data, create_2D_kjoint_data, get_xjt_geom_form_data,
                                         get_leg_geom_form_data, create_2D_xjoint_data, create_2D_leg_data,
                                         get_brace_geom_form_data, create_2D_brace_a_data, create_2D_brace_b_data,
@@ -30,6 +33,37 @@ def jacket_sections_plot():
 
     session['jktsections_form_data'] = form_data
 
+    # get the original jacket data (from architect page)
+    jkt_json_str = session.get('jkt_json', '{}')
+    jkt_dict = json.loads(jkt_json_str)
+    jkt_obj = build_jacket_sections(form_data)
+
+    # design warnings and errors and return to app
+    warnings = jkt_obj.warnings
+
+    # reconstruct the plot each time a new post is generated (so that the existing plot is not scattered with new data everytime a post request happens)
+    updated_plot_json = jacket_plotter(jkt_obj, jkt_dict['lat'], jkt_dict['msl'], jkt_dict['splash_lower'], jkt_dict['splash_upper'], show_tower=False, twr_obj=None)
+
+    # create mto dataframe
+    df_mto = calculate_jkt_mto(jkt_obj)
+    session['df_mto'] = df_mto.to_json()
+
+    # warnings / info message for User
+    if empty_form_data_flag:
+        msg = f'Warning: Check input form is complete. Data required for all inputs!'
+    else:
+        msg = 'Warning: Plot updated (with warnings and/or errors)' if warnings else 'Plot updated successfully!'
+
+    return jsonify({'message': msg,
+                    'plot_json': updated_plot_json,
+                    "warnings": warnings
+                    })
+
+
+def build_jacket_sections(form_data, jkt_obj=None):
+    """Jacket object of the session jacket (architect page), or of jkt_obj (a new Jacket, it is edited), with the 2D
+    joints, legs and braces of the sections form
+    """
     section_alignment = form_data.get("section_alignment", "ID_constant")
     section_definition = form_data.get("section_definition", "by_OD")
 
@@ -40,10 +74,8 @@ def jacket_sections_plot():
     cone_taper = float(form_data.get("cone_taper", 4.))
     joint_gap = float(form_data.get("joint_gap", 100.))
 
-    # get the original jacket data (from architect page)
-    jkt_json_str = session.get('jkt_json', '{}')
-    jkt_dict = json.loads(jkt_json_str)
-    jkt_obj = create_jacket_from_session()  # define the jkt object from the 1D session (only at this point)
+    if jkt_obj is None:
+        jkt_obj = create_jacket_from_session()  # define the jkt object from the 1D session (only at this point)
 
 
     jkt_obj.set_cone_taper_ratio(cone_taper)  # set the cone taper ratio (used if sections are different sizes)
@@ -84,26 +116,64 @@ def jacket_sections_plot():
     for brace_hz_obj in brace_hz_objs:
         jkt_obj.add_brace_hz_obj(brace_hz_obj)
 
-    # design warnings and errors and return to app
-    warnings = jkt_obj.warnings
+    return jkt_obj
 
-    # reconstruct the plot each time a new post is generated (so that the existing plot is not scattered with new data everytime a post request happens)
-    updated_plot_json = jacket_plotter(jkt_obj, jkt_dict['lat'], jkt_dict['msl'], jkt_dict['splash_lower'], jkt_dict['splash_upper'], show_tower=False, twr_obj=None)
 
-    # create mto dataframe
-    df_mto = calculate_jkt_mto(jkt_obj)
-    session['df_mto'] = df_mto.to_json()
+def session_space_frame(n_legs=4):
+    """JacketSpaceFrame of the session jacket (architect page) with the last submitted sections, if any
+    """
+    form_data = session.get('jktsections_form_data')
+    jkt_obj = build_jacket_sections(form_data) if form_data else create_jacket_from_session()
+    jkt_3D = JacketSpaceFrame(jkt_obj, n_legs=n_legs)
+    jkt_3D.assign_sections()
+    return jkt_3D
 
-    # warnings / info message for User
-    if empty_form_data_flag:
-        msg = f'Warning: Check input form is complete. Data required for all inputs!'
-    else:
-        msg = 'Warning: Plot updated (with warnings and/or errors)' if warnings else 'Plot updated successfully!'
 
-    return jsonify({'message': msg,
-                    'plot_json': updated_plot_json,
-                    "warnings": warnings
-                    })
+@app.route('/jktsections/export/<fmt>', methods=['GET'])
+def jacket_export(fmt):
+    """download the 3D model of the session jacket (with the last submitted sections, if any) in an EXPORT_FORMATS
+    format, e.g. /jktsections/export/glb?n_legs=4. The file is streamed as it is written
+    """
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f'export format {fmt} not recognised, use one of {list(EXPORT_FORMATS)}'}), 404
+    if not json.loads(session.get('jkt_json', '{}')):
+        return jsonify({'error': 'First create your model on the Architect page before exporting it'}), 400
+
+    try:
+        jkt_3D = session_space_frame(n_legs=request.args.get('n_legs', 4, type=int))
+    except Exception as e:
+        return jsonify({'error': f'Jacket model could not be built for export: {e}'}), 400
+
+    exporter, mimetype, filename = EXPORT_FORMATS[fmt]
+    return Response(exporter(jkt_3D), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
+
+@app.route('/jktsections/cones', methods=['GET'])
+def jacket_cones():
+    """cone junction SCF screening (conescfs.jktcones) of the session jacket with the last submitted sections, one
+    record per junction ranked by the governing SCF, e.g. /jktsections/cones?nominal_stress_range=50. With sweep (a
+    cone variable, e.g. ?sweep=alpha&xlim=10) the cone SCFs of every junction swept over ±xlim% are added
+    """
+    if not json.loads(session.get('jkt_json', '{}')):
+        return jsonify({'error': 'First create your model on the Architect page before screening its cones'}), 400
+
+    form_data = session.get('jktsections_form_data')
+    try:
+        jkt_obj = build_jacket_sections(form_data) if form_data else create_jacket_from_session()
+        df = screen_jkt_cones(jkt_obj, nominal_stress_range=request.args.get('nominal_stress_range', type=float))
+        sweep_var = request.args.get('sweep')
+        sweep = None if sweep_var is None else sweep_jkt_cones(df, sweep_var, request.args.get('xlim', 10., type=float),
+                                                               request.args.get('n_pts', 21, type=int))
+    except Exception as e:
+        return jsonify({'error': f'Jacket cones could not be screened: {e}'}), 400
+
+    results = {'columns': list(df.columns), 'cones': df.to_dict(orient='records')}
+    if sweep is not None:
+        results['sweep'] = {'variable': sweep_var, 'x': sweep['x'].tolist(),
+                            **{method: {loc: scfs.tolist() for loc, scfs in sweep[method].items()}
+                               for method in ('sect3', 'appf17')}}
+    return jsonify(results)
 
 
 @app.route('/jktsections', methods=['GET'])
@@ -145,8 +215,12 @@ def jacket_sections():
 
 def create_jacket_from_session():
     jkt_json_str = session.get('jkt_json', '{}')  # todo check on initial load
-    jkt_dict = json.loads(jkt_json_str)
+    return jacket_from_config(json.loads(jkt_json_str))
+
 
+def jacket_from_config(jkt_dict):
+    """Jacket of an architect page config (the session jkt_json), e.g. architect.get_default_config()
+    """
     return Jacket(
         jkt_dict['interface_elev'],
         jkt_dict['tp_width'],
@@ -199,4 +273,35 @@ def get_default_sct_config(jkt_obj):
     defaults_sct["cone_taper"] = cone_taper
     defaults_sct["section_definition"] = section_definition
     defaults_sct["section_alignment"] = section_alignment
-    return defaults_sct
\ No newline at end of file
+    return defaults_sct
+
+
+def default_sections_form(jkt_obj):
+    """the /jktsections form as the page posts it for jkt_obj, the default sections of its joints, legs and braces
+    """
+    n_kjts = len(jkt_obj.kjt_n_braces)
+    form = {}
+    for key, val in get_default_sct_config(jkt_obj).items():
+        group, _, rest = key.partition("_")
+        if group in ("kjt", "leg") and int(rest.split("_")[0]) > n_kjts:
+            continue
+        if group in ("xjt", "bay") and int(rest.split("_")[-2 if group == "bay" else 0]) >= n_kjts:
+            continue
+        form[key] = str(val)
+    # unused stubs and bay horizontals are posted empty
+    for kjt, n_braces in jkt_obj.kjt_n_braces.items():
+        for stub in range(n_braces + 1, 4):
+            form[f"{kjt}_stub_{stub}_d"], form[f"{kjt}_stub_{stub}_t"] = "", ""
+    for bay in range(1, n_kjts):
+        if not jkt_obj.bay_horizontals[bay]:
+            form[f"bay_hz_{bay}_t"] = ""
+    return form
+
+
+def sectioned_jacket(jkt_dict, form_edits=None):
+    """Jacket of an architect page config with the default sections (default_sections_form) updated with
+    form_edits, e.g. {"kjt_2_can_d": "2500"}. Built without a request, for scripts and tests
+    """
+    form_data = default_sections_form(jacket_from_config(jkt_dict))
+    form_data.update(form_edits or {})
+    return build_jacket_sections(form_data, jacket_from_config(jkt_dict))
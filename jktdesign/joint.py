@@ -2,7 +2,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import copy
 
-from jktdesign.geom_utils import construct_true_constant_width_path, check_is_horizontal_rectangle
+from jktdesign.geom_utils import construct_true_constant_width_path, check_is_horizontal_rectangle, mirror_pt_x, \
+    mirror_coords_x
 
 """
 Joint geometry calculated using Joint Detailing guidance.
@@ -407,6 +408,56 @@ class Joint2D:
         plt.show()
 
 
+class MirroredJoint2D:
+    """mirror of a transformed Joint2D about the x=0 (y-axis) line, e.g. the k joint on the other leg of the jacket.
+
+    A view rather than a copy: the section sizes and other data attributes in shared_attrs are read from the source
+    joint, and the transformed polygon coords and the Can, kink and stub end points are reflected in x when accessed.
+    Edits to the source (e.g. Can extensions) therefore apply to the mirror too. The view itself cannot be transformed
+    or edited, and the methods and untransformed coords of the source are not available on it (AttributeError), as
+    they would work on or return the unmirrored joint
+    """
+    shared_attrs = ("Dc", "tc", "d1", "t1", "d1_theta", "d2", "t2", "d2_theta", "d3", "t3", "d3_theta", "jt_type",
+                    "joint_gap", "can_length", "batter_angle", "kinked_can")
+    mirrored_pts = ("can_pt_top", "can_pt_btm", "pt_kink", "translate_by")
+    mirrored_pt_dicts = ("stub_end_pts", "stub_start_pts")
+
+    def __init__(self, source: Joint2D, jt_name=None):
+        self.source = source
+        self.jt_name = jt_name if jt_name is not None else source.jt_name
+        self.mirror = True
+
+    def __getattr__(self, name):
+        # only called for names not found on the view, e.g. not for source before __init__ (copy and pickle lookups)
+        if name in MirroredJoint2D.shared_attrs:
+            return getattr(self.source, name)
+        if name in MirroredJoint2D.mirrored_pts:
+            return mirror_pt_x(getattr(self.source, name))
+        if name in MirroredJoint2D.mirrored_pt_dicts:
+            return {k: mirror_pt_x(pt) for k, pt in getattr(self.source, name).items()}
+        raise AttributeError(f"'{name}' not available on the mirrored view {type(self).__name__}, "
+                             f"use the source joint")
+
+    @property
+    def joint_poly_coords_transf(self):
+        coords_transf = self.source.joint_poly_coords_transf
+        if coords_transf is None:
+            return None
+        mirrored = {}
+        for k, v in coords_transf.items():
+            if k == "can" and self.source.kinked_can:  # kinked Can is a list of trapezium coords
+                mirrored[k] = [mirror_coords_x(trapezium) for trapezium in v]
+            else:
+                mirrored[k] = mirror_coords_x(v)
+        return mirrored
+
+    def transform_joint(self, *args, **kwargs):
+        raise RuntimeError(f"{self.jt_name} is a mirrored view of {self.source.jt_name}, transform the source joint")
+
+    def extend_kjt_Can_and_kink(self, *args, **kwargs):
+        raise RuntimeError(f"{self.jt_name} is a mirrored view of {self.source.jt_name}, edit the source joint")
+
+
 if __name__ == "__main__":
 
     # K JOINT
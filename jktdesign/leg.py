@@ -1,7 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from jktdesign.geom_utils import find_longest_segment, create_points_on_line, create_2D_cone, plot_2D_cone, \
-    construct_true_constant_width_path
+    construct_true_constant_width_path, mirror_pt_x, mirror_coords_x
 
 
 class Leg:
@@ -172,6 +172,40 @@ class Leg:
             self.cone_poly_coords[0] = [-xi for xi in self.cone_poly_coords[0]]
 
 
+class MirroredLeg:
+    """mirror of a constructed Leg about the x=0 (y-axis) line, e.g. the leg section on the other side of the jacket.
+
+    A view rather than a copy: the section sizes and other data attributes in shared_attrs are read from the source
+    Leg, and the points and polygon coords are reflected in x when accessed (the y coords are shared with the source).
+    The methods of the source are not available on the view (AttributeError) as they would edit the source Leg
+    """
+    shared_attrs = ("width1", "width2", "thk", "bay_side", "member_type", "section_alignment", "cone_length", "is_cone")
+    mirrored_pts = ("pt1", "pt2", "cone_pt1", "cone_pt2")
+    mirrored_pt_lists = ("pts", "mid_pts", "leg_a", "leg_b")
+    mirrored_poly_lists = ("leg_a_poly_coords", "leg_b_poly_coords")
+
+    def __init__(self, source: Leg, leg_name=None):
+        self.source = source
+        self.leg_name = leg_name if leg_name is not None else source.leg_name
+        self.mirror = True
+
+    def __getattr__(self, name):
+        # only called for names not found on the view, e.g. not for source before __init__ (copy and pickle lookups)
+        if name in MirroredLeg.shared_attrs:
+            return getattr(self.source, name)
+        if name in MirroredLeg.mirrored_pts:
+            return mirror_pt_x(getattr(self.source, name))
+        if name in MirroredLeg.mirrored_pt_lists:
+            val = getattr(self.source, name)
+            return None if val is None else [mirror_pt_x(pt) for pt in val]
+        if name in MirroredLeg.mirrored_poly_lists:
+            val = getattr(self.source, name)
+            return None if val is None else [mirror_coords_x(coords) for coords in val]
+        if name == "cone_poly_coords":
+            return mirror_coords_x(self.source.cone_poly_coords)
+        raise AttributeError(f"'{name}' not available on the mirrored view {type(self).__name__}, use the source leg")
+
+
 if __name__ == "__main__":
 
     pt1 = [0, 0]
@@ -5,6 +5,7 @@ import numpy as np
 import pandas as pd
 from dataclasses import asdict
 import re
+from timing import timed
 
 class JacketMassCalculator:
 
@@ -318,6 +319,7 @@ class JacketMassCalculator:
         # self.df.to_csv(r"C:\Users\Will.White\Python\website\test.csv", index=False, encoding="utf-8-sig")
 
 #
+@timed()
 def calculate_jkt_mto(jkt_obj: Jacket):
     jm_obj = JacketMassCalculator(jkt_obj)
     df_mto = jm_obj.df
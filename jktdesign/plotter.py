@@ -5,6 +5,7 @@ import plotly.io as pio
 
 from jktdesign.jacket import Jacket
 from jktdesign.tower import Tower
+from timing import timed
 
 
 def c_o_a_targetline(pt1, pt2, tp_btm, tp_width, c_o_a_LAT):
@@ -17,6 +18,7 @@ def c_o_a_targetline(pt1, pt2, tp_btm, tp_width, c_o_a_LAT):
     return x4, y4
 
 
+@timed()
 def jacket_plotter(jkt_obj: Jacket, lat: float, msl: float, splash_lower: float, splash_upper: float, show_tower: bool, twr_obj: Tower=None):
 
     if twr_obj is not None:
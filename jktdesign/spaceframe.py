@@ -0,0 +1,381 @@
+"""3D space frame (wireframe and tubular) model of 3 and 4 legged jackets
+
+The 2D Jacket object is one face of the jacket: legs at x = -width/2 and +width/2, k joints on the legs and x joints
+at x = 0. Here the same face is repeated around the jacket, each leg lying on the radial line through its corner so
+that every face is the 2D face (the face width at any elevation is the 2D width). Face 0 is between legs 0 and 1 and
+faces -y, i.e. leg 0 is the 2D left leg and leg 1 the 2D right (mirrored) leg.
+
+The model is built as node and member tables (pandas DataFrames) from arrays in one pass, rather than from one object
+per member. Units are mm, z is the elevation. The members run work point to work point, the joint Cans and brace
+stubs are placed on them from the 2D joint geometry for the mass take off (see JacketSpaceFrame.segments).
+"""
+import numpy as np
+import pandas as pd
+# local imports
+from jktdesign.jacket import Jacket
+from jktdesign.mass import JacketMassCalculator
+
+LEG_NUMBERS = (3, 4)
+
+
+def face_width_at_elevation(jkt: Jacket, elevation):
+    """face width (leg to leg, as the 2D jacket) at elevation(s), piecewise linear between the batter kinks
+    """
+    elevs = [jkt.pile_top_elev, jkt.batter_2_elev, jkt.batter_1_elev, jkt.tp_btm]
+    widths = [jkt.jacket_footprint, jkt.batter_2_width, jkt.batter_1_width, jkt.tp_width]
+    return np.interp(elevation, elevs, widths)
+
+
+def member_params(jkt: Jacket, z1, z2, pt):
+    """position of the 2D point pt (x, elevation) along members from z1 to z2 as a fraction from z1. By elevation, or
+    from the face left leg for horizontal members
+    """
+    dz = z2 - z1
+    half_width = face_width_at_elevation(jkt, pt[1]) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(np.abs(dz) > 1., (pt[1] - z1) / dz, (pt[0] + half_width) / (2 * half_width))
+
+
+def subtract_intervals(t_1, t_2, cuts):
+    """parts of the interval t_1 to t_2 outside the intervals cuts [(t_a, t_b), ...], list of (t_1, t_2)
+    """
+    parts = [(t_1, t_2)]
+    for t_a, t_b in cuts:
+        parts = [part for t_lo, t_hi in parts for part in ((t_lo, min(t_hi, t_a)), (max(t_lo, t_b), t_hi))
+                 if part[1] - part[0] > 1e-9]
+    return parts
+
+
+def hollow_frustum_volumes(d1, length, tw, d2=None):
+    """array version of JacketMassCalculator.hollow_frustum_volume, nan where the section is not defined
+    """
+    d1, length, tw = np.asarray(d1, dtype=float), np.asarray(length, dtype=float), np.asarray(tw, dtype=float)
+    d2 = d1 if d2 is None else np.where(np.isnan(d2), d1, d2)
+    R1, R2 = d1 / 2, d2 / 2
+    r1, r2 = R1 - tw, R2 - tw
+    if np.any((r1 <= 0) | (r2 <= 0)):
+        raise ValueError("Wall thickness too large.")
+    return (np.pi * length / 3) * (R1 ** 2 + R1 * R2 + R2 ** 2 - r1 ** 2 - r1 * r2 - r2 ** 2)
+
+
+class JacketSpaceFrame:
+    """3D node and member tables of a jacket with n_legs (3 or 4) built from the 2D Jacket parameters
+
+    Attributes:
+        nodes: DataFrame, one row per node (x, y, z, kind, name, leg, face)
+        members: DataFrame, one row per member (node_1, node_2, member_type, section, leg, face, bay, length, D, D_2, t)
+            section is the name of the 2D section the member takes its size from e.g. leg_2, bay_1_aL, bay_2_hz
+    """
+    def __init__(self, jkt: Jacket, n_legs=4):
+        if n_legs not in LEG_NUMBERS:
+            raise ValueError(f"n_legs {n_legs} not allowed, use one of {LEG_NUMBERS}")
+        self.jacket = jkt
+        self.n_legs = n_legs
+        # leg angles in plan, face f (between leg f and leg f+1) faces the angle of leg f + pi / n_legs
+        self.leg_angles = -np.pi / 2 - np.pi / n_legs + 2 * np.pi * np.arange(n_legs) / n_legs
+
+        self.leg_elevs = None  # descending elevations of the leg nodes (the same on every leg)
+        self.leg_pts = None  # array (n_elevs, n_legs, 3)
+        self.xjt_pts = None  # array (n_bays, n_legs, 3), x joint of each bay on each face
+        self.nodes = None
+        self.members = None
+
+        self._build_nodes()
+        self._build_members()
+
+    def leg_radius(self, elevation):
+        """plan distance of the legs from the jacket centre at elevation(s)
+        """
+        return face_width_at_elevation(self.jacket, elevation) / (2 * np.sin(np.pi / self.n_legs))
+
+    def _build_nodes(self):
+        jkt = self.jacket
+        kjt_elevs = np.array(list(jkt.kjt_elevs.values()), dtype=float)
+        # leg nodes at the TP, the k joints, the batter kinks and the pile top (batter 1 is not a kink if single batter)
+        kinks = [jkt.batter_2_elev] if jkt.single_batter else [jkt.batter_1_elev, jkt.batter_2_elev]
+        self.leg_elevs = np.unique(np.concatenate([[jkt.tp_btm, jkt.pile_top_elev], kjt_elevs, kinks]))[::-1]
+
+        radius = self.leg_radius(self.leg_elevs)
+        self.leg_pts = np.stack(np.broadcast_arrays(radius[:, None] * np.cos(self.leg_angles),
+                                                    radius[:, None] * np.sin(self.leg_angles),
+                                                    self.leg_elevs[:, None]), axis=-1)
+
+        # x joints, on the face centre line between the k joints above and below (diagonals of the face trapezium)
+        self.kjt_rows = np.searchsorted(-self.leg_elevs, -kjt_elevs)
+        xjt_elevs = np.array([jkt.xjt_elevs[f"xjt_{bay}"] for bay in range(1, len(kjt_elevs))], dtype=float)
+        face_mids = (self.leg_pts + np.roll(self.leg_pts, -1, axis=1)) / 2  # (n_elevs, n_faces, 3)
+        mid_top, mid_btm = face_mids[self.kjt_rows[:-1]], face_mids[self.kjt_rows[1:]]
+        frac = ((kjt_elevs[:-1] - xjt_elevs) / (kjt_elevs[:-1] - kjt_elevs[1:]))[:, None, None]
+        self.xjt_pts = mid_top + frac * (mid_btm - mid_top)
+
+        # node table, leg nodes first (node id = row * n_legs + leg) then x joints (face fastest)
+        n_elevs, n_legs, n_bays = len(self.leg_elevs), self.n_legs, len(xjt_elevs)
+        kinds = np.full(n_elevs, "leg", dtype=object)
+        names = np.full(n_elevs, None, dtype=object)
+        kinds[0], kinds[-1] = "tp", "pile_top"
+        for kink, elev in zip(("batter_1", "batter_2"), (jkt.batter_1_elev, jkt.batter_2_elev)):
+            kinds[np.isclose(self.leg_elevs, elev) & (kinds == "leg")] = kink
+        kinds[self.kjt_rows], names[self.kjt_rows] = "kjt", list(jkt.kjt_elevs)
+
+        leg_pts, xjt_pts = self.leg_pts.reshape(-1, 3), self.xjt_pts.reshape(-1, 3)
+        self.nodes = pd.DataFrame({
+            "x": np.concatenate([leg_pts[:, 0], xjt_pts[:, 0]]),
+            "y": np.concatenate([leg_pts[:, 1], xjt_pts[:, 1]]),
+            "z": np.concatenate([leg_pts[:, 2], xjt_pts[:, 2]]),
+            "kind": np.concatenate([np.repeat(kinds, n_legs), np.full(n_bays * n_legs, "xjt", dtype=object)]),
+            "name": np.concatenate([np.repeat(names, n_legs),
+                                    np.repeat([f"xjt_{bay}" for bay in range(1, n_bays + 1)], n_legs)]),
+            "leg": np.concatenate([np.tile(np.arange(n_legs), n_elevs), np.full(n_bays * n_legs, -1)]),
+            "face": np.concatenate([np.full(n_elevs * n_legs, -1), np.tile(np.arange(n_legs), n_bays)]),
+        })
+        self.nodes.index.name = "node"
+
+    def leg_node(self, row, leg):
+        """node id(s) of the leg node at leg_elevs[row] on leg (mod n_legs)
+        """
+        return np.asarray(row) * self.n_legs + np.asarray(leg) % self.n_legs
+
+    def xjt_node(self, bay, face):
+        """node id(s) of the x joint of bay (1, 2, ...) on face
+        """
+        return self.leg_pts.shape[0] * self.n_legs + (np.asarray(bay) - 1) * self.n_legs + np.asarray(face)
+
+    def _build_members(self):
+        jkt, n_legs = self.jacket, self.n_legs
+        n_elevs, n_bays = len(self.leg_elevs), self.xjt_pts.shape[0]
+        kjt_elevs = self.leg_elevs[self.kjt_rows]
+        tables = []
+
+        # legs, between consecutive leg nodes. Above k1 the member is the k1 Can, below k joint k it is leg section k
+        rows, legs = np.meshgrid(np.arange(n_elevs - 1), np.arange(n_legs), indexing="ij")
+        k_above = (kjt_elevs[None, :] >= self.leg_elevs[:-1, None]).sum(axis=1)
+        leg_sections = np.where(k_above == 0, "kjt_1", np.char.add("leg_", k_above.astype(str)))
+        tables.append(pd.DataFrame({"node_1": self.leg_node(rows, legs).ravel(),
+                                    "node_2": self.leg_node(rows + 1, legs).ravel(),
+                                    "member_type": "LEG",
+                                    "section": np.repeat(leg_sections, n_legs),
+                                    "leg": legs.ravel(), "face": -1, "bay": np.repeat(k_above, n_legs)}))
+
+        # bay braces, the 2D brace names: a braces from the k joints above to the x joint, b braces from the x joint to
+        # the k joints below, L and R the left (face leg f) and right (face leg f + 1) side
+        bays, faces = np.meshgrid(np.arange(1, n_bays + 1), np.arange(n_legs), indexing="ij")
+        row_top, row_btm = self.kjt_rows[bays - 1], self.kjt_rows[bays]
+        xjt = self.xjt_node(bays, faces)
+        brace_ends = {"aL": (self.leg_node(row_top, faces), xjt), "aR": (self.leg_node(row_top, faces + 1), xjt),
+                      "bL": (xjt, self.leg_node(row_btm, faces)), "bR": (xjt, self.leg_node(row_btm, faces + 1))}
+        for side, (node_1, node_2) in brace_ends.items():
+            tables.append(pd.DataFrame({"node_1": node_1.ravel(), "node_2": node_2.ravel(), "member_type": "BRC",
+                                        "section": [f"bay_{bay}_{side}" for bay in bays.ravel()],
+                                        "leg": -1, "face": faces.ravel(), "bay": bays.ravel()}))
+
+        # horizontals, between the k joints of the same elevation (bay_horizontals is per k joint, see 2D sections)
+        kjt_nos = np.flatnonzero(jkt.bay_horizontals[:len(self.kjt_rows)]) + 1
+        kjt_nos, faces = np.meshgrid(kjt_nos, np.arange(n_legs), indexing="ij")
+        rows = self.kjt_rows[kjt_nos - 1]
+        tables.append(pd.DataFrame({"node_1": self.leg_node(rows, faces).ravel(),
+                                    "node_2": self.leg_node(rows, faces + 1).ravel(), "member_type": "BRC",
+                                    "section": [f"bay_{k - 1}_hz" for k in kjt_nos.ravel()],
+                                    "leg": -1, "face": faces.ravel(), "bay": (kjt_nos - 1).ravel()}))
+
+        self.members = pd.concat(tables, ignore_index=True)
+        self.members.index.name = "member"
+        xyz = self.nodes[["x", "y", "z"]].to_numpy()
+        self.members["length"] = np.linalg.norm(xyz[self.members["node_2"]] - xyz[self.members["node_1"]], axis=1)
+        self.members[["D", "D_2", "t"]] = np.nan
+
+    def member_vectors(self):
+        """unit vectors from node_1 to node_2 of every member, array (n_members, 3)
+        """
+        xyz = self.nodes[["x", "y", "z"]].to_numpy()
+        vec = xyz[self.members["node_2"]] - xyz[self.members["node_1"]]
+        return vec / np.linalg.norm(vec, axis=1)[:, None]
+
+    def assign_sections(self, section_sizes=None):
+        """set member D (top / start OD), D_2 (end OD, cones) and t from the 2D sections
+
+        Args:
+            section_sizes: dict of section name to (D, D_2, t), by default from the Leg and Joint2D objects added to
+                the jacket (see sections_from_2D)
+        """
+        section_sizes = self.sections_from_2D() if section_sizes is None else section_sizes
+        sizes = self.members["section"].map(section_sizes)
+        self.members[["D", "D_2", "t"]] = np.array([s if isinstance(s, tuple) else (np.nan,) * 3 for s in sizes],
+                                                   dtype=float).reshape(-1, 3)
+
+    def sections_from_2D(self):
+        """section name to (D, D_2, t) of the 2D leg and brace sections (and the k1 Can) added to the jacket
+        """
+        jkt = self.jacket
+        sections = {obj.leg_name: (obj.width1, obj.width2, obj.thk)
+                    for obj in jkt.leg_objs + jkt.brace_a_objs + jkt.brace_b_objs + jkt.brace_hz_objs if not obj.mirror}
+        k1 = jkt.get_joint("kjt", 1)
+        if k1 is not None:
+            sections["kjt_1"] = (k1.Dc, k1.Dc, k1.tc)
+        return sections
+
+    def _joint_pieces(self):
+        """Can and stub intervals on the members from the 2D joints, the same on every leg and face
+
+        Returns:
+            list of (member index array, t_1 array, t_2 array, kind, section, D, t), t_1 < t_2 fractions from node_1
+        """
+        jkt, m = self.jacket, self.members
+        z = self.nodes["z"].to_numpy()
+        z1, z2 = z[m["node_1"].to_numpy()], z[m["node_2"].to_numpy()]
+        sections = m["section"].to_numpy()
+        pieces = []
+
+        def _add(idx, pt_a, pt_b, kind, section, D, t):
+            t_a, t_b = member_params(jkt, z1[idx], z2[idx], pt_a), member_params(jkt, z1[idx], z2[idx], pt_b)
+            t_1, t_2 = np.clip(np.minimum(t_a, t_b), 0., 1.), np.clip(np.maximum(t_a, t_b), 0., 1.)
+            on_member = t_2 - t_1 > 1e-9
+            pieces.append((idx[on_member], t_1[on_member], t_2[on_member], kind, section, float(D), float(t)))
+
+        # Cans, k joints on the legs (the k1 Can reaches the TP) and x joints on the through braces aR and bL
+        is_leg = (m["member_type"] == "LEG").to_numpy()
+        for (jt_type, jt_no, mirror), jnt_obj in jkt.joint_index.items():
+            if mirror or jnt_obj.can_pt_top is None:
+                continue
+            through = np.isin(sections, [f"bay_{jt_no}_aR", f"bay_{jt_no}_bL"])
+            idx = np.flatnonzero(is_leg if jt_type == "kjt" else through)
+            _add(idx, jnt_obj.can_pt_top, jnt_obj.can_pt_btm, "CAN", f"{jt_type}_{jt_no}", jnt_obj.Dc, jnt_obj.tc)
+
+        # stubs, from the chord surface to the stub end the 2D brace starts or ends at (the mirrored joints for the R
+        # braces and the right end of the horizontals)
+        stubs = [(jt_type, jt_no, jnt_obj, stub) for (jt_type, jt_no, _), jnt_obj in jkt.joint_index.items()
+                 for stub in jnt_obj.stub_end_pts]
+        for obj in jkt.brace_a_objs + jkt.brace_b_objs + jkt.brace_hz_objs:
+            idx = np.flatnonzero(sections == obj.leg_name)
+            for pt in (obj.pts[0], obj.pts[-1]):
+                for jt_type, jt_no, jnt_obj, stub in stubs:
+                    if np.allclose(jnt_obj.stub_end_pts[stub], pt):
+                        n = stub.removeprefix("brc")
+                        _add(idx, jnt_obj.stub_start_pts[stub], jnt_obj.stub_end_pts[stub], "STUB",
+                             f"{jt_type}_{jt_no}_stub_{n}", getattr(jnt_obj, f"d{n}"), getattr(jnt_obj, f"t{n}"))
+                        break
+        return pieces
+
+    def segments(self):
+        """tubular segments of the members for the mass take off: the joint Cans and brace stubs (sizes and lengths
+        from the 2D joint geometry) and the member sections between them, split at the cones of the 2D sections.
+
+        The parts of the braces inside the Cans (work point to chord surface) are not steel and not included. Can
+        and stub lengths are their 2D lengths along the 3D members (by elevation, as the faces are the 2D face), the
+        3D brace to leg angles are not used to re-detail the joints (see joint_braces)
+
+        Returns:
+            DataFrame, one row per segment: member, kind (LEG, BRC, CAN or STUB), section, t_1 and t_2 (fractions
+            along the member from node_1), length, end diameters D_1 and D_2 and thickness t [mm]. Members without a
+            section size (see assign_sections) have nan sizes
+        """
+        jkt, m = self.jacket, self.members
+        z = self.nodes["z"].to_numpy()
+        sections_2D = {obj.leg_name: obj for obj in
+                       jkt.leg_objs + jkt.brace_a_objs + jkt.brace_b_objs + jkt.brace_hz_objs if not obj.mirror}
+        pieces = self._joint_pieces()
+        cuts = [[] for _ in range(len(m))]
+        for idx, t_1, t_2, *_ in pieces:
+            for member, ta, tb in zip(idx, t_1, t_2):
+                cuts[member].append((ta, tb))
+
+        rows = []
+        for member, (node_1, node_2, kind, section, D, D_2, t) in enumerate(
+                m[["node_1", "node_2", "member_type", "section", "D", "D_2", "t"]].itertuples(index=False)):
+            obj = sections_2D.get(section)
+            # member section between the 2D section ends (stub ends, Can ends or the pile top), cone ends as knots
+            t_ends, knots, diams = (0., 1.), [], [D, D if np.isnan(D_2) else D_2]
+            if obj is not None:
+                t_ends = sorted(float(member_params(jkt, z[node_1], z[node_2], pt)) for pt in (obj.pts[0], obj.pts[-1]))
+                if obj.is_cone and not np.isnan(D):
+                    # cone_pt1 is at the larger diameter end, the diameter is constant either side of the cone
+                    t_a = float(member_params(jkt, z[node_1], z[node_2], obj.cone_pt1))
+                    t_b = float(member_params(jkt, z[node_1], z[node_2], obj.cone_pt2))
+                    (t_lo, D_lo), (t_hi, D_hi) = sorted([(t_a, max(D, D_2)), (t_b, min(D, D_2))])
+                    knots, diams = [t_lo, t_hi], [D_lo, D_hi]
+            for t_lo, t_hi in subtract_intervals(max(t_ends[0], 0.), min(t_ends[1], 1.), sorted(cuts[member])):
+                ts = [t_lo, *(k for k in knots if t_lo < k < t_hi), t_hi]
+                for t_1, t_2 in zip(ts[:-1], ts[1:]):
+                    D_1, D_2_seg = np.interp([t_1, t_2], knots, diams) if knots else diams
+                    rows.append((member, kind, section, t_1, t_2, D_1, D_2_seg, t))
+        for idx, t_1, t_2, kind, section, D, t in pieces:
+            rows.extend((member, kind, section, ta, tb, D, D, t) for member, ta, tb in zip(idx, t_1, t_2))
+
+        df = pd.DataFrame(rows, columns=["member", "kind", "section", "t_1", "t_2", "D_1", "D_2", "t"])
+        df.insert(5, "length", (df["t_2"] - df["t_1"]) * m["length"].to_numpy()[df["member"]])
+        return df
+
+    def mto(self):
+        """mass take off of the whole jacket (all legs and faces) by section, from the segments of the members between
+        the joints and the joint Cans and stubs (see segments). Sections without a size (see assign_sections) have
+        nan mass
+        """
+        seg = self.segments()
+        valid = seg["t"].notna().to_numpy()
+        vols = np.full(len(seg), np.nan)
+        vols[valid] = hollow_frustum_volumes(seg.loc[valid, "D_1"], seg.loc[valid, "length"], seg.loc[valid, "t"],
+                                             seg.loc[valid, "D_2"])
+        df = seg.assign(mass=vols * JacketMassCalculator.rho)
+        df = df.groupby(["kind", "section"], sort=False).agg(
+            count=("length", "size"), **{"length [mm]": ("length", "sum"), "od_top [mm]": ("D_1", "first"),
+                                         "od_bottom [mm]": ("D_2", "first"), "thickness [mm]": ("t", "first"),
+                                         "total mass [t]": ("mass", lambda mass: mass.sum(min_count=1))})
+        return df.reset_index().rename(columns={"kind": "member_type"})
+
+    def joint_braces(self):
+        """brace to chord angles at every k joint (chord is the leg) and x joint (chord is the through brace aR-bL)
+
+        theta is the angle between the brace and the upward chord axis [deg] (0 to 180, as the 2D brace angles), phi
+        the out of plane angle of the brace about the chord axis from the direction to the jacket centre [deg] (the
+        braces of the two faces at a k joint are about 90 deg apart for 4 legs, 60 deg for 3 legs)
+
+        Returns:
+            DataFrame, one row per brace end at a joint (joint node, brace member, chord member, theta, phi, sizes)
+        """
+        m, xyz = self.members, self.nodes[["x", "y", "z"]].to_numpy()
+        brc = m[m["member_type"] == "BRC"]
+        n_rows = len(self.leg_elevs)
+
+        # every brace end at a k joint (leg node) or at the x joint where the brace is not the through brace
+        ids = brc.index.to_numpy()
+        ends = pd.DataFrame({"node": np.concatenate([brc["node_1"], brc["node_2"]]),
+                             "other": np.concatenate([brc["node_2"], brc["node_1"]]), "member": np.tile(ids, 2)})
+        kinds = self.nodes["kind"].to_numpy()
+        through = brc["section"].str.endswith(("aR", "bL")).reindex(ends["member"]).to_numpy()
+        ends = ends[(kinds[ends["node"]] == "kjt") | ((kinds[ends["node"]] == "xjt") & ~through)]
+        ends = ends.sort_values(["node", "member"]).reset_index(drop=True)
+        node, at_xjt = ends["node"].to_numpy(), kinds[ends["node"]] == "xjt"
+
+        # chord axis (upwards), legs: node below to node above; x joints: the through brace from bL end to aR end
+        row, leg = np.minimum(node // self.n_legs, n_rows - 1), node % self.n_legs
+        chord = self.leg_pts[np.maximum(row - 1, 0), leg] - self.leg_pts[np.minimum(row + 1, n_rows - 1), leg]
+        bay, face = (node - n_rows * self.n_legs) // self.n_legs + 1, (node - n_rows * self.n_legs) % self.n_legs
+        bay, face = np.where(at_xjt, bay, 1), np.where(at_xjt, face, 0)
+        x_chord = (self.leg_pts[self.kjt_rows[bay - 1], (face + 1) % self.n_legs] -
+                   self.leg_pts[self.kjt_rows[bay], face])
+        chord = np.where(at_xjt[:, None], x_chord, chord)
+        chord /= np.linalg.norm(chord, axis=1)[:, None]
+
+        brace = xyz[ends["other"]] - xyz[node]
+        brace /= np.linalg.norm(brace, axis=1)[:, None]
+        theta = np.degrees(np.arccos(np.clip(np.sum(chord * brace, axis=1), -1., 1.)))
+
+        # out of plane angle, brace and inward direction projected on the plane normal to the chord
+        inward = -xyz[node] * np.array([1., 1., 0.])
+        proj = lambda v: v - np.sum(v * chord, axis=1)[:, None] * chord
+        b_perp, r_perp = proj(brace), proj(inward)
+        phi = np.degrees(np.arctan2(np.sum(chord * np.cross(r_perp, b_perp), axis=1), np.sum(r_perp * b_perp, axis=1)))
+        phi = np.where(at_xjt, np.nan, phi)  # x joints are planar
+
+        # chord member, the leg member below the k joint, the through brace above the x joint (aR)
+        leg_members, thru = m[m["member_type"] == "LEG"], brc[brc["section"].str.endswith("aR")]
+        chord_member = np.where(at_xjt, pd.Series(thru.index, index=thru["node_2"]).reindex(node).to_numpy(),
+                                pd.Series(leg_members.index, index=leg_members["node_1"]).reindex(node).to_numpy()
+                                ).astype(int)
+
+        df = pd.DataFrame({"node": node, "joint": self.nodes["name"].to_numpy()[node], "member": ends["member"],
+                           "section": m["section"].to_numpy()[ends["member"]], "chord_member": chord_member,
+                           "theta": theta, "phi": phi})
+        sizes = m[["D", "t"]].to_numpy()
+        df["D"], df["T"] = sizes[chord_member].T
+        df["d"], df["t"] = sizes[ends["member"]].T
+        return df
@@ -0,0 +1,106 @@
+"""tessellated (triangle mesh) GLB of the 3D jacket for the web viewer
+
+The tubular segments of the JacketSpaceFrame (JacketSpaceFrame.segments, as export.iter_glb and the mass take off:
+member sections split at the cones of the 2D sections, joint Cans and brace stubs) are each an instance of a unit tube
+(radius 1, length 1 along +y, end radius ratio for cones) placed by a glTF node (translation, rotation and scale). The
+vertex buffer holds one unit tube per cone ratio and the repeated members (every leg and face) share it, unlike
+export.iter_glb which writes the vertices of every segment (for CAD import).
+"""
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+# local imports
+from jktdesign.export import glb_header, glb_material, tube_indices, tube_vertices
+from jktdesign.spaceframe import JacketSpaceFrame
+
+N_SIDES = 24
+GLB_VERSION = 2  # part of the model hash, increment when the GLB layout changes
+
+
+def model_hash(params):
+    """hash of the json serialisable model parameters (with GLB_VERSION), the cache key of a tessellated model
+    """
+    text = json.dumps({"glb_version": GLB_VERSION, **params}, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode()).hexdigest()[:20]
+
+
+def unit_tube(ratio, n_sides=N_SIDES):
+    """positions and normals (float32, (2 * n_sides, 3)) of an open tube along +y of length 1, radius 1 at y = 0 and
+    ratio at y = 1. Normals are tilted for cones
+    """
+    positions, rings = tube_vertices(np.array([[0., 0., 0.]]), np.array([[0., 1., 0.]]), np.array([1.]),
+                                     np.array([ratio]), n_sides)
+    normals = rings[0] + np.array([0., 1. - ratio, 0.])
+    normals /= np.linalg.norm(normals, axis=1)[:, None]
+    return positions[0].astype(np.float32), normals.astype(np.float32)
+
+
+def y_to_vector_quaternions(vec):
+    """unit quaternions (x, y, z, w) rotating +y onto the unit vectors vec (n, 3)
+    """
+    # half way rotation q = (y x v, 1 + y.v), 180 deg about x where v is -y
+    quats = np.stack([vec[:, 2], np.zeros(len(vec)), -vec[:, 0], 1. + vec[:, 1]], axis=1)
+    quats[quats[:, 3] < 1e-9] = [1., 0., 0., 0.]
+    return quats / np.linalg.norm(quats, axis=1)[:, None]
+
+
+def jacket_glb(sf: JacketSpaceFrame, n_sides=N_SIDES, default_diameter=1000., ratio_ndps=3):
+    """binary glTF (bytes) of the instanced segments (see JacketSpaceFrame.segments), y up and in m. Segments without
+    a section size use default_diameter [mm]
+
+    One unit tube per cone end ratio (rounded to ratio_ndps) shares a single index accessor, one mesh per (ratio,
+    kind) pair and one node per segment, all children of the "jacket" node
+    """
+    segments = sf.segments()
+    segments["D_1"] = segments["D_1"].fillna(default_diameter)
+    segments["D_2"] = segments["D_2"].fillna(segments["D_1"])
+    m, xyz = sf.members, sf.nodes[["x", "y", "z"]].to_numpy() / 1000.
+    xyz = np.stack([xyz[:, 0], xyz[:, 2], -xyz[:, 1]], axis=1)  # gltf is y up, the model is z up
+    p1, p2 = xyz[m["node_1"].to_numpy()[segments["member"]]], xyz[m["node_2"].to_numpy()[segments["member"]]]
+    t_1, t_2 = segments[["t_1"]].to_numpy(), segments[["t_2"]].to_numpy()
+    starts, vecs = p1 + t_1 * (p2 - p1), (t_2 - t_1) * (p2 - p1)
+    lengths = np.linalg.norm(vecs, axis=1)
+    radii = segments["D_1"].to_numpy() / 2000.
+    quats = y_to_vector_quaternions(vecs / lengths[:, None])
+    ratios = np.round(segments["D_2"].to_numpy() / segments["D_1"].to_numpy(), ratio_ndps)
+
+    # shared buffer: the indices of a unit tube then the interleaved positions and normals of every unit tube
+    unique_ratios, ratio_ids = np.unique(ratios, return_inverse=True)
+    indices = tube_indices(0, 1, n_sides).astype("<u4").tobytes()
+    tubes = [np.concatenate(unit_tube(ratio, n_sides), axis=1).astype("<f4") for ratio in unique_ratios]
+    n_verts, vertex_bytes = 2 * n_sides, 2 * n_sides * 24
+    accessors = [{"bufferView": 0, "byteOffset": 0, "componentType": 5125, "count": 6 * n_sides, "type": "SCALAR"}]
+    for idx, tube in enumerate(tubes):
+        accessors += [{"bufferView": 1, "byteOffset": idx * vertex_bytes, "componentType": 5126, "count": n_verts,
+                       "type": "VEC3", "min": tube[:, :3].min(axis=0).tolist(), "max": tube[:, :3].max(axis=0).tolist()},
+                      {"bufferView": 1, "byteOffset": idx * vertex_bytes + 12, "componentType": 5126, "count": n_verts,
+                       "type": "VEC3"}]
+
+    kinds = list(segments["kind"].unique())
+    mesh_keys = pd.MultiIndex.from_arrays([ratio_ids, segments["kind"]]).unique()
+    meshes = [{"name": f"{kind}_{unique_ratios[ratio_id]:g}",
+               "primitives": [{"attributes": {"POSITION": 1 + 2 * ratio_id, "NORMAL": 2 + 2 * ratio_id},
+                               "indices": 0, "material": kinds.index(kind)}]} for ratio_id, kind in mesh_keys]
+    mesh_ids = pd.Series(np.arange(len(mesh_keys)), index=mesh_keys)[
+        pd.MultiIndex.from_arrays([ratio_ids, segments["kind"]])].to_numpy()
+
+    names = segments["section"].to_numpy()
+    nodes = [{"name": "jacket", "children": list(range(1, len(segments) + 1))}]
+    nodes += [{"name": f"{name}_{member}", "mesh": int(mesh_id), "translation": start, "rotation": quat,
+               "scale": [radius, length, radius]}
+              for name, member, mesh_id, start, quat, radius, length in
+              zip(names, segments["member"].tolist(), mesh_ids, np.round(starts, 4).tolist(),
+                  np.round(quats, 6).tolist(), np.round(radii, 4).tolist(), np.round(lengths, 4).tolist())]
+
+    bin_chunk = indices + b"".join(tube.tobytes() for tube in tubes)
+    gltf = {"asset": {"version": "2.0", "generator": "oswdesigntools jktdesign.tessellate"},
+            "scene": 0, "scenes": [{"nodes": [0]}], "nodes": nodes, "meshes": meshes,
+            "materials": [glb_material(kind) for kind in kinds],
+            "buffers": [{"byteLength": len(bin_chunk)}],
+            "bufferViews": [{"buffer": 0, "byteOffset": 0, "byteLength": len(indices), "target": 34963},
+                            {"buffer": 0, "byteOffset": len(indices), "byteLength": len(tubes) * vertex_bytes,
+                             "byteStride": 24, "target": 34962}],
+            "accessors": accessors}
+    return glb_header(gltf, len(bin_chunk)) + bin_chunk
@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+OPEN_METEO_FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+OPEN_METEO_MARINE_URL = "https://marine-api.open-meteo.com/v1/marine"
+
+# endpoint name -> url, sun and wind data both come from the forecast api (with different params)
+ENDPOINT_URLS = {
+    "sun": OPEN_METEO_FORECAST_URL,
+    "wind": OPEN_METEO_FORECAST_URL,
+    "tide": OPEN_METEO_MARINE_URL,
+}
+
+
+class RequestsTransport:
+    """default transport, a pooled requests session. Any callable transport(url, params) -> dict (the decoded json)
+    can be used instead, e.g. for a local stub server.
+    SSL verification is disabled (verify=False) as for the original api calls.
+    """
+    def __init__(self, session=None, pool_size=10, verify=False, timeout=30):
+        self.session = session if session is not None else requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.verify = verify
+        self.timeout = timeout
+
+    def __call__(self, url, params):
+        r = self.session.get(url, params=params, verify=self.verify, timeout=self.timeout)
+        r.raise_for_status()
+        return r.json()
+
+
+class ForecastFetcher:
+    """cached, concurrent fetch layer for the Open-Meteo apis
+
+    Responses are cached on (endpoint, rounded lat, rounded lon, query params, hour) for ttl seconds, Open-Meteo data
+    changes at most hourly. The executor is shared so the sun, tide and wind requests (and those of several spots) run
+    concurrently.
+    """
+    def __init__(self, transport=None, endpoint_urls=None, ttl=3600, latlon_dps=2, max_workers=8,
+                 max_entries=512):
+        self.transport = transport if transport is not None else RequestsTransport(pool_size=max_workers)
+        self.endpoint_urls = {**ENDPOINT_URLS, **(endpoint_urls or {})}
+        self.ttl = ttl
+        self.latlon_dps = latlon_dps
+        self.max_entries = max_entries
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kitesurf-fetch")
+
+        self._cache = {}  # key: (expiry time, json data)
+        self._lock = threading.Lock()
+        self.hits, self.misses = 0, 0
+
+    def cache_key(self, endpoint, lat, lon, params=None):
+        hour = datetime.now().strftime("%Y-%m-%dT%H")
+        # the params in a canonical (sorted) form, lists of variables as given
+        params_key = json.dumps(params or {}, sort_keys=True, default=str)
+        return endpoint, round(lat, self.latlon_dps), round(lon, self.latlon_dps), params_key, hour
+
+    def get_json(self, endpoint, lat, lon, params):
+        """json for the endpoint at lat, lon (rounded, so that nearby requests share a cache entry)
+
+        args:
+            endpoint: key of endpoint_urls, e.g. "sun", "wind" or "tide"
+            params: dict of query params, excluding latitude and longitude
+        """
+        key = self.cache_key(endpoint, lat, lon, params)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        _, lat_r, lon_r, _, _ = key
+        data = self.transport(self.endpoint_urls[endpoint], {"latitude": lat_r, "longitude": lon_r, **params})
+
+        with self._lock:
+            self._cache[key] = (now + self.ttl, data)
+            self._evict(now)
+        return data
+
+    def submit(self, fn, *args, **kwargs):
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _evict(self, now):
+        # expired entries first, then the oldest if still above max_entries
+        for key in [key for key, (expiry, _) in self._cache.items() if expiry <= now]:
+            del self._cache[key]
+        while len(self._cache) > self.max_entries:
+            del self._cache[next(iter(self._cache))]
+
+
+# shared by all requests of this process
+FETCHER = ForecastFetcher()
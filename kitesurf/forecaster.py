@@ -1,66 +1,131 @@
 import pandas as pd
+from kitesurf.fetcher import FETCHER
 from kitesurf.sunhoursapi import get_sunrise_sunset_api
 from kitesurf.tideapi import get_tides_api
-from kitesurf.wind_arrow_plot import plot_wind_arrow
+from kitesurf.wind_arrow_plot import wind_arrow_glyphs
 from kitesurf.windapi import get_wind_forecast
 
 
-def get_good_week_forecast(lat, lon, loc_data, remove_filters=False):
+def submit_forecast_data(lat, lon, fetcher=FETCHER):
+    """submit the sun, tide and wind api requests for the location to the fetcher (run concurrently)
+    """
+    return [fetcher.submit(get_api, lat, lon, fetcher)
+            for get_api in (get_sunrise_sunset_api, get_tides_api, get_wind_forecast)]
+
+
+def get_forecast_data(lat, lon, fetcher=FETCHER):
+    """sun, tide and wind data for the location, the three api requests are made concurrently
+    """
+    df_sun_times, df_tide_times, df_wind_forecast = [future.result() for future in submit_forecast_data(lat, lon, fetcher)]
+    return df_sun_times, df_tide_times, df_wind_forecast
+
+
+def get_hourly_forecast(df_sun_times, df_tide_times, df_wind_forecast):
+    """hourly wind forecast with the sunrise/sunset and low/high tide times of each day joined on by date
+    """
+    df_sun = df_sun_times.assign(date=df_sun_times["date"].dt.date)[["date", "sunrise", "sunset"]]
+    df_tide = df_tide_times[["date", "tide_min_time", "tide_max_time"]]
+    return df_wind_forecast.merge(df_sun, on="date", how="left").merge(df_tide, on="date", how="left")
+
+
+def loc_data_columns(loc_data):
+    """location filter settings as flat columns, for joining onto the hourly forecast frame
+    """
+    return {"tide_window_side": loc_data["tide_window"][0],
+            "tide_window_hours": loc_data["tide_window"][1],
+            "wind_direction_min": loc_data["wind_direction"][0],
+            "wind_direction_max": loc_data["wind_direction"][1],
+            "wind_speed_min": loc_data["wind_speed"][0],
+            "wind_speed_max": loc_data["wind_speed"][1],
+            "wind_gust_limit": loc_data["wind_gust_limit"]}
+
+
+def forecast_mask(df):
+    """light, tide, wind direction, wind speed and gust filters applied column-wise to an hourly forecast frame
+    with the location filter settings (loc_data_columns) as columns, i.e. any number of spots at once
+    """
+    time = df["datetime"]
+    # filter day time hours (light)
+    light_hours_allow = (time >= df["sunrise"]) & (time <= df["sunset"])
+
+    # filter tide times, within the tide window hours either side of the low or high tide
+    tide_time = df["tide_min_time"].where(df["tide_window_side"] == "low", df["tide_max_time"])
+    tide_hours_allow = (time - tide_time).abs() <= pd.to_timedelta(df["tide_window_hours"], unit="h")
+
+    # filter wind direction (note 360 degree sector and allowable directions can cross the 360 direction)
+    direction = df["wind_direction"]
+    above_min, below_max = direction >= df["wind_direction_min"], direction <= df["wind_direction_max"]
+    crosses_360 = df["wind_direction_min"] >= df["wind_direction_max"]
+    wind_direction_allow = (crosses_360 & (above_min | below_max)) | (~crosses_360 & above_min & below_max)
+
+    # filter wind speeds and gusts
+    speed = df["wind_speed [kts]"]
+    wind_speed_allow = (speed >= df["wind_speed_min"]) & (speed <= df["wind_speed_max"])
+    wind_gusts_allow = (df["wind_gusts"] - speed) <= df["wind_gust_limit"]
+
+    return light_hours_allow & tide_hours_allow & wind_direction_allow & wind_speed_allow & wind_gusts_allow
+
+
+def get_spots_forecast(spots, fetcher=FETCHER):
+    """hourly forecast of all spots in a single (spot, hour) frame, all api requests are made concurrently
+
+    args:
+        spots: dict of spot name to loc_data (with "lat_lon"), e.g. KITESPOTS
+    """
+    futures = {spot: submit_forecast_data(*loc_data["lat_lon"], fetcher) for spot, loc_data in spots.items()}
+
+    frames = []
+    for spot, spot_futures in futures.items():
+        df = get_hourly_forecast(*[future.result() for future in spot_futures])
+        frames.append(df.assign(spot=spot, **loc_data_columns(spots[spot])))
+    return pd.concat(frames, ignore_index=True)
+
+
+def rank_spot_windows(spots, fetcher=FETCHER, top=None):
+    """rank the good kitesurfing windows (consecutive good hours at a spot) of all spots over the week
+
+    Windows are ranked by duration then by mean wind speed.
+
+    returns:
+        pd.DataFrame, one row per window
+    """
+    df = get_spots_forecast(spots, fetcher)
+    df = df[forecast_mask(df)].sort_values(["spot", "datetime"])
+
+    # a new window starts at each change of spot or gap in the hours
+    new_window = (df["spot"] != df["spot"].shift()) | (df["datetime"].diff() != pd.Timedelta(hours=1))
+    windows = df.groupby(new_window.cumsum()).agg(
+        spot=("spot", "first"),
+        start=("datetime", "min"),
+        end=("datetime", "max"),
+        hours=("datetime", "size"),
+        wind_speed_mean=("wind_speed [kts]", "mean"),
+        wind_speed_max=("wind_speed [kts]", "max"),
+        wind_gusts_max=("wind_gusts", "max"),
+        tide_low_time=("tide_min_time", "first"),
+        tide_high_time=("tide_max_time", "first"),
+    )
+
+    windows["wind_speed_mean"] = windows["wind_speed_mean"].round(1)
+    windows = windows.sort_values(["hours", "wind_speed_mean"], ascending=False).reset_index(drop=True)
+    windows.insert(0, "rank", range(1, len(windows) + 1))
+    return windows if top is None else windows.head(top)
+
+
+def get_good_week_forecast(lat, lon, loc_data, remove_filters=False, fetcher=FETCHER):
     """filter the raw week long forecast data using location specific filtering
     """
-    df_sun_times = get_sunrise_sunset_api(lat, lon)
-    df_tide_times = get_tides_api(lat, lon)
-    df_wind_forecast = get_wind_forecast(lat, lon)
-
-    filtered_list = []
-    for date, data in df_wind_forecast.groupby("date"):
-
-        # extract stuff from data to filter
-        time = data["datetime"]
-        forecast_wind_speed = data["wind_speed [kts]"]
-        forecast_wind_direction = data["wind_direction"]
-        forecast_wind_gust = data["wind_gusts"]
-
-        # filter day time hours (light)
-        sun_date = df_sun_times[df_sun_times["date"].dt.date == date]
-        sunrise, sunset = sun_date["sunrise"].iloc[0], sun_date["sunset"].iloc[0]
-        light_hours_allow = (time >= sunrise) & (time <=sunset)
-
-        # filter tide times
-        tide_date = df_tide_times[df_tide_times["date"] == date]
-        tide_time = tide_date["tide_min_time"].iloc[0] if loc_data["tide_window"][0] == "low" else tide_date["tide_max_time"].iloc[0]
-        tide_lim_min = tide_time - pd.Timedelta(hours=loc_data["tide_window"][1])
-        tide_lim_max = tide_time + pd.Timedelta(hours=loc_data["tide_window"][1])
-        tide_hours_allow = (time >= tide_lim_min) & (time <=tide_lim_max)
-
-        # add in high and low tide times
-        data["tide_low_time"] = tide_date["tide_min_time"].iloc[0].hour
-        data["tide_high_time"] = tide_date["tide_max_time"].iloc[0].hour
-
-        # filter wind direction (note 360 degree sector and allowable directions can cross the 360 direction)
-        # e.g. loc_data["wind_direction"] = (180, 2.5)
-        if loc_data["wind_direction"][0] >= loc_data["wind_direction"][1]:
-            wind_direction_allow = (forecast_wind_direction >= loc_data["wind_direction"][0]) | (forecast_wind_direction <= loc_data["wind_direction"][1])
-        else:
-            wind_direction_allow = (forecast_wind_direction >= loc_data["wind_direction"][0]) & (forecast_wind_direction <= loc_data["wind_direction"][1])
-
-        # filter wind speeds
-        wind_speed_allow = (forecast_wind_speed >= loc_data["wind_speed"][0]) & (forecast_wind_speed <= loc_data["wind_speed"][1])
-        # filter wind gusts
-        gusting = forecast_wind_gust - forecast_wind_speed
-        wind_gusts_allow = (gusting <= loc_data["wind_gust_limit"])
-
-        ### apply all the masks
-        mask = light_hours_allow & tide_hours_allow & wind_direction_allow & wind_speed_allow & wind_gusts_allow
-
-        if remove_filters:
-            mask[:] = True
-
-        filtered_list.append(data[mask])
-
-    df = pd.concat(filtered_list, ignore_index=True)
-    df.drop(columns="date", inplace=True)
-    df["wind_arr"] = df.apply(lambda row: plot_wind_arrow(row["wind_speed [kts]"], row["wind_direction"]), axis=1)
+    df = get_hourly_forecast(*get_forecast_data(lat, lon, fetcher))
+    # location filter settings as columns, all masks are then applied column-wise (no per-day loop)
+    df = df.assign(**loc_data_columns(loc_data))
+    if not remove_filters:
+        df = df[forecast_mask(df)].reset_index(drop=True)
+
+    # add in high and low tide times (minute level, see tideapi.refine_extrema)
+    df["tide_low_time"] = df["tide_min_time"].dt.strftime("%H:%M")
+    df["tide_high_time"] = df["tide_max_time"].dt.strftime("%H:%M")
+    # inline svg glyphs looked up from the precomputed (speed, direction) atlas, rather than one figure per row
+    df["wind_arr"] = wind_arrow_glyphs(df["wind_speed [kts]"], df["wind_direction"])
 
     col_order = ["datetime", "wind_speed [kts]", "wind_direction", "wind_arr", "wind_gusts", "tide_low_time", "tide_high_time"]
     df = df[col_order]
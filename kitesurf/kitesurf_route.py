@@ -1,13 +1,19 @@
 from flask import Flask, jsonify, request, render_template, session
-from kitesurf.forecaster import get_good_week_forecast
+from kitesurf.forecaster import get_good_week_forecast, rank_spot_windows
 from kitesurf.kitespots import get_lat_lon_for_location, get_loc_data_for_location, KITESPOTS
 from kitesurf.openmap import map_plot
 from kitesurf.wind_arrow_plot import plot_wind_arrow
+from resultcache import cached
 
 # from kitesurf.whatsapp_notifier import  send_whatsapp_message
 
 app = Flask(__name__)
 
+# forecasts are cached for 10 minutes across the workers (the Open-Meteo data changes at most hourly)
+FORECAST_TTL = 600
+get_good_week_forecast = cached("kitesurf", ttl=FORECAST_TTL)(get_good_week_forecast)
+rank_spot_windows = cached("kitesurf", ttl=FORECAST_TTL)(rank_spot_windows)
+
 @app.route('/kitesurf', methods=['GET', "POST"])
 def kitesurf_route():
 
@@ -94,6 +100,28 @@ def kitesurf_route():
     )
 
 
+@app.route('/kitesurf/rank', methods=['GET'])
+def kitesurf_rank_route():
+    """rank the good windows of the week across all KITESPOTS, user settings stored in the session are used
+    e.g. /kitesurf/rank?top=10
+    """
+    top = request.args.get("top", type=int)
+
+    spots = {}
+    for loc, loc_data in KITESPOTS.items():
+        user_loc_data = session.get("user_loc_data", {}).get(loc, {})
+        spots[loc] = {**loc_data, **user_loc_data}
+
+    df = rank_spot_windows(spots, top=top)
+    for col in ["start", "end", "tide_low_time", "tide_high_time"]:
+        df[col] = df[col].dt.strftime("%Y-%m-%d %H:%M")
+
+    return jsonify({
+        "columns": list(df.columns),
+        "rows": df.to_dict(orient="records"),
+    })
+
+
 def get_defaults():
     return {
         "locations": sorted(KITESPOTS.keys()),
@@ -1,23 +1,17 @@
-import requests
 import pandas as pd
+from kitesurf.fetcher import FETCHER
 
-def get_sunrise_sunset_api(lat: float, lon: float) -> dict:
+def get_sunrise_sunset_api(lat: float, lon: float, fetcher=FETCHER) -> dict:
     """
     Returns a 7-day forecast of sunrise and sunset times for a given latitude and longitude.
-    SSL verification is disabled (verify=False) — use only for testing.
+    Fetched through the (cached) fetcher, see kitesurf/fetcher.py
     """
-    url = "https://api.open-meteo.com/v1/forecast"
-
     params = {
-        "latitude": lat,
-        "longitude": lon,
         "daily": "sunrise,sunset",
         "timezone": "Europe/London",
     }
 
-    r = requests.get(url, params=params, verify=False)
-    r.raise_for_status()
-    data = r.json()
+    data = fetcher.get_json("sun", lat, lon, params)
 
     daily = data.get("daily", {})
     sun_times =  {
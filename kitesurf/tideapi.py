@@ -1,19 +1,15 @@
-import requests
+import numpy as np
 import pandas as pd
+from kitesurf.fetcher import FETCHER
 
 
 
-def get_tides_api(lat, lon):
-    url = "https://marine-api.open-meteo.com/v1/marine"
+def get_tides_api(lat, lon, fetcher=FETCHER):
     params = {
-        "latitude": lat,
-        "longitude": lon,
         "hourly": "sea_level_height_msl",
     }
 
-    r = requests.get(url, params=params, verify=False)
-    r.raise_for_status()  # optional, will raise error if request fails
-    data = r.json()
+    data = fetcher.get_json("tide", lat, lon, params)
 
     hourly_data = data["hourly"]
     df = pd.DataFrame({
@@ -27,17 +23,58 @@ def get_tides_api(lat, lon):
     # Adjust sea level to actual water height
     df["water_level"] = df["sea_level_msl"] + local_msl
 
-    # Calculate daily min/max
-    # Function to get daily min/max and their times
-    df = df.groupby(df["time"].dt.date).apply(
-        lambda x: pd.Series({
-            "tide_min": x["water_level"].min(),
-            "tide_max": x["water_level"].max(),
-            "tide_min_time": x.loc[x["water_level"].idxmin(), "time"],
-            "tide_max_time": x.loc[x["water_level"].idxmax(), "time"]
-        })
-    ).reset_index().rename(columns={"time": "date"})
-    return df
+    return daily_tide_extrema(df)
+
+
+def refine_extrema(times, levels, idx, kind="min"):
+    """sub-hourly time and height of tide extrema, a quadratic through each sampled extremum and its two neighbours
+
+    Only sampled points that are a local extremum of the given kind are refined (e.g. a daily low at midnight that
+    is still falling is not), others and points at the ends of the series are returned as sampled.
+
+    args:
+        times: pd.Series of datetimes (evenly spaced)
+        levels: numpy array of water levels
+        idx: numpy array of positions of the sampled extrema
+        kind: "min" or "max"
+    returns:
+        (pd.Series, numpy array), refined times (to the minute) and heights
+    """
+    times = pd.Series(times).reset_index(drop=True)
+    idx = np.asarray(idx)
+    interior = (idx > 0) & (idx < len(levels) - 1)
+    i = np.where(interior, idx, 1)  # placeholder index where not interior, masked out below
+    y0, y1, y2 = levels[i - 1], levels[i], levels[i + 1]
+
+    sign = 1 if kind == "min" else -1
+    local = interior & (sign * (y0 - y1) >= 0) & (sign * (y2 - y1) >= 0)
+    curvature = y0 - 2 * y1 + y2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        offset = np.where(local & (curvature != 0), 0.5 * (y0 - y2) / curvature, 0.)  # in sample steps, [-0.5, 0.5]
+
+    step = (times.iloc[i + 1].to_numpy() - times.iloc[i - 1].to_numpy()) / 2
+    refined_times = pd.Series(times.iloc[idx].to_numpy() + offset * step).dt.round("min")
+    refined_levels = np.where(local, y1 - 0.25 * (y0 - y2) * offset, levels[idx])
+    return refined_times, refined_levels
+
+
+def daily_tide_extrema(df):
+    """daily low and high tide heights and times from the hourly water levels, all days at once
+
+    The hourly min/max of each day (one groupby pass) are refined to minute level with refine_extrema.
+    """
+    df = df.reset_index(drop=True)
+    levels = df["water_level"].to_numpy(dtype=float)
+
+    idx = df.groupby(df["time"].dt.date)["water_level"].agg(["idxmin", "idxmax"])
+    tide_min_time, tide_min = refine_extrema(df["time"], levels, idx["idxmin"].to_numpy(), kind="min")
+    tide_max_time, tide_max = refine_extrema(df["time"], levels, idx["idxmax"].to_numpy(), kind="max")
+
+    return pd.DataFrame({"date": idx.index,
+                         "tide_min": tide_min,
+                         "tide_max": tide_max,
+                         "tide_min_time": tide_min_time.to_numpy(),
+                         "tide_max_time": tide_max_time.to_numpy()})
 
 if __name__ == "__main__":
     # Open-Meteo Marine API example — free tides
@@ -3,37 +3,43 @@ import plotly.io as pio
 import numpy as np
 
 
+# meteorological-style color scale: blue → green → yellow → red → deep purple
+COLOR_STOPS = np.array([0.0, 0.25, 0.5, 0.75, 1.0])
+COLOR_STOPS_RGB = np.array([
+    (0, 0, 255),      # Blue
+    (0, 255, 0),      # Green
+    (255, 255, 0),    # Yellow
+    (255, 0, 0),      # Red
+    (106, 0, 218),    # Deep purple
+])
+
+# glyph atlas resolution, wind speed [kts] and direction [degrees] buckets
+ATLAS_SPEED_STEP = 1
+ATLAS_DIRECTION_STEP = 5
+ATLAS_MAX_SPEED = 25  # colors are clipped above this speed, so are the atlas buckets
+ARROW_SIZE = 25  # wind arrow glyph size [px]
+
+
+def wind_speeds_to_rgb(speeds, max_speed=40):
+    """rgb values (n, 3) for an array of wind speeds, linear interpolation between the color stops
+    """
+    norm = np.clip(np.asarray(speeds, dtype=float) / max_speed, 0, 1)
+    rgb = np.stack([np.interp(norm, COLOR_STOPS, COLOR_STOPS_RGB[:, i]) for i in range(3)], axis=-1)
+    return rgb.astype(int)  # truncated, as int() in the original per-speed loop
+
+
 def wind_speed_to_color(speed, max_speed=40):
     """
     Maps wind speed to a meteorological-style color scale:
     blue → green → yellow → red → deep purple
     """
-    # Normalize
-    norm = np.clip(speed / max_speed, 0, 1)
-
-    # Define color stops
-    stops = [
-        (0.0, (0, 0, 255)),      # Blue
-        (0.25, (0, 255, 0)),     # Green
-        (0.5, (255, 255, 0)),    # Yellow
-        (0.75, (255, 0, 0)),     # Red
-        (1.0, (106, 0, 218))     # Deep purple
-    ]
-
-    # Find which segment norm falls in
-    for i in range(len(stops)-1):
-        if stops[i][0] <= norm <= stops[i+1][0]:
-            t = (norm - stops[i][0]) / (stops[i+1][0] - stops[i][0])
-            r = int(stops[i][1][0] + t * (stops[i+1][1][0] - stops[i][1][0]))
-            g = int(stops[i][1][1] + t * (stops[i+1][1][1] - stops[i][1][1]))
-            b = int(stops[i][1][2] + t * (stops[i+1][1][2] - stops[i][1][2]))
-            return f"rgb({r},{g},{b})"
-
-    return f"rgb{stops[-1][1]}"
+    r, g, b = wind_speeds_to_rgb(speed, max_speed)
+    return f"rgb({r},{g},{b})"
 
 
-def plot_wind_arrow(wind_speed, wind_direction, max_speed=25, shaft_width=4, head_width=8, arrow_length_scale=0.7):
-    """Plots a filled wind arrow centered at (0,0) with meteorological color scale."""
+def wind_arrow_xy(wind_direction, shaft_width=4, head_width=8, arrow_length_scale=0.7):
+    """arrow outline (x, y) centered at (0,0) and rotated to the wind direction, plus the half width of the plot
+    """
     L = 10 * arrow_length_scale
     shaft_length = L * 0.6
     half = L / 2 + 0.5
@@ -45,18 +51,24 @@ def plot_wind_arrow(wind_speed, wind_direction, max_speed=25, shaft_width=4, hea
     x -= np.mean(x)
     y -= np.mean(y)
 
-    x_rot = (x * np.cos(theta) - y * np.sin(theta)).tolist()
-    y_rot = (x * np.sin(theta) + y * np.cos(theta)).tolist()
+    x_rot = x * np.cos(theta) - y * np.sin(theta)
+    y_rot = x * np.sin(theta) + y * np.cos(theta)
+    return x_rot, y_rot, half
+
+
+def plot_wind_arrow(wind_speed, wind_direction, max_speed=25, shaft_width=4, head_width=8, arrow_length_scale=0.7):
+    """Plots a filled wind arrow centered at (0,0) with meteorological color scale."""
+    x_rot, y_rot, half = wind_arrow_xy(wind_direction, shaft_width, head_width, arrow_length_scale)
 
     color = wind_speed_to_color(wind_speed, max_speed)
 
     fig = go.Figure(go.Scatter(
-        x=x_rot, y=y_rot,
+        x=x_rot.tolist(), y=y_rot.tolist(),
         mode='lines', fill='toself',
         fillcolor=color, line=dict(color=color, width=1),
         hoverinfo='skip', showlegend=False
     ))
-    arr_size = 25  # change the wind arrow figure size
+    arr_size = ARROW_SIZE  # change the wind arrow figure size
     fig.update_layout(
         width=arr_size, height=arr_size,
         margin=dict(l=0, r=0, t=0, b=0, pad=0),
@@ -72,6 +84,56 @@ def plot_wind_arrow(wind_speed, wind_direction, max_speed=25, shaft_width=4, hea
     return pio.to_json(fig)
 
 
+def wind_arrow_svg_path(wind_direction):
+    """svg path data of the wind arrow outline, svg y axis points down so y is flipped
+    """
+    x_rot, y_rot, _ = wind_arrow_xy(wind_direction)
+    return "M" + "L".join(f"{x:.2f},{-y:.2f}" for x, y in zip(x_rot, y_rot)) + "Z"
+
+
+def build_wind_arrow_atlas(speed_step=ATLAS_SPEED_STEP, direction_step=ATLAS_DIRECTION_STEP,
+                           max_speed=ATLAS_MAX_SPEED, size=ARROW_SIZE):
+    """inline svg wind arrow glyphs for every (speed bucket, direction bucket)
+
+    Returns:
+        numpy object array of shape (n_speeds, n_directions) of svg strings
+    """
+    _, _, half = wind_arrow_xy(0)
+    speeds = np.arange(0, max_speed + speed_step, speed_step)
+    directions = np.arange(0, 360, direction_step)
+    paths = [wind_arrow_svg_path(direction) for direction in directions]
+
+    atlas = np.empty((len(speeds), len(directions)), dtype=object)
+    for i, (r, g, b) in enumerate(wind_speeds_to_rgb(speeds, max_speed)):
+        color = f"rgb({r},{g},{b})"
+        for j, path in enumerate(paths):
+            atlas[i, j] = (f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+                           f'viewBox="{-half} {-half} {2 * half} {2 * half}">'
+                           f'<path d="{path}" fill="{color}" stroke="{color}" stroke-width="1" '
+                           f'vector-effect="non-scaling-stroke"/></svg>')
+    return atlas
+
+
+# built once per process, looked up by wind_arrow_glyphs
+WIND_ARROW_ATLAS = build_wind_arrow_atlas()
+
+
+def wind_arrow_glyphs(wind_speeds, wind_directions, atlas=WIND_ARROW_ATLAS, speed_step=ATLAS_SPEED_STEP,
+                      direction_step=ATLAS_DIRECTION_STEP):
+    """svg wind arrow glyph for each (wind speed [kts], wind direction [degrees]), looked up from the atlas.
+    Speeds are rounded to speed_step and clipped to the atlas, directions are rounded to direction_step. Missing
+    values are drawn as a calm northerly.
+
+    Returns:
+        list of svg strings
+    """
+    speeds = np.nan_to_num(np.asarray(wind_speeds, dtype=float))
+    directions = np.nan_to_num(np.asarray(wind_directions, dtype=float))
+    i = np.clip(np.round(speeds / speed_step).astype(int), 0, atlas.shape[0] - 1)
+    j = np.round(directions / direction_step).astype(int) % atlas.shape[1]
+    return atlas[i, j].tolist()
+
+
 # Example usage
 if __name__ == "__main__":
     # Low, medium, high, max
@@ -1,27 +1,18 @@
-import requests
-import certifi
-
-import requests
 import pandas as pd
+from kitesurf.fetcher import FETCHER
 
-def get_wind_forecast(lat: float, lon: float) -> dict:
+def get_wind_forecast(lat: float, lon: float, fetcher=FETCHER) -> dict:
     """
     Returns a dict with hourly wind forecast for the next 7 days
     for a given latitude and longitude.
     """
-    url = "https://api.open-meteo.com/v1/forecast"
-
     params = {
-        "latitude": lat,
-        "longitude": lon,
         "hourly": "wind_speed_10m,wind_gusts_10m,wind_direction_10m",
         "timezone": "Europe/London",
         "windspeed_unit": "kn"   # get windspeed in knots
     }
 
-    r = requests.get(url, params=params, verify=False)  # verify uses system certs or certifi
-    r.raise_for_status()
-    data = r.json()
+    data = fetcher.get_json("wind", lat, lon, params)
     # print(data.get("hourly_units"))  # ADD THIS
     hourly = data.get("hourly", {})
 
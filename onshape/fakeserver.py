@@ -0,0 +1,158 @@
+"""Local fake Onshape server for the GLB cache and viewer routes.
+
+Serves the two endpoints GLBCache calls, currentmicroversion and the part
+studio gltf export (with its configuration query parameter), and records
+every export request so that caching and coalescing can be checked without
+Onshape credentials or network access.
+
+Run it, then point the app at it:
+
+    python -m onshape.fakeserver --port 8765 --delay 1
+    ONSHAPE_BASE_URL=http://127.0.0.1:8765 ONSHAPE_ACCESS_KEY=x ONSHAPE_SECRET_KEY=x python app.py
+
+or start it in process with FakeOnshapeServer(port=0).start().
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import struct
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+MICROVERSION_PATH = re.compile(r"^/api/documents/d/(\w+)/w/(\w+)/currentmicroversion$")
+GLTF_PATH = re.compile(r"^/api/partstudios/d/(\w+)/w/(\w+)/e/(\w+)/gltf$")
+
+
+def fake_glb(extras):
+    """Minimal valid GLB (empty scene, no buffers) with extras in its asset."""
+
+    gltf = {"asset": {"version": "2.0", "generator": "onshape.fakeserver", "extras": extras},
+            "scene": 0, "scenes": [{"nodes": []}]}
+    json_chunk = json.dumps(gltf).encode()
+    json_chunk += b" " * (-len(json_chunk) % 4)
+    return (struct.pack("<4sII", b"glTF", 2, 12 + 8 + len(json_chunk)) +
+            struct.pack("<I4s", len(json_chunk), b"JSON") + json_chunk)
+
+
+class FakeOnshapeServer:
+    """Threaded fake Onshape server.
+
+    Args:
+        host, port: address to listen on, port 0 picks a free port
+        delay: time [s] each export takes, to overlap concurrent requests
+        microversion: workspace microversion returned for every document
+
+    Attributes:
+        export_counts: Counter of (eid, configuration) of the exports sent with a body
+        not_modified_counts: Counter of (eid, configuration) answered 304
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, delay=0., microversion="mv1"):
+
+        self.delay = delay
+        self.microversion = microversion
+        self.export_counts = Counter()
+        self.not_modified_counts = Counter()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve in a daemon thread, returns the base url."""
+
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def serve_forever(self):
+
+        self._httpd.serve_forever()
+
+    def stop(self):
+
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def etag(self, eid, configuration):
+
+        key = f"{eid}|{configuration}|{self.microversion}"
+        return '"' + hashlib.sha1(key.encode()).hexdigest()[:16] + '"'
+
+    def _handler(self):
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+
+                url = urlparse(self.path)
+
+                if MICROVERSION_PATH.match(url.path):
+                    return self._send(200, json.dumps({"microversion": server.microversion}).encode(),
+                                      "application/json")
+
+                match = GLTF_PATH.match(url.path)
+                if match is None:
+                    return self._send(404, b"not found", "text/plain")
+
+                eid = match.group(3)
+                configuration = parse_qs(url.query).get("configuration", [None])[0]
+                etag = server.etag(eid, configuration)
+                key = (eid, configuration)
+
+                time.sleep(server.delay)
+
+                if self.headers.get("If-None-Match") == etag:
+                    with server._lock:
+                        server.not_modified_counts[key] += 1
+                    return self._send(304, b"", None, etag)
+
+                with server._lock:
+                    server.export_counts[key] += 1
+                body = fake_glb({"eid": eid, "configuration": configuration,
+                                 "microversion": server.microversion})
+                return self._send(200, body, "model/gltf-binary", etag)
+
+            def _send(self, status, body, content_type, etag=None):
+
+                self.send_response(status)
+                if content_type:
+                    self.send_header("Content-Type", content_type)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Local fake Onshape server for the GLB cache")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0., help="time [s] each export takes")
+    args = parser.parse_args()
+
+    fake = FakeOnshapeServer(args.host, args.port, args.delay)
+    print(f"fake Onshape server on {fake.base_url}")
+    try:
+        fake.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
@@ -0,0 +1,319 @@
+"""On-disk cache for Onshape glTF (GLB) exports.
+
+Entries are keyed by did/wid/eid and the workspace microversion, so an
+unchanged model is served from disk without calling the export. When the
+microversion changes (or can not be read) the export is revalidated with
+If-None-Match against the last ETag stored for the element.
+
+Configured exports (Onshape configuration parameters, e.g. from the viewer
+sliders) are separate elements, keyed by a hash of the configuration string.
+Concurrent requests for the same element and configuration share a single
+upstream export.
+
+Locally generated models (e.g. the tessellated jacket) share the same
+directory and size limit, keyed by a hash of the model (see get_local).
+
+Eviction removes the least recently used .glb files with their .json
+metadata, files used within the last evict_grace seconds are kept (they
+may still be being sent to a viewer).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import requests
+
+CHUNK_SIZE = 64 * 1024
+
+
+class OnshapeError(Exception):
+    """Upstream Onshape request failed."""
+
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+class GLBCache:
+    """GLB export cache with size-based (least recently used) eviction.
+
+    Args:
+        cache_dir: directory for the .glb files and their .json metadata
+        base_url: Onshape base url, e.g. https://cad.onshape.com or a stub server
+        auth: (access_key, secret_key)
+        max_bytes: total size of cached .glb files kept on disk
+        session: requests.Session, a pooled session is created if None
+        timeout: upstream request timeout [s]
+        microversion_ttl: time [s] a workspace microversion is reused before asking Onshape again
+        evict_grace: time [s] since a .glb file was last used before it can be evicted
+    """
+
+    def __init__(self, cache_dir, base_url, auth, max_bytes=500 * 1024 ** 2, session=None, timeout=60,
+                 microversion_ttl=30, evict_grace=60):
+
+        self.cache_dir = cache_dir
+        self.base_url = base_url.rstrip("/")
+        self.auth = auth
+        self.max_bytes = max_bytes
+        self.session = requests.Session() if session is None else session
+        self.timeout = timeout
+        self.microversion_ttl = microversion_ttl
+        self.evict_grace = evict_grace
+        self._microversions = {}  # (did, wid): (time read, microversion)
+
+        # single-flight, one lock per element so concurrent viewers share one upstream fetch
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Public
+    # ------------------------------------------------------------------
+
+    def get(self, did, wid, eid, configuration=None):
+        """Path and ETag of the cached GLB for the element, fetched or revalidated upstream if required.
+
+        Args:
+            configuration: Onshape configuration string e.g. "leg_offset=12000 mm;strut_angle=47 deg", None for the
+                part studio as saved
+
+        Returns:
+            (str, str), path to the .glb file and its ETag (None if Onshape did not send one)
+        """
+        element = f"{did}_{wid}_{eid}"
+        if configuration:
+            element += "_" + hashlib.sha1(configuration.encode()).hexdigest()[:12]
+
+        with self._element_lock(element):
+
+            microversion = self._current_microversion(did, wid)
+
+            if microversion is not None:
+                meta = self._read_meta(f"{element}_{microversion}")
+                path = None if meta is None else self._touch(meta)
+                if path is not None:
+                    return path, meta["etag"]
+
+            return self._fetch(did, wid, eid, element, microversion, configuration)
+
+    def get_local(self, key, write_glb):
+        """Path of the cached GLB of a locally generated model, written by write_glb(f) if not cached.
+
+        Args:
+            key: str, unique for the model geometry e.g. a hash of its input parameters
+            write_glb: callable writing the GLB to a binary file object, only called on a miss
+
+        Returns:
+            str, path to the .glb file (the file name is unique per key, so can be used as an ETag)
+        """
+        name = f"local_{key}.glb"
+        path = os.path.join(self.cache_dir, name)
+
+        with self._element_lock(name):
+
+            if self._touch({"file": name}) is not None:
+                return path
+
+            self._write_file(path, write_glb)
+            self._evict(keep=path)
+
+        return path
+
+    def size(self):
+        """Total size [bytes] of the cached .glb files."""
+
+        return sum(os.path.getsize(path) for path in self._glb_paths())
+
+    # ------------------------------------------------------------------
+    # Upstream
+    # ------------------------------------------------------------------
+
+    def _current_microversion(self, did, wid):
+
+        read_time, microversion = self._microversions.get((did, wid), (None, None))
+        if read_time is not None and time.monotonic() - read_time < self.microversion_ttl:
+            return microversion
+
+        url = f"{self.base_url}/api/documents/d/{did}/w/{wid}/currentmicroversion"
+
+        try:
+            response = self.session.get(url, auth=self.auth, timeout=self.timeout)
+        except requests.RequestException:
+            return None
+
+        if response.status_code != 200:
+            return None
+
+        microversion = response.json().get("microversion")
+        self._microversions[(did, wid)] = (time.monotonic(), microversion)
+        return microversion
+
+    def _fetch(self, did, wid, eid, element, microversion, configuration=None, revalidate=True):
+
+        url = f"{self.base_url}/api/partstudios/d/{did}/w/{wid}/e/{eid}/gltf"
+        headers = {"Accept": "model/gltf-binary"}
+        params = {"configuration": configuration} if configuration else None
+
+        # last known export of this element, possibly at an older microversion
+        latest = self._read_meta(f"{element}_latest") if revalidate else None
+        if latest is not None and latest.get("etag"):
+            headers["If-None-Match"] = latest["etag"]
+
+        try:
+            with self.session.get(url, auth=self.auth, headers=headers, params=params, timeout=self.timeout,
+                                  stream=True) as response:
+
+                if response.status_code == 304 and latest is not None:
+                    meta = latest
+                elif response.status_code == 200:
+                    meta = self._write_glb(response, element, microversion)
+                else:
+                    raise OnshapeError(response.status_code, response.text[:500])
+
+        except requests.RequestException as e:
+            # connection errors and timeouts, including while streaming the body
+            raise OnshapeError(502, f"Onshape export failed: {e}") from e
+
+        # the same payload is valid at this microversion
+        if microversion is not None:
+            self._write_meta(f"{element}_{microversion}", meta)
+        self._write_meta(f"{element}_latest", meta)
+
+        path = self._touch(meta)
+        if path is None:
+            # evicted by another worker since it was revalidated, export it again
+            if not revalidate:
+                raise OnshapeError(503, "Cached export was evicted, retry")
+            return self._fetch(did, wid, eid, element, microversion, configuration, revalidate=False)
+
+        return path, meta["etag"]
+
+    # ------------------------------------------------------------------
+    # Disk
+    # ------------------------------------------------------------------
+
+    def _write_glb(self, response, element, microversion):
+        """Stream the response body to disk."""
+
+        etag = response.headers.get("ETag")
+        version = microversion or hashlib.sha1((etag or "").encode()).hexdigest()[:16]
+        name = f"{element}_{version}.glb"
+        path = os.path.join(self.cache_dir, name)
+
+        def write(f):
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+
+        self._write_file(path, write)
+        self._evict(keep=path)
+
+        return {"file": name, "etag": etag}
+
+    def _write_file(self, path, write):
+        """Write to a temporary file, then move into place so readers never see a partial file."""
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def _evict(self, keep=None):
+        """Remove least recently used .glb files until the cache fits within
+        max_bytes, keeping those used within evict_grace, then the metadata
+        of the removed files."""
+
+        stats = []
+        for path in self._glb_paths():
+            try:
+                stats.append((path, os.stat(path)))
+            except FileNotFoundError:  # evicted by another worker
+                pass
+
+        stats.sort(key=lambda item: item[1].st_mtime)
+        total = sum(stat.st_size for _, stat in stats)
+        recent = time.time() - self.evict_grace
+        removed = False
+
+        for path, stat in stats:
+            if total <= self.max_bytes:
+                break
+            if path == keep or stat.st_mtime > recent:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError:  # open on windows, kept
+                continue
+            total -= stat.st_size
+            removed = True
+
+        if removed:
+            self._remove_orphan_meta()
+
+    def _remove_orphan_meta(self):
+        """Remove the .json metadata of .glb files that no longer exist."""
+
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                with open(path) as f:
+                    glb_name = json.load(f)["file"]
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            if not os.path.exists(os.path.join(self.cache_dir, glb_name)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _touch(self, meta):
+        """Path of the cached file with its mtime (the recently used time
+        for eviction) updated, None if it has been evicted."""
+
+        path = os.path.join(self.cache_dir, meta["file"])
+        try:
+            os.utime(path)
+        except FileNotFoundError:  # evicted by another worker
+            return None
+        return path
+
+    def _read_meta(self, key):
+        """Metadata for the key, None if missing or if its .glb has been evicted."""
+
+        try:
+            with open(os.path.join(self.cache_dir, f"{key}.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not os.path.exists(os.path.join(self.cache_dir, meta["file"])):
+            return None
+
+        return meta
+
+    def _write_meta(self, key, meta):
+
+        # a temporary file of its own, workers may write the same key at once
+        self._write_file(os.path.join(self.cache_dir, f"{key}.json"), lambda f: f.write(json.dumps(meta).encode()))
+
+    def _glb_paths(self):
+
+        return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith(".glb")]
+
+    def _element_lock(self, element):
+
+        with self._locks_lock:
+            return self._locks.setdefault(element, threading.Lock())
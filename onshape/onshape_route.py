@@ -1,17 +1,22 @@
 """Onshape live model viewer route."""
 
-import io
+import math
 import os
-
-import requests
+import tempfile
 
 from flask import (
     abort,
     render_template,
     request,
     send_file,
+    session,
+    url_for,
 )
 
+from jktdesign.jktsections import session_space_frame
+from jktdesign.tessellate import jacket_glb, model_hash
+from onshape.glbcache import GLBCache, OnshapeError
+
 BASE = os.environ.get(
     "ONSHAPE_BASE_URL",
     "https://cad.onshape.com"
@@ -22,6 +27,20 @@ AUTH = (
     os.environ.get("ONSHAPE_SECRET_KEY"),
 )
 
+# ------------------------------------------------------------------
+# GLB export cache (shared by all viewers of this process)
+# ------------------------------------------------------------------
+
+GLB_CACHE = GLBCache(
+    cache_dir=os.environ.get(
+        "ONSHAPE_CACHE_DIR",
+        os.path.join(tempfile.gettempdir(), "onshape_glb"),
+    ),
+    base_url=BASE,
+    auth=AUTH,
+    max_bytes=int(os.environ.get("ONSHAPE_CACHE_MAX_MB", 500)) * 1024 ** 2,
+)
+
 # ------------------------------------------------------------------
 # Supported CAD models
 # ------------------------------------------------------------------
@@ -32,6 +51,8 @@ MODELS = {
         "did": "9afde97a2e476db5271e9ff1",
         "wid": "d0f1b93bd2a196643bf1b7f7",
         "eid": "6f8a1698d3b92ecdf31ce063",
+        # configuration parameters of the part studio (see CONFIGURATION)
+        "configuration": ["leg_offset", "strut_angle"],
     },
 
     "box1": {
@@ -48,6 +69,14 @@ MODELS = {
     },
 }
 
+# models tessellated locally (no Onshape round trip), endpoint of each
+LOCAL_MODELS = {
+    "jacket": {
+        "name": "JACKET (from Architect page)",
+        "endpoint": "onshape.jacket_model_glb",
+    },
+}
+
 # ------------------------------------------------------------------
 # Default slider values
 # ------------------------------------------------------------------
@@ -71,19 +100,86 @@ LIMITS = {
     },
 }
 
+# slider label and Onshape unit of each configuration parameter
+CONFIGURATION = {
+    "leg_offset": {
+        "label": "Leg offset (mm)",
+        "unit": "mm",
+    },
+
+    "strut_angle": {
+        "label": "Strut angle (°)",
+        "unit": "deg",
+    },
+}
+
+
+# ------------------------------------------------------------------
+# Configuration parameters
+# ------------------------------------------------------------------
+
+def quantise_configuration(args):
+    """Configuration parameters from the query args, snapped to the
+    slider step and clipped to LIMITS (DEFAULTS if missing or not a
+    number), so that nearby slider values share one cached export."""
+
+    params = {}
+
+    for name, limits in LIMITS.items():
+
+        try:
+            value = float(args.get(name, DEFAULTS[name]))
+        except (TypeError, ValueError):
+            value = DEFAULTS[name]
+
+        if not math.isfinite(value):
+            value = DEFAULTS[name]
+
+        n_steps = round((value - limits["min"]) / limits["step"])
+        value = limits["min"] + n_steps * limits["step"]
+
+        # rounded, as the step may not be exact in binary
+        params[name] = round(
+            min(max(value, limits["min"]), limits["max"]),
+            6
+        )
+
+    return params
+
+
+def configuration_string(model, params):
+    """Onshape configuration of the model, e.g.
+    "leg_offset=12000 mm;strut_angle=47 deg". None if the model has no
+    configuration parameters."""
+
+    names = model.get("configuration")
+
+    if not names:
+        return None
+
+    return ";".join(
+        f"{name}={params[name]:g} {CONFIGURATION[name]['unit']}"
+        for name in names
+    )
+
 
 # ------------------------------------------------------------------
 # Main page
 # ------------------------------------------------------------------
 
 def onshape_route():
-    """GET /cad_tp_type1"""
+    """GET /cad_tp"""
 
     return render_template(
         "onshape/onshape.html",
         defaults=DEFAULTS,
         limits=LIMITS,
+        configuration=CONFIGURATION,
         models=MODELS,
+        local_models={
+            key: {"name": model["name"], "url": url_for(model["endpoint"])}
+            for key, model in LOCAL_MODELS.items()
+        },
         default_model="strut",
     )
 
@@ -93,7 +189,12 @@ def onshape_route():
 # ------------------------------------------------------------------
 
 def onshape_model_glb():
-    """GET /cad_tp_type1/model.glb?model=strut"""
+    """GET /cad_tp/model.glb?model=strut&leg_offset=12000&strut_angle=47
+
+    Configuration parameters are quantised to the slider steps and only
+    sent to Onshape for models that have them. Each configuration is
+    cached as its own export.
+    """
 
     model_name = request.args.get(
         "model",
@@ -117,32 +218,88 @@ def onshape_model_glb():
             "Onshape credentials not configured."
         )
 
-    url = (
-        f"{BASE}"
-        f"/api/partstudios"
-        f"/d/{model['did']}"
-        f"/w/{model['wid']}"
-        f"/e/{model['eid']}"
-        f"/gltf"
+    configuration = configuration_string(
+        model,
+        quantise_configuration(request.args),
     )
 
-    response = requests.get(
-        url,
-        auth=AUTH,
-        headers={
-            "Accept": "model/gltf-binary"
-        },
-        timeout=60,
+    try:
+        path, _ = GLB_CACHE.get(
+            model["did"],
+            model["wid"],
+            model["eid"],
+            configuration=configuration,
+        )
+    except OnshapeError as e:
+        abort(
+            e.status_code,
+            e.message
+        )
+
+    # streamed from disk, browsers revalidate with If-None-Match. The cache
+    # file name is unique per export version so is used as the ETag (the
+    # file mtime changes on every cache hit)
+    return send_file(
+        path,
+        mimetype="model/gltf-binary",
+        download_name=f"{model_name}.glb",
+        etag=os.path.basename(path),
+        conditional=True,
+        max_age=0,
+    )
+
+
+# ------------------------------------------------------------------
+# Local jacket GLB endpoint
+# ------------------------------------------------------------------
+
+def jacket_model_glb():
+    """GET /cad_tp/jacket.glb?n_legs=4
+
+    The session jacket (Architect page, with the Sections page sizes if
+    submitted) tessellated locally. Cached on disk by a hash of the session
+    inputs, so an unchanged model is served without rebuilding it.
+    """
+
+    jkt_json = session.get("jkt_json")
+
+    if not jkt_json:
+        abort(
+            404,
+            "First create your model on the Architect page."
+        )
+
+    n_legs = request.args.get(
+        "n_legs",
+        4,
+        type=int
     )
 
-    if response.status_code != 200:
+    key = model_hash({
+        "jkt_json": jkt_json,
+        "sections": session.get("jktsections_form_data"),
+        "n_legs": n_legs,
+    })
+
+    def write_glb(f):
+        f.write(jacket_glb(session_space_frame(n_legs=n_legs)))
+
+    try:
+        path = GLB_CACHE.get_local(
+            f"jacket_{key}",
+            write_glb,
+        )
+    except Exception as e:
         abort(
-            response.status_code,
-            response.text[:500]
+            400,
+            f"Jacket model could not be built: {e}"
         )
 
     return send_file(
-        io.BytesIO(response.content),
+        path,
         mimetype="model/gltf-binary",
-        download_name=f"{model_name}.glb",
-    )
\ No newline at end of file
+        download_name="jacket.glb",
+        etag=os.path.basename(path),
+        conditional=True,
+        max_age=0,
+    )
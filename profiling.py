@@ -0,0 +1,209 @@
+"""request timing of the calculator routes: per route latency histograms and a Prometheus /metrics page
+
+init_profiling(app) times every request (labelled by endpoint and method) and, within it, the spans: parsing the
+request body, template rendering, JSON serialisation and the engine calls decorated with timing.timed() (e.g.
+KTJointSCFManager.get_joint_scfs, create_joint_plots, gc_processor). The spans of a request are sent back in its
+Server-Timing header (shown by the browser dev tools), all of them are accumulated in histograms. The timers are in
+timing, which has no dependencies, so that the engines don't import Flask.
+
+GET /metrics gives the histograms, request counts, result cache lookups (see resultcache) and the worker RSS in the
+Prometheus text format. The metrics are those of the worker that answers, scrape each worker (or run one) for totals.
+
+Set PROFILE_SLOW_MS to run each request under cProfile and keep the profile of any request slower than that, in
+PROFILE_DIR (the newest PROFILE_KEEP files are kept). GET /admin/profiles lists them, ?file= gives the top functions.
+"""
+import cProfile
+import io
+import os
+import pstats
+import tempfile
+import threading
+import time
+from collections import deque
+
+from flask import Response, abort, before_render_template, current_app, g, has_request_context, jsonify, request, \
+    template_rendered
+from flask.json.provider import DefaultJSONProvider
+# local imports
+from timing import METRICS_PREFIX, SPAN_LISTENERS, SPAN_SECONDS, Histogram, _labels, record_span, span
+
+PROFILE_SLOW_MS = float(os.environ.get("PROFILE_SLOW_MS", 0)) or None
+PROFILE_DIR = os.environ.get("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "oswdesigntools_profiles")
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", 50))
+
+
+class Counter:
+    """Prometheus counter, one series per tuple of label values
+    """
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values, value=1):
+        with self._lock:
+            self._series[label_values] = self._series.get(label_values, 0) + value
+
+    def exposition(self):
+        with self._lock:
+            series = sorted(self._series.items())
+        return ([f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"] +
+                [f"{self.name}{_labels(self.label_names, labels)} {value}" for labels, value in series])
+
+
+REQUEST_SECONDS = Histogram(f"{METRICS_PREFIX}_request_duration_seconds", "Request latency by route",
+                            ("endpoint", "method"))
+REQUESTS = Counter(f"{METRICS_PREFIX}_requests_total", "Requests by route and status code",
+                   ("endpoint", "method", "status"))
+SLOW_PROFILES = deque(maxlen=PROFILE_KEEP)  # dicts of the profiles captured by this worker, newest last
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# request spans
+# ----------------------------------------------------------------------------------------------------------------------
+def _request_span(name, seconds):
+    """SPAN_LISTENERS entry collecting the spans of the current request for its Server-Timing header
+    """
+    if has_request_context():
+        spans = g.setdefault("_spans", {})
+        spans[name] = spans.get(name, 0.) + seconds
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """flask json provider timing jsonify (serialisation of the response) as the "jsonify" span
+    """
+    def response(self, *args, **kwargs):
+        with span("jsonify"):
+            return super().response(*args, **kwargs)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# middleware
+# ----------------------------------------------------------------------------------------------------------------------
+def _start_request():
+    g._t0 = time.perf_counter()
+    g._profiler = None
+    if PROFILE_SLOW_MS is not None:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            g._profiler = profiler
+        except ValueError:  # another profiler is active (python 3.12+ allows one per process)
+            pass
+    # parse the body here so that it is timed, the view gets the cached form or json
+    if request.content_length:
+        with span("parse_request"):
+            if request.is_json:
+                request.get_json(silent=True)
+            else:
+                request.form
+
+
+def _finish_request(response):
+    t0 = g.pop("_t0", None)
+    if t0 is None:
+        return response
+    elapsed = time.perf_counter() - t0
+    profiler = g.pop("_profiler", None)
+    if profiler is not None:
+        profiler.disable()
+
+    endpoint = request.endpoint or "unmatched"
+    REQUEST_SECONDS.observe((endpoint, request.method), elapsed)
+    REQUESTS.inc((endpoint, request.method, str(response.status_code)))
+
+    timings = [f"{name};dur={1e3 * seconds:.1f}" for name, seconds in g.get("_spans", {}).items()]
+    response.headers["Server-Timing"] = ", ".join(timings + [f"total;dur={1e3 * elapsed:.1f}"])
+
+    if profiler is not None and 1e3 * elapsed >= PROFILE_SLOW_MS:
+        save_profile(profiler, endpoint, request.method, elapsed)
+    return response
+
+
+def _start_render(sender, template, context, **extra):
+    g._render_t0 = time.perf_counter()
+
+
+def _finish_render(sender, template, context, **extra):
+    t0 = g.pop("_render_t0", None)
+    if t0 is not None:
+        record_span("render_template", time.perf_counter() - t0)
+
+
+def save_profile(profiler, endpoint, method, elapsed):
+    """write the cProfile stats of a slow request to PROFILE_DIR, keeping the newest PROFILE_KEEP files
+    """
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    ms = round(1e3 * elapsed)
+    file_name = f"{time.strftime('%Y%m%dT%H%M%S')}_{os.getpid()}_{endpoint}_{method}_{ms}ms.prof"
+    profiler.dump_stats(os.path.join(PROFILE_DIR, file_name))
+    SLOW_PROFILES.append({"file": file_name, "endpoint": endpoint, "method": method, "ms": ms, "time": time.time()})
+    current_app.logger.warning("slow request %s %s %d ms, profile %s", method, endpoint, ms, file_name)
+
+    profiles = sorted((entry for entry in os.scandir(PROFILE_DIR) if entry.name.endswith(".prof")),
+                      key=lambda entry: entry.stat().st_mtime)
+    for entry in profiles[:-PROFILE_KEEP]:
+        try:
+            os.remove(entry.path)
+        except OSError:  # removed by another worker
+            pass
+
+
+def init_profiling(app):
+    """time the requests of the app and register the /metrics endpoint
+    """
+    if _request_span not in SPAN_LISTENERS:
+        SPAN_LISTENERS.append(_request_span)
+    app.json = TimedJSONProvider(app)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    before_render_template.connect(_start_render, app)
+    template_rendered.connect(_finish_render, app)
+    app.add_url_rule("/metrics", "metrics", metrics_route, methods=["GET"])
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# endpoints
+# ----------------------------------------------------------------------------------------------------------------------
+def metrics_text():
+    """the metrics of this worker in the Prometheus text format
+    """
+    from blueprints import rss_mb
+    from resultcache import cache_stats
+
+    lines = REQUEST_SECONDS.exposition() + REQUESTS.exposition() + SPAN_SECONDS.exposition()
+
+    name = f"{METRICS_PREFIX}_result_cache_lookups_total"
+    lines += [f"# HELP {name} Result cache lookups by cache and outcome", f"# TYPE {name} counter"]
+    for cache, stats in cache_stats()["caches"].items():
+        for outcome in ["local_hits", "shared_hits", "misses"]:
+            lines.append(f"{name}{_labels(('cache', 'outcome'), (cache, outcome))} {stats[outcome]}")
+
+    rss = rss_mb()
+    if rss is not None:
+        name = "process_resident_memory_bytes"
+        lines += [f"# HELP {name} Resident memory size in bytes", f"# TYPE {name} gauge",
+                  f"{name} {round(rss * 1024 ** 2)}"]
+    return "\n".join(lines) + "\n"
+
+
+def metrics_route():
+    return Response(metrics_text(), mimetype="text/plain; version=0.0.4")
+
+
+def profiles_route():
+    """slow request profiles of this worker, or with ?file= the top functions of a profile (by cumulative time)
+    """
+    file_name = request.args.get("file")
+    if file_name is None:
+        return jsonify({"pid": os.getpid(), "profile_slow_ms": PROFILE_SLOW_MS, "profile_dir": PROFILE_DIR,
+                        "profiles": list(SLOW_PROFILES)})
+
+    path = os.path.join(PROFILE_DIR, os.path.basename(file_name))
+    if not file_name.endswith(".prof") or not os.path.isfile(path):
+        abort(404)
+    out = io.StringIO()
+    pstats.Stats(path, stream=out).sort_stats("cumulative").print_stats(request.args.get("top", 40, type=int))
+    return Response(out.getvalue(), mimetype="text/plain")
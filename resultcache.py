@@ -0,0 +1,339 @@
+"""result cache of the calculation routes, an in-process LRU per cache and an optional SQLite file shared by workers
+
+Each gunicorn worker would otherwise recompute every SCF, RRF, cone, GC, flange and forecast result it is asked for.
+Functions decorated with cached(name) look up their result (keyed on a hash of the code version, the function and its
+arguments) in the LRU of the named cache, then in the shared SQLite file, and only then call the function. Results are
+stored pickled, so every hit is a fresh copy that a route is free to modify. The code version is a hash of the app
+source, so a deploy of changed code does not read the results of the old code from a persistent RESULT_CACHE_DB.
+
+    @cached("rrf")
+    def get_jt_RRFs_data(jt_type, beta, gamma, tau, theta, zeta, x_axis_vary):
+
+Configured from the environment:
+    RESULT_CACHE_DB: path of the SQLite file shared by the workers, unset (the default) for in-process caches only
+    RESULT_CACHE_TTL: default time to live of an entry [s]
+    RESULT_CACHE_MAX_ENTRIES: size of the LRU of each named cache (per worker)
+    RESULT_CACHE_MAX_MB: size limit of each LRU and of the SQLite file [MB], least recently used entries are evicted
+    RESULT_CACHE_VERSION: code version of the keys, by default a hash of the .py files of the app
+
+The RESULT_CACHE_DB file is unpickled, so it must only be writable by the app. The hit rates of every cache in the
+worker that answers are reported by GET /admin/cache, POST /admin/cache/clear empties them (?name= for one cache).
+Both are admin endpoints, off unless ADMIN_TOKEN is set (see blueprints.admin_guard).
+"""
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask import jsonify, request
+
+DEFAULT_TTL = float(os.environ.get("RESULT_CACHE_TTL", 24 * 3600))
+MAX_ENTRIES = int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", 256))
+MAX_BYTES = int(float(os.environ.get("RESULT_CACHE_MAX_MB", 64)) * 1024 ** 2)
+DB_PATH = os.environ.get("RESULT_CACHE_DB") or None
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@functools.cache
+def code_version(directory=APP_DIR):
+    """RESULT_CACHE_VERSION, or a hash of the .py files of the app (tests and hidden directories excluded) that
+    every worker of a deploy computes the same
+    """
+    version = os.environ.get("RESULT_CACHE_VERSION")
+    if version:
+        return version
+    digest = hashlib.sha1()
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if not d.startswith((".", "__")) and d not in ("tests", "venv"))
+        for file_name in sorted(files):
+            if file_name.endswith(".py"):
+                path = os.path.join(root, file_name)
+                digest.update(os.path.relpath(path, directory).encode())
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class LRUBackend:
+    """in-process store of pickled values, limited to max_entries and max_bytes (least recently used evicted first)
+    """
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key: (expiry time, pickled value)
+        self._lock = threading.Lock()
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, expiry):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (expiry, value)
+            self.nbytes += len(value)
+            while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def clear(self, prefix=""):
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                self._pop(key)
+
+    def _pop(self, key):
+        self.nbytes -= len(self._entries.pop(key)[1])
+
+
+class SQLiteBackend:
+    """store of pickled values in a SQLite file, shared by every process that opens the same path
+
+    WAL journal so that readers do not block the writer, one connection per thread. Once the values exceed max_bytes
+    the least recently read entries are deleted. Any sqlite3.Error is counted in errors and treated as a miss, the
+    cache must not break a route.
+    """
+    def __init__(self, path, max_bytes=MAX_BYTES, timeout=5.):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.errors = 0
+        self._local = threading.local()
+        self._connect()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                         "expiry REAL NOT NULL, accessed REAL NOT NULL, size INTEGER NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        try:
+            conn = self._connect()
+            now = time.time()
+            row = conn.execute("SELECT value, expiry FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+            return row[0]
+        except sqlite3.Error:
+            self.errors += 1
+            return None
+
+    def set(self, key, value, expiry):
+        if len(value) > self.max_bytes:
+            return
+        try:
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                         (key, value, expiry, time.time(), len(value)))
+            self._evict(conn)
+        except sqlite3.Error:
+            self.errors += 1
+
+    def _evict(self, conn):
+        conn.execute("DELETE FROM results WHERE expiry <= ?", (time.time(),))
+        excess = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        # least recently read entries until their sizes cover the excess
+        keys = []
+        for key, size in conn.execute("SELECT key, size FROM results ORDER BY accessed"):
+            keys.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM results WHERE key = ?", keys)
+
+    def clear(self, prefix=""):
+        try:
+            self._connect().execute("DELETE FROM results WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+        except sqlite3.Error:
+            self.errors += 1
+
+    def stats(self):
+        try:
+            n, nbytes = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        except sqlite3.Error:
+            self.errors += 1
+            n, nbytes = None, None
+        return {"path": self.path, "entries": n, "mb": None if nbytes is None else round(nbytes / 1024 ** 2, 3),
+                "max_mb": round(self.max_bytes / 1024 ** 2, 3), "errors": self.errors}
+
+
+class ResultCache:
+    """named cache, looked up in its LRU and then in the shared backend (if any). A shared hit is copied to the LRU
+
+    Args:
+        name: prefix of the keys, e.g. "scf"
+        ttl: time to live of an entry [s]
+        local: LRUBackend of this cache
+        shared: SQLiteBackend shared by the caches (and workers), or None
+        version: code version salted into the keys, code_version() if None
+    """
+    def __init__(self, name, ttl=DEFAULT_TTL, local=None, shared=None, version=None):
+        self.name = name
+        self.ttl = ttl
+        self.local = local if local is not None else LRUBackend()
+        self.shared = shared
+        self.version = code_version() if version is None else version
+        self._lock = threading.Lock()
+        self.local_hits, self.shared_hits, self.misses, self.errors = 0, 0, 0, 0
+
+    def key(self, func, args, kwargs):
+        """key of the call func(*args, **kwargs) with this code version, None where the arguments can't be pickled
+        """
+        try:
+            data = pickle.dumps((self.version, func.__module__, func.__qualname__, args, sorted(kwargs.items())),
+                                protocol=4)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return None
+        return f"{self.name}:{hashlib.sha1(data).hexdigest()}"
+
+    def get(self, key):
+        """pickled value of key, or None
+        """
+        value = self.local.get(key)
+        if value is not None:
+            self._count("local_hits")
+            return value
+        if self.shared is not None:
+            entry = self.shared.get(key)
+            if entry is not None:
+                self._count("shared_hits")
+                # the shared expiry is not read back, the local copy lives for at most another ttl
+                self.local.set(key, entry, time.time() + self.ttl)
+                return entry
+        self._count("misses")
+        return None
+
+    def set(self, key, value):
+        expiry = time.time() + self.ttl
+        self.local.set(key, value, expiry)
+        if self.shared is not None:
+            self.shared.set(key, value, expiry)
+
+    def call(self, func, args, kwargs):
+        """cached result of func(*args, **kwargs), exceptions are raised and not cached
+        """
+        key = self.key(func, args, kwargs)
+        if key is None:
+            self._count("errors")
+            return func(*args, **kwargs)
+        value = self.get(key)
+        if value is not None:
+            return pickle.loads(value)
+        result = func(*args, **kwargs)
+        try:
+            self.set(key, pickle.dumps(result, protocol=4))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            self._count("errors")
+        return result
+
+    def clear(self):
+        self.local.clear(f"{self.name}:")
+        if self.shared is not None:
+            self.shared.clear(f"{self.name}:")
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self):
+        with self._lock:
+            local_hits, shared_hits, misses, errors = self.local_hits, self.shared_hits, self.misses, self.errors
+        lookups = local_hits + shared_hits + misses
+        return {"ttl_s": self.ttl, "local_hits": local_hits, "shared_hits": shared_hits, "misses": misses,
+                "errors": errors, "hit_rate": round((local_hits + shared_hits) / lookups, 4) if lookups else None,
+                "entries": len(self.local), "mb": round(self.local.nbytes / 1024 ** 2, 3)}
+
+
+# name: ResultCache, the shared backend is opened with the first cache
+CACHES = {}
+_SHARED = {"backend": None, "opened": False}
+_CACHES_LOCK = threading.Lock()
+
+
+def shared_backend():
+    """the SQLiteBackend of RESULT_CACHE_DB, None where it isn't set
+    """
+    with _CACHES_LOCK:
+        if not _SHARED["opened"]:
+            _SHARED["opened"] = True
+            _SHARED["backend"] = SQLiteBackend(DB_PATH) if DB_PATH else None
+    return _SHARED["backend"]
+
+
+def get_cache(name, ttl=None):
+    """the ResultCache called name, created on first use (ttl defaults to RESULT_CACHE_TTL)
+    """
+    cache = CACHES.get(name)
+    if cache is None:
+        shared = shared_backend()
+        with _CACHES_LOCK:
+            cache = CACHES.setdefault(name, ResultCache(name, DEFAULT_TTL if ttl is None else ttl, shared=shared))
+    return cache
+
+
+def cached(name, ttl=None):
+    """decorator caching the results of a function in the ResultCache called name
+
+    The function must be pure: its result depends only on its (picklable) arguments and is picklable
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return get_cache(name, ttl).call(func, args, kwargs)
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    """hit rates and sizes of every cache of this worker, and of the shared backend
+    """
+    with _CACHES_LOCK:
+        caches = dict(CACHES)
+    shared = _SHARED["backend"]
+    return {"pid": os.getpid(), "version": code_version(),
+            "caches": {name: cache.stats() for name, cache in sorted(caches.items())},
+            "shared": None if shared is None else shared.stats()}
+
+
+def cache_stats_route():
+    return jsonify(cache_stats())
+
+
+def cache_clear_route():
+    name = request.args.get("name")
+    with _CACHES_LOCK:
+        caches = [CACHES[name]] if name in CACHES else ([] if name else list(CACHES.values()))
+    if name and not caches:
+        return jsonify({"status": "error", "message": f"no cache called {name}"}), 404
+    for cache in caches:
+        cache.clear()
+    return jsonify({"status": "success", "cleared": [cache.name for cache in caches]})
@@ -1,5 +1,6 @@
 import plotly.graph_objects as go
 import plotly.io as pio
+from plotly.subplots import make_subplots
 
 
 def plotly_fig_plot(plot_title: str, xaxis_label: str, curves: list):
@@ -68,4 +69,64 @@ def plotly_fig_plot(plot_title: str, xaxis_label: str, curves: list):
 
     plot_json = pio.to_json(fig)
 
-    return plot_json
\ No newline at end of file
+    return plot_json
+
+
+def plotly_map_plot(plot_title: str, xaxis_label: str, yaxis_label: str, xvals: list, yvals: list, maps: list):
+    """Create a Plotly contour plot for each RRF map, side by side with a shared colour scale.
+
+    Parameters
+    ----------
+    plot_title : str
+        Plot title displayed at the top of the figure.
+
+    xaxis_label, yaxis_label : str
+        Labels for the x- and y-axis.
+
+    xvals, yvals : list
+        Grid values along the x- and y-axis.
+
+    maps : list
+        List of dictionaries defining each map.
+
+        Each dictionary must contain:
+            {
+                "zvals": list of lists (len(yvals) rows by len(xvals) columns),
+                "label": str
+            }
+
+    Returns
+    -------
+    plot_json : str
+        Plotly figure converted to JSON format for frontend rendering.
+    """
+
+    fig = make_subplots(rows=1, cols=len(maps), subplot_titles=[m["label"] for m in maps],
+                        shared_yaxes=True, horizontal_spacing=0.04)
+
+    for idx, rrf_map in enumerate(maps):
+
+        fig.add_trace(
+            go.Contour(
+                x=xvals,
+                y=yvals,
+                z=rrf_map["zvals"],
+                name=rrf_map["label"],
+                coloraxis="coloraxis",
+                contours=dict(showlabels=True)
+            ),
+            row=1, col=idx + 1
+        )
+        fig.update_xaxes(title_text=xaxis_label, row=1, col=idx + 1)
+
+    fig.update_yaxes(title_text=yaxis_label, row=1, col=1)
+
+    fig.update_layout(
+        title=plot_title,
+        coloraxis=dict(colorbar=dict(title="RRF")),
+        template='plotly_white'
+    )
+
+    plot_json = pio.to_json(fig)
+
+    return plot_json
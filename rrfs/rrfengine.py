@@ -0,0 +1,145 @@
+'''array-first root reduction factor (RRF) engine for K, TY and X joints
+
+RRFs are calculated with the DNV-RP-C203 Table F-6 equations in tubularjointscfs/efthymiou/reduction.py for a
+structured array of joints (JOINT_DTYPE), one vectorised call per joint type and load mode. Used by the /rrfs page
+(via the beta, gamma, tau, theta, zeta parameterisation) and by batch jobs on real joint geometry.
+
+for X joints, where the beta limit of 0.85 is exceeded, KMethod have developed their own methodology to determine
+RRFs (max RRF over beta 0.4 to 0.85). This is selected as the default approach, the DNV approach (linear
+interpolation to 0.85 at beta = 1.0) is also available. IPB RRFs always use the DNV approach. T/Y joint axial
+RRFs are not defined (nan) where beta > 0.85.
+'''
+
+import numpy as np
+
+from tubularjointscfs.efthymiou.reduction import kaxial, kbip, kbop, taxial, tbip, tbop, xaxial, xbip, xbop
+
+LOAD_MODES = ["axial", "ipb", "opb"]
+RRF_EQUATIONS = {"k": (kaxial, kbip, kbop),
+                 "ty": (taxial, tbip, tbop),
+                 "x": (xaxial, xbip, xbop)}
+
+# joint geometry, theta in radians. g (gap) is only used by K joints, L (chord length) is not used by Table F-6
+JOINT_DTYPE = np.dtype([("jt_type", "U2"), ("D", "f8"), ("T", "f8"), ("d", "f8"), ("t", "f8"), ("theta", "f8"),
+                        ("g", "f8"), ("L", "f8")])
+RRF_DTYPE = np.dtype([(mode, "f8") for mode in LOAD_MODES])
+
+X_BETA_LIMIT = 0.85
+KMETHOD_BETAVALS = np.arange(0.4, 0.85+0.01, 0.05)
+
+
+# Table F-6 X joint axial (F.10-9) and opb (F.10-11) RRFs split into a beta term and a gamma / tau factor
+def _beta_term_axial_x(beta):
+    return -1.734 * beta ** 2 + 1.565 * beta + 0.326
+
+
+def _beta_term_opb_x(beta):
+    return -1.188 * beta ** 2 + 0.981 * beta + 0.453
+
+
+def _factor_axial_x(gamma, tau):
+    return 2.25 * (2.687 * tau ** 3 - 5.117 * tau ** 2 + 2.496 * tau + 0.297) * (0.0065 * gamma + 0.53)
+
+
+def _factor_opb_x(gamma, tau):
+    return 2.4 * (3.414 * tau ** 3 - 6.33 * tau ** 2 + 3.101 * tau + 0.194) * \
+        (-0.0002 * gamma ** 2 + 0.014 * gamma + 0.46)
+
+
+# (min, max) of the beta terms over KMETHOD_BETAVALS, the KMethod max RRF is one of these times the factor
+BETA_TERM_AXIAL_X_KMETHOD = (_beta_term_axial_x(KMETHOD_BETAVALS).min(), _beta_term_axial_x(KMETHOD_BETAVALS).max())
+BETA_TERM_OPB_X_KMETHOD = (_beta_term_opb_x(KMETHOD_BETAVALS).min(), _beta_term_opb_x(KMETHOD_BETAVALS).max())
+
+
+def make_joints(jt_type, D, T, d, t, theta, g=np.nan, L=np.nan):
+    '''structured joint array (JOINT_DTYPE) from broadcastable arrays, theta in radians
+    '''
+    fields = np.broadcast_arrays(np.asarray(jt_type), *(np.asarray(v, dtype=float) for v in (D, T, d, t, theta, g, L)))
+    joints = np.empty(fields[0].shape, dtype=JOINT_DTYPE)
+    for name, vals in zip(JOINT_DTYPE.names, fields):
+        joints[name] = vals
+    return joints
+
+
+def joints_from_parameters(jt_type, beta, gamma, tau, theta=90., zeta=np.nan):
+    '''structured joint array for non-dimensional joint parameters (chord diameter of 1), theta in degrees
+    '''
+    D = np.ones_like(np.asarray(beta, dtype=float))
+    T = D / (2 * np.asarray(gamma, dtype=float))
+    return make_joints(jt_type, D, T, beta * D, tau * T, np.radians(theta), zeta * D)
+
+
+def calc_rrfs(joints, x_method="KMethod"):
+    '''RRFs for all load modes of a structured joint array (JOINT_DTYPE)
+
+    args:
+        joints: numpy structured array, any shape, jt_type one of "k", "ty" or "x"
+        x_method: "KMethod" or "DNV", X joint axial and opb RRFs where beta > 0.85
+    returns:
+        rrfs: numpy structured array (RRF_DTYPE) with the same shape as joints
+    '''
+    joints = np.asarray(joints)
+    unknown = np.setdiff1d(joints["jt_type"], list(RRF_EQUATIONS))
+    if unknown.size:
+        raise Exception(f"joint type(s) {unknown.tolist()} not recognised, use one of {list(RRF_EQUATIONS)}")
+
+    rrfs = np.full(joints.shape, np.nan, dtype=RRF_DTYPE)
+    for jt_type, equations in RRF_EQUATIONS.items():
+        mask = joints["jt_type"] == jt_type
+        if not mask.any():
+            continue
+        jts = joints[mask]
+        args = (jts["D"], jts["d"], jts["T"], jts["t"], jts["L"], jts["theta"], jts["g"])
+        if jt_type == "x":
+            jt_rrfs = _x_rrfs(*args, method=x_method)
+        else:
+            jt_rrfs = [f(*args) for f in equations]
+            if jt_type == "ty":
+                jt_rrfs[0] = np.where(jts["d"] / jts["D"] <= X_BETA_LIMIT, jt_rrfs[0], np.nan)
+        for mode, vals in zip(LOAD_MODES, jt_rrfs):
+            rrfs[mode][mask] = vals
+
+    return rrfs
+
+
+def _x_rrfs(d1, d2, thk1, thk2, length, theta, g, method="KMethod"):
+    '''X joint axial, ipb and opb RRFs including the beta > 0.85 extension
+    '''
+    beta = d2 / d1
+    if np.any(beta > 1.0):
+        raise Exception(f"beta value of {beta.max()} outside validity ranges")
+
+    above_85 = beta > X_BETA_LIMIT
+    # Table F-6 equations at beta, or at the 0.85 limit where exceeded
+    d2_85 = np.minimum(d2, X_BETA_LIMIT * d1)
+    rrfs_85 = [f(d1, d2_85, thk1, thk2, length, theta, g) for f in (xaxial, xbip, xbop)]
+    if not above_85.any():
+        return rrfs_85
+
+    # see notes section of Table F-6 in DNV-RP-C203, linear interpolation between the rrf at beta 0.85 and 0.85
+    # at beta 1.0
+    def _interp_beta_85_to_1(rrf_beta_85, rrf_beta_1=0.85):
+        return (rrf_beta_1 - rrf_beta_85) / (1 - X_BETA_LIMIT) * (beta - X_BETA_LIMIT) + rrf_beta_85
+
+    gamma = d1 / (2 * thk1)
+    tau = thk2 / thk1
+    kmethod_rrfs = {"axial": _kmethod_max(BETA_TERM_AXIAL_X_KMETHOD, _factor_axial_x(gamma, tau)),
+                    "opb": _kmethod_max(BETA_TERM_OPB_X_KMETHOD, _factor_opb_x(gamma, tau))}
+    rrfs = []
+    for rrf_85, mode in zip(rrfs_85, LOAD_MODES):
+        if mode == "ipb" or method == "DNV":
+            rrf_above_85 = _interp_beta_85_to_1(rrf_85)
+        elif method == "KMethod":
+            rrf_above_85 = kmethod_rrfs[mode]
+        else:
+            raise Exception(f"X joint RRF method {method} not recognised, use 'KMethod' or 'DNV'")
+        rrfs.append(np.where(above_85, rrf_above_85, rrf_85))
+
+    return rrfs
+
+
+def _kmethod_max(beta_term_min_max, factor):
+    '''max over KMETHOD_BETAVALS of the beta term times the gamma / tau factor (either sign)
+    '''
+    beta_term_min, beta_term_max = beta_term_min_max
+    return factor * np.where(factor >= 0, beta_term_max, beta_term_min)
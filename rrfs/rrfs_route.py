@@ -3,11 +3,23 @@ import math
 import numpy as np
 from flask import Flask, render_template, flash, jsonify, request, session
 
-from rrfs.plotterrrfs import plotly_fig_plot
-from rrfs.requations import axialrrf_x, ipbrrf_x, opbrrf_x
+from rrfs.plotterrrfs import plotly_fig_plot, plotly_map_plot
+from rrfs.rrfengine import joints_from_parameters, calc_rrfs
+from resultcache import cached
 
 app = Flask(__name__)
 
+# page joint selection to rrf engine joint type
+RRFS_JT_TYPES = {"rrfs-x": "x", "rrfs-yt": "ty", "rrfs-k": "k"}
+RRFS_JT_NAMES = {"x": "X joint", "ty": "YT joint", "k": "K joint"}
+RRFS_LABELS = {"axial": "Axial RRF", "ipb": "IPB RRF", "opb": "OPB RRF"}
+# x axis limits of the RRF plots
+JT_LIMS = {"rrfs_beta": (0.4, 0.85), "rrfs_gamma": (10, 30), "rrfs_tau": (0.35, 0.85), "rrfs_theta": (30, 90),
+           "rrfs_zeta": (0.05, 0.6)}
+# beta x tau limits of the RRF maps (X joint beta > 0.85 uses the KMethod / DNV interpolation)
+JT_MAP_LIMS = {"rrfs_beta": (0.4, 0.85), "rrfs_tau": (0.35, 0.85)}
+X_JT_MAP_LIMS = {"rrfs_beta": (0.4, 1.0), "rrfs_tau": (0.35, 0.85)}
+
 @app.route("/rrfs", methods=["GET", "POST"])
 def rrfs_route():
 
@@ -33,15 +45,19 @@ def rrfs_route():
         print("Gamma:", gamma)
         print("x_axis_vary:", x_axis_vary)
 
-        # X JOINT =======================================================================
-        rrf_x_jt_axial_result, rrf_x_jt_ipb_result, rrf_x_jt_opb_result, x_jt_plot_json = get_x_jt_RRFs_data(beta, gamma, tau, theta, x_axis_vary)
-
-        # todo KT and Y JOINTS
-
+        jt_type = RRFS_JT_TYPES.get(rrfs_assess)
+        if jt_type is None:
+            return jsonify({'error': f'Joint type {rrfs_assess} not recognised'}), 400
 
+        # X, YT and K JOINTS ===============================================================
+        rrfs, plot_json = get_jt_RRFs_data(jt_type, beta, gamma, tau, theta, zeta, x_axis_vary)
 
         return jsonify({
-            "success": True
+            "success": True,
+            "rrf_axial": rrfs["axial"],
+            "rrf_ipb": rrfs["ipb"],
+            "rrf_opb": rrfs["opb"],
+            "plot_json": plot_json
         })
 
     return render_template(
@@ -59,60 +75,54 @@ def rrfs_route():
     )
 
 
-def get_x_jt_RRFs_data(beta: float,
-                       gamma: float,
-                       tau: float,
-                       theta: float,
-                       x_axis_vary: str):
+@cached("rrf")
+def get_jt_RRFs_data(jt_type: str,
+                     beta: float,
+                     gamma: float,
+                     tau: float,
+                     theta: float,
+                     zeta: float,
+                     x_axis_vary: str):
+
+    params = {"rrfs_beta": beta, "rrfs_gamma": gamma, "rrfs_tau": tau, "rrfs_theta": theta, "rrfs_zeta": zeta}
 
     # Single-point results
-    rrf_x_jt_axial_result = axialrrf_x(beta, gamma, tau)
-    rrf_x_jt_ipb_result = ipbrrf_x(beta, gamma, tau)
-    rrf_x_jt_opb_result = opbrrf_x(beta, gamma, tau)
-
-    x_jt_lims = {"rrfs_beta": (0.4, 0.85), "rrfs_gamma": (10, 30), "rrfs_tau": (0.35, 0.85), "rrfs_theta": (30, 90)
-                 }
-
-    if x_axis_vary in x_jt_lims:
-        start, end = x_jt_lims[x_axis_vary]
-        x_vals = np.linspace(start, end, 100).tolist()
-        # Store RRF results
-        rrf_x_jt_axial_results, rrf_x_jt_ipb_results, rrf_x_jt_opb_results = [], [], []
-
-        for x in x_vals:
-            # Current parameter set
-            params = {"rrfs_beta": beta, "rrfs_gamma": gamma, "rrfs_tau": tau, "rrfs_theta": theta}
-            # Update the varying parameter
-            params[x_axis_vary] = x
-            # Short aliases
-            beta_i = params["rrfs_beta"]
-            gamma_i = params["rrfs_gamma"]
-            tau_i = params["rrfs_tau"]
-            # Calculate RRFs
-            rrf_x_jt_axial_results.append(axialrrf_x(beta_i, gamma_i, tau_i))
-            rrf_x_jt_ipb_results.append(ipbrrf_x(beta_i, gamma_i, tau_i))
-            rrf_x_jt_opb_results.append(opbrrf_x(beta_i, gamma_i, tau_i))
+    rrfs = calc_rrfs(joints_from_parameters(jt_type, beta, gamma, tau, theta, zeta))
+    rrfs = {mode: float(rrfs[mode]) for mode in rrfs.dtype.names}
+
+    plot_json = None
+    if x_axis_vary == "rrfs_map":
+        plot_json = get_jt_RRFs_map(jt_type, gamma, theta, zeta)
+
+    elif x_axis_vary in JT_LIMS:
+        x_vals = np.linspace(*JT_LIMS[x_axis_vary], 100)
+        # Current parameter set, with the varying parameter as an array
+        params[x_axis_vary] = x_vals
+        # Calculate RRFs (all x values at once)
+        rrf_results = calc_rrfs(joints_from_parameters(jt_type, params["rrfs_beta"], params["rrfs_gamma"],
+                                                       params["rrfs_tau"], params["rrfs_theta"], params["rrfs_zeta"]))
 
         # Plot curves
-        x_jt_plot_curves = [
-            {
-                "xvals": x_vals,
-                "yvals": rrf_x_jt_axial_results,
-                "label": "Axial RRF"
-            },
-            {
-                "xvals": x_vals,
-                "yvals": rrf_x_jt_ipb_results,
-                "label": "IPB RRF"
-            },
-            {
-                "xvals": x_vals,
-                "yvals": rrf_x_jt_opb_results,
-                "label": "OPB RRF"
-            }
-        ]
+        plot_curves = [{"xvals": x_vals.tolist(), "yvals": rrf_results[mode].tolist(), "label": label}
+                       for mode, label in RRFS_LABELS.items()]
 
         # Generate plot
-        x_jt_plot_json = plotly_fig_plot(plot_title="X joint", xaxis_label=x_axis_vary, curves=x_jt_plot_curves)
+        plot_json = plotly_fig_plot(plot_title=RRFS_JT_NAMES[jt_type], xaxis_label=x_axis_vary, curves=plot_curves)
+
+    return rrfs, plot_json
+
+
+def get_jt_RRFs_map(jt_type: str, gamma: float, theta: float, zeta: float, n_pts: int = 201):
+    """RRF surfaces over beta (x axis) and tau (y axis) for a given gamma (theta and zeta), one engine call
+    """
+    map_lims = X_JT_MAP_LIMS if jt_type == "x" else JT_MAP_LIMS
+    beta_vals = np.linspace(*map_lims["rrfs_beta"], n_pts)
+    tau_vals = np.linspace(*map_lims["rrfs_tau"], n_pts)
+    # tau down the rows, beta along the columns
+    rrf_grid = calc_rrfs(joints_from_parameters(jt_type, beta_vals[None, :], gamma, tau_vals[:, None], theta, zeta))
+
+    # RRFs rounded to 4 decimal places to keep the figure json small
+    jt_maps = [{"zvals": np.round(rrf_grid[mode], 4).tolist(), "label": label} for mode, label in RRFS_LABELS.items()]
 
-    return rrf_x_jt_axial_result, rrf_x_jt_ipb_result, rrf_x_jt_opb_result, x_jt_plot_json
\ No newline at end of file
+    return plotly_map_plot(plot_title=f"{RRFS_JT_NAMES[jt_type]} (gamma = {gamma})", xaxis_label="rrfs_beta",
+                           yaxis_label="rrfs_tau", xvals=beta_vals.tolist(), yvals=tau_vals.tolist(), maps=jt_maps)
@@ -0,0 +1,10 @@
+import pytest
+
+from jktdesign.architect import get_default_config
+from jktdesign.jktsections import sectioned_jacket
+
+
+@pytest.fixture(scope="session")
+def jacket():
+    """the architect page default jacket with the default /jktsections sections"""
+    return sectioned_jacket(get_default_config())
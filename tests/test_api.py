@@ -0,0 +1,70 @@
+"""request validation and results of the /api/v1 endpoints"""
+import numpy as np
+import pytest
+
+from app import app
+from tubularjointscfs.jointfatigue import TOE_LOCS, toe_scfs_arr
+
+X_JOINT = {"D": 1000., "T": 50., "d": 500., "t": 25., "theta": 45., "L": 10000.}
+K_JOINT = {"D": 1500., "T": 60., "dA": 600., "tA": 25., "thetaA": 45., "dB": 600., "tB": 25., "thetaB": 45.,
+           "g_ab": 100., "L": 20000.}
+HISTOGRAM = [[1e6, 1e5, 1e3], [10., 30., 80.]]
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def test_scf_single_and_array_inputs(client):
+    single = client.post("/api/v1/scf/x", json=X_JOINT).get_json()
+    array = client.post("/api/v1/scf/x", json=[X_JOINT, {**X_JOINT, "d": 700.}]).get_json()
+    assert single["status"] == array["status"] == "success" and array["count"] == 2
+
+    expected = toe_scfs_arr(1000., 50., 500., 25., np.radians(45.), 10000., "x", "balanced_forces")
+    for loc, scf in zip(TOE_LOCS, expected):
+        assert single["results"][loc] == array["results"][loc][0] == pytest.approx(float(scf), abs=1e-5)
+
+
+@pytest.mark.parametrize("jt_type, load_type", [("ty", "balanced_forces"), ("x", "balanced_axial_unbalanced_moment"),
+                                                ("k", "balanced_forces"), ("x", "nonsense")])
+def test_scf_load_type_not_allowed_for_the_joint_type(client, jt_type, load_type):
+    joint = K_JOINT if jt_type == "k" else X_JOINT
+    response = client.post(f"/api/v1/scf/{jt_type}?load_type={load_type}", json=joint)
+    assert response.status_code == 400
+    assert "load_type must be one of" in response.get_json()["error"]
+
+
+@pytest.mark.parametrize("body, message", [({**X_JOINT, "L": None}, "required field 'L' missing"),
+                                           ({**X_JOINT, "T": "thick"}, "field 'T' must be numeric"),
+                                           ([], "non-empty array of objects"),
+                                           ([X_JOINT, 5], "non-empty array of objects")])
+def test_scf_bad_inputs(client, body, message):
+    response = client.post("/api/v1/scf/x", json=body)
+    assert response.status_code == 400 and message in response.get_json()["error"]
+
+
+def test_unknown_joint_type_is_a_404(client):
+    assert client.post("/api/v1/scf/y", json=X_JOINT).status_code == 404
+    assert client.post("/api/v1/fatigue/y", json={"joints": X_JOINT, "histogram": HISTOGRAM}).status_code == 404
+
+
+@pytest.mark.parametrize("jt_type, joint", [("x", X_JOINT), ("ty", X_JOINT), ("k", K_JOINT)])
+def test_fatigue_damage(client, jt_type, joint):
+    response = client.post(f"/api/v1/fatigue/{jt_type}", json={"joints": [joint, joint], "histogram": HISTOGRAM})
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert len(results["damage_max_loc"]) == 2
+    assert all(val > 0 for val in results["damage_toe"] + results["damage_root"])
+    assert results["root_governed"] == [root > toe for root, toe in zip(results["damage_root"], results["damage_toe"])]
+
+
+@pytest.mark.parametrize("body, query, message", [
+    ({"joints": X_JOINT}, "", 'expecting a JSON object with "joints" and "histogram"'),
+    ({"joints": X_JOINT, "histogram": [[1e6, 1e5], [10.]]}, "", "histogram must be two numeric arrays"),
+    ({"joints": X_JOINT, "histogram": [1e6, 10.]}, "", "histogram must be two numeric arrays"),
+    ({"joints": X_JOINT, "histogram": HISTOGRAM}, "?load_type=balanced_axial_unbalanced_moment", "load_type must be"),
+    ({"joints": X_JOINT, "histogram": HISTOGRAM}, "?toe_sncurve=Z9", "Z9")])
+def test_fatigue_bad_requests(client, body, query, message):
+    response = client.post(f"/api/v1/fatigue/x{query}", json=body)
+    assert response.status_code == 400 and message in response.get_json()["error"]
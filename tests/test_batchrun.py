@@ -0,0 +1,110 @@
+"""batchrun on small CSV and Parquet tables, run in this process (workers=0)"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import batchrun
+from tubularjointscfs.jointfatigue import TOE_LOCS, toe_scfs_arr
+
+X_JOINT = {"D": 1000., "T": 50., "d": 500., "t": 25., "theta": 45., "L": 10000.}
+KT_JOINT = {"D": 1500., "T": 60., "dA": 600., "tA": 25., "thetaA": 45., "dB": 600., "tB": 25., "thetaB": 90.,
+            "dC": 600., "tC": 25., "thetaC": 45., "g_ab": 100., "g_bc": 100., "L": 20000.}
+# defaults of the /boltedconn and /gc pages
+FLANGE = {"outer_diameter": 7500., "wall_thickness": 85., "bolt_steel_grade": "10.9", "flange_steel_grade": "355",
+          "tower_steel_grade": "355", "ULS_bending_moment": 511e9, "ULS_axial_force": 14.7e6, "flange_height": 180.,
+          "flange_length": 380., "bolt_size": "M72"}
+GC = {"leg_od": 3580., "leg_t": 80., "pile_od": 4250., "pile_t": 85., "gc_length": 11000., "n_sks": 15, "sk_width": 44.,
+      "sk_height": 22., "sk_spacing": 370., "fx": -1e5, "fy": -9e6, "fz": -3.2e7, "mx": 6e10, "my": -1e9,
+      "grout_E": 38000., "grout_strength": 80.}
+
+
+def test_x_joint_scfs_to_csv(tmp_path):
+    df = pd.DataFrame([X_JOINT, {**X_JOINT, "d": 700.}])
+    out = tmp_path / "x.csv"
+    assert batchrun.run_batch(df, "x", str(out), workers=0, progress=False) == 0
+
+    res = pd.read_csv(out)
+    assert list(res.columns[:len(X_JOINT)]) == list(X_JOINT) and len(res) == 2
+    assert res["error"].isna().all()
+    expected = toe_scfs_arr(df["D"].to_numpy(), df["T"].to_numpy(), df["d"].to_numpy(), df["t"].to_numpy(),
+                            np.radians(df["theta"].to_numpy()), df["L"].to_numpy(), "x", "balanced_forces")
+    for loc, scfs in zip(TOE_LOCS, expected):
+        np.testing.assert_allclose(res[f"scf_{loc}"], scfs)
+
+
+def test_bad_rows_get_errors_and_the_others_run(tmp_path):
+    df = pd.DataFrame([KT_JOINT, {**KT_JOINT, "T": 0.}, {**KT_JOINT, "dA": "abc"}, KT_JOINT])
+    out = tmp_path / "kt.csv"
+    assert batchrun.run_batch(df, "kt", str(out), chunk_size=2, workers=0, progress=False) == 2
+
+    res = pd.read_csv(out)
+    assert res["error"].tolist()[1:3] == ["ValueError: T must be > 0", "ValueError: dA missing or not a number"]
+    assert res["error"].iloc[[0, 3]].isna().all()
+    assert res["scf_axial_a_chord_crown"].iloc[[0, 3]].notna().all()
+    assert res["scf_axial_a_chord_crown"].iloc[[1, 2]].isna().all()
+
+
+def test_missing_columns_stop_the_run(tmp_path):
+    df = pd.DataFrame([{key: val for key, val in X_JOINT.items() if key != "L"}])
+    with pytest.raises(ValueError, match=r"required columns \['L'\] missing"):
+        batchrun.run_batch(df, "x", str(tmp_path / "x.csv"), workers=0, progress=False)
+
+
+def test_main_checks_every_record_type_before_running(tmp_path, capsys):
+    path = tmp_path / "joints.csv"
+    pd.DataFrame([{"record_type": "x", **X_JOINT}, {"record_type": "cone", "radius_tubular": 2000.}]).to_csv(
+        path, index=False)
+    with pytest.raises(SystemExit) as e:
+        batchrun.main([str(path), "-o", str(tmp_path / "out.csv"), "--workers", "0", "-q"])
+    assert e.value.code == 2
+    assert "cone records: required columns" in capsys.readouterr().err
+    assert not list(tmp_path.glob("out*.csv"))
+
+
+def test_cone_junctions_to_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    cone = {"radius_tubular": 2000., "thickness_tubular": 60., "thickness_cone": 60., "alpha": 5.}
+    df = pd.DataFrame([{**cone, "cone_junction": "small"}, {**cone, "cone_junction": "large"},
+                       {**cone, "cone_junction": "middle"}])
+    out = tmp_path / "cones.parquet"
+    assert batchrun.run_batch(df, "cone", str(out), workers=0, progress=False) == 1
+
+    res = pd.read_parquet(out)
+    assert res["error"].iloc[2].startswith("ValueError: cone_junction must be one of")
+    assert res["error"].iloc[:2].isna().all()
+
+
+def test_flange_flag_from_csv(tmp_path):
+    path = tmp_path / "flanges.csv"
+    pd.DataFrame([FLANGE, {**FLANGE, "maintain_a_b_ratio_1_25": "Yes"}, {**FLANGE, "maintain_a_b_ratio_1_25": "maybe"},
+                   {**FLANGE, "n_bolts": 160, "b_star": 173.}]).to_csv(path, index=False)
+    out = tmp_path / "flanges_out.csv"
+    assert batchrun.run_batch(batchrun.read_table(str(path)), "flange", str(out), workers=0, progress=False) == 1
+
+    res = pd.read_csv(out)
+    # a blank flag is False, the a/b ratio of 1.85 is only invalid where the 1.25 ratio is kept
+    assert res["a_b_ratio"].iloc[0] > 1.25 and res["valid_geom"].tolist()[:2] == [True, False]
+    assert res["error"].iloc[2].startswith("ValueError: maintain_a_b_ratio_1_25 must be one of")
+    assert (res["n_bolts_result"].iloc[3], res["b_star_result"].iloc[3]) == (160, 173.)
+    assert 0 < res["util"].iloc[3] < 1 and res["error"].iloc[[0, 1, 3]].isna().all()
+
+
+@pytest.mark.parametrize("value, flag", [(np.nan, False), (None, False), ("", False), (" TRUE ", True), ("0", False),
+                                         (1., True), (0, False), (True, True)])
+def test_row_flag(value, flag):
+    assert batchrun.row_flag(value, "flag") is flag
+
+
+def test_grouted_connections(tmp_path):
+    df = pd.DataFrame([GC, {**GC, "pile_od": 3000.}, {**GC, "n_sks": "many"}])
+    out = tmp_path / "gc.csv"
+    assert batchrun.run_batch(df, "gc", str(out), workers=0, progress=False) == 1
+
+    res = pd.read_csv(out)
+    assert res["error"].iloc[:2].isna().all() and res["error"].iloc[2] == "ValueError: n_sks missing or not a number"
+    assert res["le"].iloc[0] > 0
+    validity = [col for col in res if col.startswith("validity ")]
+    passed = res.loc[:1, validity].eq("PASS")
+    assert passed.all(axis=1).tolist() == res["validity_all_pass"].iloc[:2].tolist()
+    # the pile inside the leg fails more validity checks rather than failing the row
+    assert passed.sum(axis=1).iloc[1] < passed.sum(axis=1).iloc[0]
@@ -0,0 +1,93 @@
+"""GLB structure of the space frame export and of the instanced viewer model, read back with struct and numpy"""
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from jktdesign.export import GLB_COLOURS, iter_glb, write_export
+from jktdesign.spaceframe import JacketSpaceFrame
+from jktdesign.tessellate import jacket_glb
+
+N_SIDES = 8
+
+
+def read_glb(data):
+    """(gltf json, vertices (n, 6) float32, indices uint32) of a GLB with one binary chunk"""
+    magic, version, length = struct.unpack_from("<4sII", data, 0)
+    assert (magic, version, length) == (b"glTF", 2, len(data))
+    json_length, json_type = struct.unpack_from("<I4s", data, 12)
+    assert json_type == b"JSON" and json_length % 4 == 0
+    gltf = json.loads(data[20:20 + json_length])
+    bin_length, bin_type = struct.unpack_from("<I4s", data, 20 + json_length)
+    assert bin_type == b"BIN\x00" and bin_length == gltf["buffers"][0]["byteLength"]
+    buffer = data[28 + json_length:]
+    assert len(buffer) == bin_length
+
+    vertex_view, index_view = gltf["bufferViews"]
+    vertices = np.frombuffer(buffer, "<f4", count=vertex_view["byteLength"] // 4).reshape(-1, 6)
+    indices = np.frombuffer(buffer, "<u4", offset=index_view["byteOffset"], count=index_view["byteLength"] // 4)
+    return gltf, vertices, indices
+
+
+def read_gltf(data):
+    """gltf json of a GLB"""
+    json_length, = struct.unpack_from("<I", data, 12)
+    return json.loads(data[20:20 + json_length])
+
+
+@pytest.fixture(scope="module", params=[3, 4])
+def space_frame(request, jacket):
+    return JacketSpaceFrame(jacket, n_legs=request.param)
+
+
+@pytest.fixture(scope="module")
+def glb(space_frame):
+    return b"".join(iter_glb(space_frame, n_sides=N_SIDES))
+
+
+def test_glb_buffers_and_accessors(space_frame, glb):
+    gltf, vertices, indices = read_glb(glb)
+    n_segments = len(space_frame.segments())
+    position, normal = gltf["accessors"][:2]
+    assert position["count"] == normal["count"] == len(vertices) == n_segments * 2 * N_SIDES
+    assert len(indices) == n_segments * 6 * N_SIDES and indices.max() < position["count"]
+
+    # bounds exactly of the float32 positions written
+    assert position["min"] == [float(val) for val in vertices[:, :3].min(axis=0)]
+    assert position["max"] == [float(val) for val in vertices[:, :3].max(axis=0)]
+    np.testing.assert_allclose(np.linalg.norm(vertices[:, 3:], axis=1), 1., atol=1e-5)
+
+
+def test_glb_one_primitive_per_kind(space_frame, glb):
+    gltf, _, indices = read_glb(glb)
+    counts = space_frame.segments()["kind"].value_counts()
+    kinds = [kind for kind in GLB_COLOURS if kind in counts]
+    assert {"LEG", "BRC", "CAN", "STUB"} <= set(kinds)
+
+    primitives = gltf["meshes"][0]["primitives"]
+    assert [gltf["materials"][p["material"]]["pbrMetallicRoughness"]["baseColorFactor"] for p in primitives] == \
+        [GLB_COLOURS[kind] for kind in kinds]
+    index_accessors = [gltf["accessors"][p["indices"]] for p in primitives]
+    assert [acc["count"] for acc in index_accessors] == [counts[kind] * 6 * N_SIDES for kind in kinds]
+    assert sum(acc["count"] for acc in index_accessors) == len(indices)
+
+
+def test_glb_does_not_depend_on_the_chunk_size(space_frame, glb, tmp_path):
+    assert b"".join(iter_glb(space_frame, n_sides=N_SIDES, chunk_size=7)) == glb
+    path = tmp_path / "jacket.glb"
+    write_export(space_frame, "glb", str(path), n_sides=N_SIDES)
+    assert path.read_bytes() == glb
+
+
+def test_viewer_glb_has_a_node_per_segment(space_frame):
+    segments = space_frame.segments()
+    gltf = read_gltf(jacket_glb(space_frame, n_sides=N_SIDES))
+    nodes = gltf["nodes"][1:]
+    assert gltf["nodes"][0]["children"] == list(range(1, len(segments) + 1))
+    assert [node["name"] for node in nodes] == [f"{sec}_{member}" for sec, member in
+                                                zip(segments["section"], segments["member"])]
+    kinds = [gltf["materials"][gltf["meshes"][node["mesh"]]["primitives"][0]["material"]]["name"] for node in nodes]
+    assert kinds == segments["kind"].tolist()
+    np.testing.assert_allclose([node["scale"][0] for node in nodes], segments["D_1"].fillna(1000.) / 2000., atol=1e-4)
+    np.testing.assert_allclose([node["scale"][1] for node in nodes], segments["length"] / 1000., atol=1e-3)
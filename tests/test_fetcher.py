@@ -0,0 +1,76 @@
+"""ForecastFetcher cache and fan out, with a stub transport in place of the Open-Meteo apis"""
+import threading
+
+import pytest
+
+from kitesurf import fetcher as fetcher_module
+from kitesurf.fetcher import ForecastFetcher
+
+
+class StubTransport:
+    """records the calls and answers with the url and params, optionally waiting at a barrier first"""
+    def __init__(self, barrier=None):
+        self.calls = []
+        self.barrier = barrier
+        self.lock = threading.Lock()
+
+    def __call__(self, url, params):
+        with self.lock:
+            self.calls.append((url, params))
+        if self.barrier is not None:
+            self.barrier.wait()
+        return {"url": url, **params}
+
+
+@pytest.fixture
+def stub():
+    return StubTransport()
+
+
+def test_nearby_requests_are_cache_hits(stub):
+    fetcher = ForecastFetcher(transport=stub, max_workers=1)
+    first = fetcher.get_json("wind", 50.123, -1.001, {"hourly": "wind_speed_10m"})
+    assert fetcher.get_json("wind", 50.1231, -1.0012, {"hourly": "wind_speed_10m"}) is first
+    assert first == {"url": fetcher.endpoint_urls["wind"], "latitude": 50.12, "longitude": -1.0,
+                     "hourly": "wind_speed_10m"}
+    assert (fetcher.hits, fetcher.misses, len(stub.calls)) == (1, 1, 1)
+
+
+def test_params_are_part_of_the_key(stub):
+    fetcher = ForecastFetcher(transport=stub, max_workers=1)
+    fetcher.get_json("wind", 50., -1., {"hourly": "wind_speed_10m", "timezone": "UTC"})
+    fetcher.get_json("wind", 50., -1., {"timezone": "UTC", "hourly": "wind_speed_10m"})  # same params, any order
+    fetcher.get_json("wind", 50., -1., {"hourly": "wind_gusts_10m", "timezone": "UTC"})
+    fetcher.get_json("sun", 50., -1., {"hourly": "wind_speed_10m", "timezone": "UTC"})
+    assert [params["hourly"] for _, params in stub.calls] == ["wind_speed_10m", "wind_gusts_10m", "wind_speed_10m"]
+    assert fetcher.hits == 1
+
+
+def test_entries_expire_after_the_ttl(stub, monkeypatch):
+    now = [1000.]
+    monkeypatch.setattr(fetcher_module.time, "monotonic", lambda: now[0])
+    fetcher = ForecastFetcher(transport=stub, ttl=60, max_workers=1)
+    fetcher.get_json("tide", 50., -1., {})
+    now[0] += 59.
+    fetcher.get_json("tide", 50., -1., {})
+    now[0] += 2.
+    fetcher.get_json("tide", 50., -1., {})
+    assert (fetcher.hits, fetcher.misses, len(stub.calls)) == (1, 2, 2)
+
+
+def test_max_entries_evicts_the_oldest(stub):
+    fetcher = ForecastFetcher(transport=stub, max_entries=2, max_workers=1)
+    for lat in [50., 51., 52., 50.]:
+        fetcher.get_json("sun", lat, 0., {})
+    assert [params["latitude"] for _, params in stub.calls] == [50., 51., 52., 50.]
+
+
+def test_requests_fan_out_concurrently():
+    # every request waits for the others at the barrier, a serial fetcher would time out
+    stub = StubTransport(barrier=threading.Barrier(3, timeout=5))
+    fetcher = ForecastFetcher(transport=stub, max_workers=3)
+    futures = [fetcher.submit(fetcher.get_json, endpoint, 50., -1., {}) for endpoint in ["sun", "tide", "wind"]]
+    results = [future.result(timeout=10) for future in futures]
+    assert [res["url"] for res in results] == [fetcher.endpoint_urls[endpoint] for endpoint in ["sun", "tide", "wind"]]
+    assert fetcher.misses == 3
+    fetcher.executor.shutdown()
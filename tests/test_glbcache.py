@@ -0,0 +1,136 @@
+"""GLBCache against the local fake Onshape server (onshape/fakeserver.py)"""
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from onshape.fakeserver import FakeOnshapeServer
+from onshape.glbcache import GLBCache, OnshapeError
+
+CONFIG_A = "leg_offset=12000 mm;strut_angle=47 deg"
+CONFIG_B = "leg_offset=12100 mm;strut_angle=47 deg"
+
+
+@pytest.fixture
+def fake():
+    server = FakeOnshapeServer(delay=0.2)
+    server.start()
+    yield server
+    server.stop()
+
+
+def make_cache(tmp_path, base_url, **kwargs):
+    return GLBCache(str(tmp_path / "glb"), base_url, ("key", "secret"), **kwargs)
+
+
+def test_concurrent_requests_share_one_export(tmp_path, fake):
+    cache = make_cache(tmp_path, fake.base_url)
+    paths = []
+
+    def get():
+        paths.append(cache.get("d1", "w1", "e1", configuration=CONFIG_A)[0])
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fake.export_counts[("e1", CONFIG_A)] == 1
+    assert len(set(paths)) == 1 and os.path.exists(paths[0])
+
+
+def test_configurations_are_cached_separately(tmp_path, fake):
+    cache = make_cache(tmp_path, fake.base_url)
+    path_a, _ = cache.get("d1", "w1", "e1", configuration=CONFIG_A)
+    path_b, _ = cache.get("d1", "w1", "e1", configuration=CONFIG_B)
+    path_saved, _ = cache.get("d1", "w1", "e1")
+    assert len({path_a, path_b, path_saved}) == 3
+    assert fake.export_counts == {("e1", CONFIG_A): 1, ("e1", CONFIG_B): 1, ("e1", None): 1}
+
+    # same configuration and microversion, served from disk
+    assert cache.get("d1", "w1", "e1", configuration=CONFIG_A)[0] == path_a
+    assert fake.export_counts[("e1", CONFIG_A)] == 1
+
+
+def test_new_microversion_is_revalidated(tmp_path, fake):
+    cache = make_cache(tmp_path, fake.base_url, microversion_ttl=0)
+    _, etag = cache.get("d1", "w1", "e1", configuration=CONFIG_A)
+    fake.microversion = "mv2"
+    # the fake ETag depends on the microversion, the old one is not matched and the model is exported again
+    assert cache.get("d1", "w1", "e1", configuration=CONFIG_A)[1] != etag
+    assert fake.export_counts[("e1", CONFIG_A)] == 2
+
+
+def test_not_modified_reuses_the_cached_file(tmp_path, fake):
+    cache = make_cache(tmp_path, fake.base_url, microversion_ttl=0)
+    path, etag = cache.get("d1", "w1", "e1")
+    # same ETag at a new microversion, as when an unrelated element of the document changes
+    fake.etag = lambda eid, configuration: etag
+    fake.microversion = "mv2"
+    assert cache.get("d1", "w1", "e1") == (path, etag)
+    assert fake.export_counts[("e1", None)] == 1
+    assert fake.not_modified_counts[("e1", None)] == 1
+
+
+def test_eviction_removes_metadata_and_keeps_recent_files(tmp_path, fake):
+    fake.delay = 0.
+    cache = make_cache(tmp_path, fake.base_url, max_bytes=300, evict_grace=0)
+    for eid in ["e1", "e2", "e3"]:
+        cache.get("d1", "w1", eid)
+        time.sleep(0.01)
+    assert sorted(os.listdir(cache.cache_dir)) == ["d1_w1_e3_latest.json", "d1_w1_e3_mv1.glb", "d1_w1_e3_mv1.json"]
+
+    recent = make_cache(tmp_path, fake.base_url, max_bytes=300, evict_grace=60)
+    recent.get("d1", "w1", "e4")
+    assert {"d1_w1_e3_mv1.glb", "d1_w1_e4_mv1.glb"} <= set(os.listdir(cache.cache_dir))
+
+
+def test_evicted_file_is_a_miss(tmp_path, fake):
+    fake.delay = 0.
+    cache = make_cache(tmp_path, fake.base_url)
+    path, _ = cache.get("d1", "w1", "e1")
+    os.remove(path)  # evicted by another worker
+    assert cache.get("d1", "w1", "e1")[0] == path and os.path.exists(path)
+    assert fake.export_counts[("e1", None)] == 2
+
+
+def test_concurrent_metadata_writes(tmp_path):
+    cache = make_cache(tmp_path, "http://127.0.0.1:9")
+    errors = []
+
+    def write(n):
+        try:
+            for i in range(50):
+                cache._write_meta("d1_w1_e1_latest", {"writer": n, "i": i})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors and os.listdir(cache.cache_dir) == ["d1_w1_e1_latest.json"]
+    with open(os.path.join(cache.cache_dir, "d1_w1_e1_latest.json")) as f:
+        assert json.load(f)["i"] == 49
+
+
+def test_unreachable_server_is_a_502(tmp_path):
+    cache = make_cache(tmp_path, "http://127.0.0.1:9", timeout=2)
+    with pytest.raises(OnshapeError) as e:
+        cache.get("d1", "w1", "e1")
+    assert e.value.status_code == 502
+
+
+def test_route_answers_502_when_onshape_is_down(tmp_path, monkeypatch):
+    from app import app
+    from onshape import onshape_route
+
+    monkeypatch.setattr(onshape_route, "AUTH", ("key", "secret"))
+    monkeypatch.setattr(onshape_route, "GLB_CACHE", make_cache(tmp_path, "http://127.0.0.1:9", timeout=2))
+    response = app.test_client().get("/cad_tp/model.glb?model=strut&leg_offset=12040")
+    assert response.status_code == 502
@@ -0,0 +1,23 @@
+"""the engines against the recorded goldens (as python goldens.py check)"""
+import os
+
+import numpy as np
+import pytest
+
+import goldens
+
+
+@pytest.mark.parametrize("name", list(goldens.FAMILIES))
+def test_family_matches_goldens(name):
+    if not os.path.exists(goldens.golden_path(name)):
+        pytest.skip(f"no goldens of {name}, run python goldens.py record --ref a151a24")
+    check = goldens.check_family(name)
+    assert goldens.family_passed(check), goldens.format_check(name, check)
+
+
+def test_compare_arrays_reports_the_worst_sample():
+    golden = np.array([[1., 2.], [3., 4.], [np.nan, 6.]])
+    res = goldens.compare_arrays(golden, golden + [[0., 0.], [0., 1e-3], [0., 0.]], rtol=1e-9, atol=1e-12)
+    assert (res["status"], res["n_bad"], res["worst"], res["nan_mismatch"]) == ("fail", 1, 1, 0)
+    res = goldens.compare_arrays(golden, np.nan_to_num(golden), rtol=1e-9, atol=1e-12)
+    assert (res["status"], res["worst"], res["nan_mismatch"]) == ("fail", 2, 1)
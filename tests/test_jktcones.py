@@ -0,0 +1,86 @@
+"""cone junction SCF screening of a sectioned jacket, and the /jktsections/cones route"""
+import json
+
+import numpy as np
+import pytest
+
+from conescfs.jktcones import SCF_LOCS, screen_jkt_cones, sweep_jkt_cones
+from conescfs.scfprocess import cone_scf_single, cone_scf_sweep
+from jktdesign.architect import get_default_config
+from jktdesign.jktsections import default_sections_form, jacket_from_config, sectioned_jacket
+
+
+@pytest.fixture(scope="module")
+def coned_jacket():
+    # a K joint can larger than the leg gives a cone above and below it on each leg
+    return sectioned_jacket(get_default_config(), {"kjt_2_can_d": "2500"})
+
+
+def test_cones_ranked_by_the_governing_scf(coned_jacket):
+    df = screen_jkt_cones(coned_jacket, nominal_stress_range=50.)
+    assert len(df) == 4 and sorted(df["junction"]) == ["large", "large", "small", "small"]
+    assert df["rank"].tolist() == [1, 2, 3, 4] and df["scf_max"].is_monotonic_decreasing
+    np.testing.assert_allclose(df["hot_spot_stress_range"], 50. * df["scf_max"])
+
+    for _, row in df.iterrows():
+        scfs = cone_scf_single(row["radius_tubular"], row["thickness_tubular"], row["thickness_cone"], row["alpha"],
+                               row["junction"])
+        for method, locs in scfs.items():
+            for loc, scf in locs.items():
+                assert row[f"{method}_{loc}"] == pytest.approx(scf)
+        assert row["scf_max"] == max(row[col] for col in df if col.endswith("_tt") and not col.startswith("scf_"))
+
+
+def test_no_cones_is_an_empty_table_with_every_column(jacket, coned_jacket):
+    empty = screen_jkt_cones(jacket, nominal_stress_range=50.)
+    assert empty.empty
+    assert list(empty.columns) == list(screen_jkt_cones(coned_jacket, nominal_stress_range=50.).columns)
+
+
+@pytest.mark.parametrize("variable", ["alpha", "thickness_cone"])
+def test_sweep_of_every_cone_matches_the_single_cone_sweep(coned_jacket, variable):
+    df = screen_jkt_cones(coned_jacket)
+    sweep = sweep_jkt_cones(df, variable, xlim=20., n_pts=11)
+    assert sweep["x"].shape == (len(df), 11)
+    np.testing.assert_allclose(sweep["x"][:, [0, 10]], df[[variable]].to_numpy() * [0.8, 1.2])
+    for idx, row in df.iterrows():
+        numeric_inputs = {name: row[name] for name in ["radius_tubular", "thickness_tubular", "thickness_cone", "alpha"]}
+        single = cone_scf_sweep(row["junction"], variable, sweep["x"][idx], numeric_inputs)
+        for method in ["sect3", "appf17"]:
+            for loc in SCF_LOCS:
+                np.testing.assert_allclose(sweep[method][loc][idx], single[method][loc])
+                # the nominal value is the middle point
+                assert sweep[method][loc][idx, 5] == pytest.approx(row[f"{method}_{loc}"])
+
+
+def test_sweep_without_cones_and_of_an_unknown_variable(jacket, coned_jacket):
+    sweep = sweep_jkt_cones(screen_jkt_cones(jacket), "alpha", n_pts=11)
+    assert sweep["x"].shape == sweep["sect3"]["tube_in"].shape == (0, 11)
+    with pytest.raises(ValueError, match="cone_x_axis_vary must be one of"):
+        sweep_jkt_cones(screen_jkt_cones(coned_jacket), "length")
+
+
+def test_cones_route(coned_jacket):
+    from app import app
+
+    client = app.test_client()
+    assert client.get("/jktsections/cones").status_code == 400
+    config = get_default_config()
+    with client.session_transaction() as session:
+        session["jkt_json"] = json.dumps(config)
+        session["jktsections_form_data"] = {**default_sections_form(jacket_from_config(config)), "kjt_2_can_d": "2500"}
+    response = client.get("/jktsections/cones?nominal_stress_range=50")
+    assert response.status_code == 200
+    res = response.get_json()
+    expected = screen_jkt_cones(coned_jacket, nominal_stress_range=50.)
+    assert res["columns"] == list(expected.columns)
+    assert [cone["scf_max"] for cone in res["cones"]] == pytest.approx(expected["scf_max"].tolist())
+    assert "sweep" not in res
+
+    res = client.get("/jktsections/cones?sweep=alpha&xlim=5&n_pts=3").get_json()
+    sweep = sweep_jkt_cones(expected, "alpha", 5., 3)
+    assert res["sweep"]["variable"] == "alpha"
+    np.testing.assert_allclose(res["sweep"]["x"], sweep["x"])
+    np.testing.assert_allclose(res["sweep"]["appf17"]["cone_out"], sweep["appf17"]["cone_out"])
+    response = client.get("/jktsections/cones?sweep=length")
+    assert response.status_code == 400 and "cone_x_axis_vary must be one of" in response.get_json()["error"]
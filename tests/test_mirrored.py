@@ -0,0 +1,72 @@
+"""MirroredJoint2D and MirroredLeg views of the default jacket"""
+import copy
+import pickle
+
+import pytest
+
+from jktdesign.joint import MirroredJoint2D
+from jktdesign.leg import MirroredLeg
+
+
+def mirrored(objs, view_type):
+    views = [obj for obj in objs if isinstance(obj, view_type)]
+    assert views
+    return views
+
+
+def test_joint_view_shares_data_and_mirrors_points(jacket):
+    for view in mirrored(jacket.joint_objs, MirroredJoint2D):
+        source = view.source
+        for name in MirroredJoint2D.shared_attrs:
+            assert getattr(view, name) == getattr(source, name)
+        for name in MirroredJoint2D.mirrored_pts:
+            pt = getattr(source, name)
+            assert getattr(view, name) == (None if pt is None else [-pt[0], pt[1]])
+        for key, pt in source.stub_end_pts.items():
+            assert view.stub_end_pts[key] == [-pt[0], pt[1]]
+        for key, coords in source.joint_poly_coords_transf.items():
+            if key != "can" or not source.kinked_can:
+                assert view.joint_poly_coords_transf[key] == [[-x for x in coords[0]], coords[1]]
+        assert view.mirror and view.jt_name != source.jt_name
+
+
+def test_joint_view_follows_source_edits(jacket):
+    view = mirrored(jacket.joint_objs, MirroredJoint2D)[0]
+    can_length = view.source.can_length
+    try:
+        view.source.can_length = can_length + 100.
+        assert view.can_length == can_length + 100.
+    finally:
+        view.source.can_length = can_length
+
+
+def test_joint_view_hides_source_methods(jacket):
+    view = mirrored(jacket.joint_objs, MirroredJoint2D)[0]
+    for name in ["joint_poly_coords", "get_transf_stub_end_pt", "create_joint"]:
+        with pytest.raises(AttributeError, match="not available on the mirrored view"):
+            getattr(view, name)
+    with pytest.raises(RuntimeError, match="mirrored view"):
+        view.transform_joint()
+    with pytest.raises(RuntimeError, match="mirrored view"):
+        view.extend_kjt_Can_and_kink()
+
+
+def test_leg_view_shares_data_and_mirrors_points(jacket):
+    for view in mirrored(jacket.leg_objs, MirroredLeg):
+        source = view.source
+        for name in MirroredLeg.shared_attrs:
+            assert getattr(view, name) == getattr(source, name)
+        assert view.pt1 == [-source.pt1[0], source.pt1[1]] and view.pt2 == [-source.pt2[0], source.pt2[1]]
+        assert view.pts == [[-x, y] for x, y in source.pts]
+        for view_coords, coords in zip(view.leg_a_poly_coords, source.leg_a_poly_coords):
+            assert view_coords == [[-x for x in coords[0]], coords[1]]
+        with pytest.raises(AttributeError, match="not available on the mirrored view"):
+            view.construct_leg
+
+
+def test_views_can_be_copied_and_pickled(jacket):
+    joint, leg = mirrored(jacket.joint_objs, MirroredJoint2D)[0], mirrored(jacket.leg_objs, MirroredLeg)[0]
+    for clone in [copy.deepcopy(joint), pickle.loads(pickle.dumps(joint))]:
+        assert clone.source is not joint.source and clone.stub_end_pts == joint.stub_end_pts
+    for clone in [copy.deepcopy(leg), pickle.loads(pickle.dumps(leg))]:
+        assert clone.source is not leg.source and clone.pts == leg.pts
@@ -0,0 +1,106 @@
+"""ResultCache lookups, LRU and SQLite eviction, code version keys and the admin endpoints"""
+import pickle
+
+import pytest
+
+import blueprints
+from resultcache import LRUBackend, ResultCache, SQLiteBackend
+
+CALLS = []
+
+
+def area(d, t):
+    CALLS.append((d, t))
+    return {"area": d * t}
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    CALLS.clear()
+
+
+def test_repeated_calls_are_local_hits():
+    cache = ResultCache("test", version="v1")
+    first = cache.call(area, (1000., 40.), {})
+    first["area"] = 0.  # hits are fresh copies
+    assert cache.call(area, (1000., 40.), {}) == {"area": 40000.}
+    assert cache.call(area, (1000., 50.), {}) == {"area": 50000.}
+    assert CALLS == [(1000., 40.), (1000., 50.)]
+    assert (cache.local_hits, cache.misses) == (1, 2)
+
+
+def test_shared_backend_serves_other_workers(tmp_path):
+    shared = SQLiteBackend(str(tmp_path / "results.db"))
+    worker_1 = ResultCache("test", shared=shared, version="v1")
+    worker_2 = ResultCache("test", shared=shared, version="v1")
+    worker_1.call(area, (1000., 40.), {})
+    assert worker_2.call(area, (1000., 40.), {}) == {"area": 40000.}
+    assert len(CALLS) == 1 and worker_2.shared_hits == 1
+    # copied to the local LRU of the second worker
+    worker_2.call(area, (1000., 40.), {})
+    assert worker_2.local_hits == 1
+
+
+def test_code_version_is_part_of_the_key(tmp_path):
+    shared = SQLiteBackend(str(tmp_path / "results.db"))
+    ResultCache("test", shared=shared, version="v1").call(area, (1000., 40.), {})
+    new_code = ResultCache("test", shared=shared, version="v2")
+    new_code.call(area, (1000., 40.), {})
+    assert len(CALLS) == 2 and new_code.shared_hits == 0
+    assert new_code.key(area, (1000., 40.), {}) != ResultCache("test", version="v1").key(area, (1000., 40.), {})
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUBackend(max_entries=2)
+    for key in ["a", "b"]:
+        lru.set(key, pickle.dumps(key), float("inf"))
+    lru.get("a")
+    lru.set("c", pickle.dumps("c"), float("inf"))
+    assert lru.get("b") is None and lru.get("a") is not None and len(lru) == 2
+
+    small = LRUBackend(max_bytes=100)
+    small.set("big", b"x" * 101, float("inf"))  # larger than the whole cache, not stored
+    small.set("a", b"x" * 60, float("inf"))
+    small.set("b", b"x" * 60, float("inf"))
+    assert (small.get("a"), len(small), small.nbytes) == (None, 1, 60)
+
+
+def test_expired_entries_are_misses():
+    lru = LRUBackend()
+    lru.set("a", b"value", 0.)
+    assert lru.get("a") is None and len(lru) == 0
+
+
+def test_sqlite_evicts_least_recently_read(tmp_path):
+    shared = SQLiteBackend(str(tmp_path / "results.db"), max_bytes=100)
+    shared.set("a", b"x" * 40, float("inf"))
+    shared.set("b", b"x" * 40, float("inf"))
+    shared.get("a")
+    shared.set("c", b"x" * 40, float("inf"))
+    assert shared.get("b") is None
+    assert shared.get("a") is not None and shared.get("c") is not None
+
+
+def test_admin_endpoints_are_off_without_a_token(monkeypatch):
+    from app import app
+
+    monkeypatch.setattr(blueprints, "ADMIN_TOKEN", None)
+    client = app.test_client()
+    assert client.get("/admin/cache").status_code == 404
+    assert client.get("/admin/import_report").status_code == 404 and client.get("/import_report").status_code == 404
+
+
+def test_admin_endpoints_need_the_token(monkeypatch):
+    from app import app
+
+    monkeypatch.setattr(blueprints, "ADMIN_TOKEN", "secret")
+    client = app.test_client()
+    assert client.get("/admin/cache").status_code == 403
+    assert client.get("/admin/cache", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert client.post("/admin/cache/clear").status_code == 403
+
+    response = client.get("/admin/cache", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200 and "version" in response.get_json()
+    assert client.get("/admin/import_report").status_code == 403
+    response = client.get("/admin/import_report", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200 and response.get_json()["views_loaded"] > 0
@@ -0,0 +1,40 @@
+"""the array RRF engine, called directly on structured joint arrays"""
+import numpy as np
+import pytest
+
+from rrfs.rrfengine import KMETHOD_BETAVALS, calc_rrfs, joints_from_parameters, make_joints
+from tubularjointscfs.efthymiou.reduction import taxial, xaxial, xbop
+
+
+def test_ty_axial_is_nan_above_the_beta_limit():
+    joints = make_joints("ty", 1000., 25., [500., 850., 900.], 20., np.radians(60.))
+    rrfs = calc_rrfs(joints)
+    expected = taxial(1000., 500., 25., 20., np.nan, np.radians(60.), np.nan)
+    assert rrfs["axial"][0] == pytest.approx(expected)
+    assert np.isfinite(rrfs["axial"][1]) and np.isnan(rrfs["axial"][2])
+    assert np.isfinite(rrfs["ipb"]).all() and np.isfinite(rrfs["opb"]).all()
+
+
+@pytest.mark.parametrize("gamma", [8., 20., 32.])
+def test_x_kmethod_is_the_max_over_the_beta_values(gamma):
+    tau = np.linspace(0.2, 1.0, 17)
+    rrfs = calc_rrfs(joints_from_parameters("x", 0.95, gamma, tau))
+    D, T = 1., 1. / (2 * gamma)
+    for mode, f in [("axial", xaxial), ("opb", xbop)]:
+        brute_force = f(D, KMETHOD_BETAVALS[:, None] * D, T, tau * T, np.nan, np.nan, np.nan).max(axis=0)
+        np.testing.assert_allclose(rrfs[mode], brute_force, rtol=1e-12)
+
+
+def test_x_dnv_interpolates_to_0_85_at_beta_1():
+    rrfs_85 = calc_rrfs(joints_from_parameters("x", 0.85, 20., 0.5), x_method="DNV")
+    rrfs_1 = calc_rrfs(joints_from_parameters("x", 1.0, 20., 0.5), x_method="DNV")
+    for mode in ["axial", "ipb", "opb"]:
+        assert rrfs_1[mode] == pytest.approx(0.85)
+        assert rrfs_85[mode] != pytest.approx(0.85)
+
+
+def test_unknown_joint_type_and_method():
+    with pytest.raises(Exception, match="not recognised"):
+        calc_rrfs(make_joints("y", 1000., 25., 500., 20., 1.))
+    with pytest.raises(Exception, match="not recognised"):
+        calc_rrfs(joints_from_parameters("x", 0.9, 20., 0.5), x_method="other")
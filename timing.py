@@ -0,0 +1,105 @@
+"""span timers of the engine calls, no dependencies so that the engines can be timed without the web layer
+
+Engine functions decorated with timed() (and blocks in span()) add their duration to the SPAN_SECONDS histogram:
+
+    @timed()
+    def gc_processor(...):
+
+    with span("plot"):
+        ...
+
+profiling (the Flask side) adds a listener that collects the spans of each request for its Server-Timing header and
+serves SPAN_SECONDS on GET /metrics. Outside the app (batchrun, benchmarks, goldens) the spans are only counted.
+"""
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# upper bounds of the histogram buckets [s], +Inf is added
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1., 2.5, 5., 10., 30.)
+METRICS_PREFIX = "oswdesigntools"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs + ([extra] if extra else [])) + "}"
+
+
+class Histogram:
+    """cumulative (Prometheus) histogram of durations [s], one series per tuple of label values
+    """
+    def __init__(self, name, help_text, label_names, buckets=BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}  # label values: [count per bucket (+Inf last), sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0., 0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def exposition(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: ([*counts], total, n) for labels, (counts, total, n) in sorted(self._series.items())}
+        for label_values, (counts, total, n) in series.items():
+            cumulative = 0
+            for le, count in zip([*(f"{b:g}" for b in self.buckets), "+Inf"], counts):
+                cumulative += count
+                labels = _labels(self.label_names, label_values, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, label_values)} {total:.6f}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, label_values)} {n}")
+        return lines
+
+
+SPAN_SECONDS = Histogram(f"{METRICS_PREFIX}_span_duration_seconds",
+                         "Time in request parsing, engine calls, plotting, rendering and serialisation", ("span",))
+# functions (name, seconds) called with every span, e.g. to collect the spans of a request
+SPAN_LISTENERS = []
+
+
+def record_span(name, seconds):
+    """add a span to the histogram and pass it to the listeners
+    """
+    SPAN_SECONDS.observe((name,), seconds)
+    for listener in SPAN_LISTENERS:
+        listener(name, seconds)
+
+
+@contextmanager
+def span(name):
+    """time the block as the span called name
+    """
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - t0)
+
+
+def timed(name=None):
+    """decorator timing each call of the function as a span, named after the function (qualified name) by default
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -6,6 +6,7 @@ import matplotlib
 matplotlib.use('Agg')
 import base64
 import io
+from timing import timed
 
 
 
@@ -84,6 +85,7 @@ def create_plotly_plot(xvals, yvals_dict, x_label, y_label="SCF", plot_title=Non
     return plot_json
 
 
+@timed()
 def create_joint_plots(jt_obj, x_axis_desc, stress_adjusted, no_braces):
     """creates the plotting objects for Flask site
 
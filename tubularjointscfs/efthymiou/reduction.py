@@ -68,7 +68,7 @@ def kbip(d1, d2, thk1, thk2, length, theta, g):
     rf = 3.04 * (((0.31 * beta) / (((beta ** 2) + (0.77 ** 2)) ** 2)) + 0.37) * \
         (((0.44 * tau) / (((tau ** 2) + (0.67 ** 2)) ** 2)) + 0.13) * \
         (1.97 - (zeta ** -0.13)) * \
-        (6.22 + 10.6 * theta - 5.034 * (theta ** 2))
+        (6.22 - 10.6 * theta + 5.034 * (theta ** 2))
     
     # return rf
     return rf
@@ -702,7 +702,7 @@ def k2(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab,
     theta_max = np.maximum(theta_a, theta_b)
     theta_min = np.minimum(theta_a, theta_b)
 
-    if g_ab <= 0:
+    if np.any(np.asarray(g_ab) <= 0):
         raise Exception("SCFs only calculated when gap is larger than 0! Please make g_ab > 0.")
 
     # calculate scf for A and B using K1
@@ -716,7 +716,7 @@ def k2(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab,
 
     if three_braces:
 
-        if g_bc <= 0:
+        if np.any(np.asarray(g_bc) <= 0):
             raise Exception("SCFs only calculated when gap is larger than 0! Please make g_bc > 0.")
 
         beta_c = d2_c / d1
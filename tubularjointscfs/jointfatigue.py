@@ -0,0 +1,266 @@
+"""weld toe and weld root fatigue of X, TY, K and KT tubular joints
+
+Toe hot spot stresses use the Efthymiou SCFs, root stresses the DNV-RP-C203 Table F-6 root reduction factors (RRFs)
+applied to the governing chord side toe SCF of each load mode (of each brace for K and KT joints). All joints,
+locations and histogram bins are evaluated together, i.e. arrays of shape (n_joints, n_locs, n_bins). joint_fatigue
+assesses X and TY joints, k_joint_fatigue K and KT joints (the SCFs of tubularjointscfs.scfengine).
+"""
+import numpy as np
+import pandas as pd
+# local imports
+from tubularjointscfs.efthymiou.scf import x1, x2, x3, x4, t8, t9, x5, x6, x7, t1, t2, t3, t4, t6, x8, t7, t10, t11
+from tubularjointscfs.efthymiou.constants import SNCURVES, SNcurve
+from tubularjointscfs.efthymiou.damage import DamageError
+from tubularjointscfs.scfengine import K_LOAD_TYPES, K_LOCS, KT_LOCS, k_joint_scfs_arr, kt_joint_scfs_arr
+from rrfs.rrfengine import make_joints, calc_rrfs
+
+JOINT_TYPES = ["x", "ty"]
+LOAD_MODES = ["axial", "ipb", "opb"]
+# same order as XTYJointSCFManager._calculate_scfs_x_joint / _calculate_scfs_ty_joint
+TOE_LOCS = ["axial_chord_saddle", "axial_chord_crown", "axial_brace_saddle", "axial_brace_crown",
+            "ipb_chord_crown", "ipb_brace_crown", "opb_chord_saddle", "opb_brace_saddle"]
+ROOT_LOCS = [f"{mode}_root" for mode in LOAD_MODES]
+JOINT_COLUMNS = ["D", "T", "d", "t", "theta", "L"]
+# K and KT joint columns, as the /k_joint and /kt_joint pages (thetas in radians)
+K_JOINT_COLUMNS = {"k": ["D", "T", "dA", "tA", "thetaA", "dB", "tB", "thetaB", "g_ab", "L"],
+                   "kt": ["D", "T", "dA", "tA", "thetaA", "dB", "tB", "thetaB", "dC", "tC", "thetaC", "g_ab", "g_bc",
+                          "L"]}
+
+
+def joint_parameters(D, T, d, t, theta):
+    """non-dimensional joint parameters, theta [radians] is passed through
+
+    Returns:
+        dict of numpy arrays, beta, gamma, tau and theta
+    """
+    D, T, d, t, theta = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (D, T, d, t, theta)))
+    return {"beta": d / D, "gamma": D / (2 * T), "tau": t / T, "theta": theta}
+
+
+def x_joint_mask(joint_type):
+    """True where the joint is an X joint, False for TY joints
+    """
+    arr = np.asarray(joint_type)
+    if not np.isin(arr, JOINT_TYPES).all():
+        raise ValueError(f"joint_type must be one of {JOINT_TYPES}")
+    return arr == "x"
+
+
+def toe_scfs_arr(D, T, d, t, theta, L, joint_type, load_type="balanced_forces", c=0.7):
+    """weld toe SCFs for X and TY joints (theta in radians), all load modes. The X joint equations follow load_type
+    ("balanced_forces" or "single_brace_load"), TY joints are single brace only.
+
+    Returns:
+        numpy array of shape (8, n_joints), rows in TOE_LOCS order
+    """
+    D, T, d, t, theta, L = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (D, T, d, t, theta, L)))
+    is_x = x_joint_mask(joint_type)
+
+    if load_type == "balanced_forces":
+        scfs_x = [x1(D, d, T, t, theta), x2(D, d, T, t, theta), x3(D, d, T, t, theta), x4(D, d, T),
+                  t8(D, d, T, t, theta), t9(D, d, T, t, theta), x5(D, d, T, t, theta), x6(D, d, T, t, theta)]
+    elif load_type == "single_brace_load":
+        scfs_x = [x7(D, d, T, t, L, theta, c), t6(D, d, T, t, L, theta, c), x8(D, d, T, t, L, theta),
+                  t7(D, d, T, t, L, c), t8(D, d, T, t, theta), t9(D, d, T, t, theta), t10(D, d, T, t, theta),
+                  t11(D, d, T, t, theta)]
+    else:
+        raise ValueError(f"load_type {load_type} not allowed, use 'balanced_forces' or 'single_brace_load'")
+
+    scfs_ty = [t1(D, d, T, t, theta), t2(D, d, T, t, L, theta), t3(D, d, T, t, L, theta), t4(D, d, T, t, L),
+               t8(D, d, T, t, theta), t9(D, d, T, t, theta), t10(D, d, T, t, theta), t11(D, d, T, t, theta)]
+
+    return np.where(is_x, np.stack(scfs_x), np.stack(scfs_ty))
+
+
+def root_rrfs_arr(D, T, d, t, theta, L, joint_type, x_method="KMethod"):
+    """weld root reduction factors (DNV-RP-C203 Table F-6, rrfs.rrfengine) for X and TY joints, theta in radians
+
+    Returns:
+        numpy array of shape (3, n_joints), rows in LOAD_MODES order
+    """
+    x_joint_mask(joint_type)  # validates the joint types, K joints are not assessed here
+    rrfs = calc_rrfs(make_joints(joint_type, D, T, d, t, theta, L=L), x_method=x_method)
+    return np.stack([rrfs[mode] for mode in LOAD_MODES])
+
+
+def k_root_rrfs_arr(D, T, d, t, theta, g):
+    """weld root reduction factors of one brace of K (or KT) joints, g the gap to the adjacent brace, theta in radians
+
+    Returns:
+        numpy array of shape (3, n_joints), rows in LOAD_MODES order
+    """
+    rrfs = calc_rrfs(make_joints("k", D, T, d, t, theta, g=g))
+    return np.stack([rrfs[mode] for mode in LOAD_MODES])
+
+
+def get_sncurve(sncurve):
+    """SNcurve from a name in SNCURVES or an SNcurve. Angle dependent (planar) curves are not supported
+    """
+    if isinstance(sncurve, SNcurve):
+        return sncurve
+    _sncurve = SNCURVES.get(str(sncurve).upper())
+    if not isinstance(_sncurve, SNcurve):
+        raise DamageError('SN curve {} not found or angle dependent'.format(sncurve))
+    return _sncurve
+
+
+def damage_arr(cycles, ranges, sncurves, thickness, scf):
+    """fatigue damage per histogram bin, a broadcast version of Damage._getdamage
+
+    Args:
+        cycles, ranges: numpy arrays of shape (n_bins,), the stress histogram
+        sncurves: list of SNcurve, one per location (second to last axis of scf)
+        thickness: numpy array broadcastable to scf, thickness used in the thickness correction
+        scf: numpy array of shape (..., n_locs), stress multiplier at each location
+
+    Returns:
+        numpy array of shape (..., n_locs, n_bins)
+    """
+    # curve parameters, shape (n_locs, 1) to broadcast over the histogram bins
+    log10a1, m1, log10a2, m2, k, tref, nlimit = (np.array([getattr(c, p) for c in sncurves], dtype=float)[:, None]
+                                                 for p in ("log10a1", "m1", "log10a2", "m2", "k", "tref", "Nlimit"))
+    tovertref = np.maximum(np.asarray(thickness, dtype=float)[..., None] / tref, 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_range = np.log10(np.asarray(ranges, dtype=float) * np.asarray(scf, dtype=float)[..., None] *
+                             tovertref ** k)
+        nci1 = np.power(10, log10a1 - m1 * log_range)
+        nci2 = np.power(10, log10a2 - m2 * log_range)
+        damages = np.asarray(cycles, dtype=float) / np.where(nci1 > nlimit, nci2, nci1)
+    # zero stress ranges give nan or inf, as in Damage._getdamage these are no damage
+    damages[~np.isfinite(damages)] = 0.0
+    return damages
+
+
+def joint_fatigue(joints, histogram, joint_type="x", load_type="balanced_forces", toe_sncurve="TAIR",
+                  root_sncurve="F3AIR", c=0.7):
+    """weld toe and weld root fatigue damage for a set of X and TY joints from a single nominal stress histogram.
+
+    Every load mode is assessed with the same nominal brace stress histogram. Toe hot spot stress ranges are
+    SCF x range, root stress ranges are RRF x (governing chord side toe SCF of that load mode) x range. Chord side toe
+    and root locations use the chord thickness T, brace side locations the brace thickness t. Root locations without an
+    RRF (T/Y joint axial where beta > 0.85) have no root damage.
+
+    Args:
+        joints (pd.DataFrame or dict): columns D, T, d, t, theta [radians], L and optionally joint_type
+        histogram: 2D array-like of shape [2, n_bins], [0, :] cycles and [1, :] nominal stress ranges
+        joint_type (str): "x" or "ty", used if joints has no joint_type column
+        load_type (str): X joint SCF load type, "balanced_forces" or "single_brace_load"
+        toe_sncurve, root_sncurve: SN curve names (SNCURVES keys) or SNcurve objects
+        c (float): chord end fixity parameter
+
+    Returns:
+        pd.DataFrame, one row per joint with parameters, SCFs, RRFs, damages and the governing location
+    """
+    df = pd.DataFrame(joints).reset_index(drop=True)
+    if "joint_type" not in df:
+        df["joint_type"] = joint_type
+    D, T, d, t, theta, L = (df[col].to_numpy(dtype=float) for col in JOINT_COLUMNS)
+    jt_type = df["joint_type"].str.lower().to_numpy()
+
+    for name, vals in joint_parameters(D, T, d, t, theta).items():
+        if name != "theta":
+            df[name] = vals
+
+    scfs = toe_scfs_arr(D, T, d, t, theta, L, jt_type, load_type, c)  # (8, n_joints)
+    rrfs = root_rrfs_arr(D, T, d, t, theta, L, jt_type)  # (3, n_joints)
+    # governing chord side toe SCF per load mode, the root stress is reduced from this hot spot stress
+    scf_chord = np.stack([np.maximum(scfs[0], scfs[1]), scfs[4], scfs[6]])
+
+    brace_side = np.array(["brace" in loc for loc in TOE_LOCS])[:, None]
+    thk_toe = np.where(brace_side, t, T)
+    for idx, loc in enumerate(TOE_LOCS):
+        df[f"scf_{loc}"] = scfs[idx]
+    for idx, mode in enumerate(LOAD_MODES):
+        df[f"rrf_{mode}"] = rrfs[idx]
+    return _add_damages(df, histogram, TOE_LOCS, scfs, thk_toe, ROOT_LOCS, rrfs * scf_chord,
+                        np.broadcast_to(T, rrfs.shape), toe_sncurve, root_sncurve)
+
+
+def k_joint_fatigue(joints, histogram, joint_type="k", load_type="balanced_axial_unbalanced_moment",
+                    toe_sncurve="TAIR", root_sncurve="F3AIR", c=0.7):
+    """weld toe and weld root fatigue damage for a set of K or KT joints from a single nominal stress histogram.
+
+    As joint_fatigue, per brace: the toe SCFs are those of the K and KT joint engines (K_LOCS or KT_LOCS), the root
+    RRFs are the Table F-6 K joint RRFs of each brace with the gap to its neighbour (the smaller gap for the middle
+    brace of a KT joint), applied to the governing chord side toe SCF of that brace and load mode.
+
+    Args:
+        joints (pd.DataFrame or dict): columns K_JOINT_COLUMNS[joint_type], thetas in radians
+        histogram: 2D array-like of shape [2, n_bins], [0, :] cycles and [1, :] nominal stress ranges
+        joint_type (str): "k" or "kt"
+        load_type (str): one of scfengine.K_LOAD_TYPES
+        toe_sncurve, root_sncurve: SN curve names (SNCURVES keys) or SNcurve objects
+        c (float): chord end fixity parameter
+
+    Returns:
+        pd.DataFrame, one row per joint with parameters, SCFs, RRFs, damages and the governing location
+    """
+    if joint_type not in K_JOINT_COLUMNS:
+        raise ValueError(f"joint_type must be one of {list(K_JOINT_COLUMNS)}")
+    if load_type not in K_LOAD_TYPES:
+        raise ValueError(f"load_type {load_type} not allowed, use one of {K_LOAD_TYPES}")
+    df = pd.DataFrame(joints).reset_index(drop=True)
+    df["joint_type"] = joint_type
+    cols = {col: df[col].to_numpy(dtype=float) for col in K_JOINT_COLUMNS[joint_type]}
+    D, T, L = cols["D"], cols["T"], cols["L"]
+    braces = "abc" if joint_type == "kt" else "ab"
+    d, t, theta = ({b: cols[f"{p}{b.upper()}"] for b in braces} for p in ("d", "t", "theta"))
+    gaps = {"a": cols["g_ab"], "b": cols["g_ab"]}
+    if joint_type == "kt":
+        gaps.update({"b": np.minimum(cols["g_ab"], cols["g_bc"]), "c": cols["g_bc"]})
+
+    for b in braces:
+        params = joint_parameters(D, T, d[b], t[b], theta[b])
+        df[f"beta_{b}"], df[f"tau_{b}"] = params["beta"], params["tau"]
+    df["gamma"] = D / (2 * T)
+
+    if joint_type == "k":
+        scfs = k_joint_scfs_arr(D, d["a"], d["b"], T, t["a"], t["b"], theta["a"], theta["b"], gaps["a"], L,
+                                load_type, c)
+        toe_locs = K_LOCS
+    else:
+        scfs = kt_joint_scfs_arr(D, d["a"], d["b"], d["c"], T, t["a"], t["b"], t["c"], theta["a"], theta["b"],
+                                 theta["c"], cols["g_ab"], cols["g_bc"], L, load_type, c)
+        toe_locs = KT_LOCS
+    row = {loc: idx for idx, loc in enumerate(toe_locs)}
+
+    rrfs, scf_chord, root_locs = [], [], []
+    for b in braces:
+        rrfs.append(k_root_rrfs_arr(D, T, d[b], t[b], theta[b], gaps[b]))
+        axial = np.maximum(scfs[row[f"axial_{b}_chord_crown"]], scfs[row[f"axial_{b}_chord_saddle"]])
+        scf_chord.append(np.stack([axial, scfs[row[f"ipb_{b}_chord_crown"]], scfs[row[f"opb_{b}_chord_saddle"]]]))
+        root_locs += [f"{mode}_{b}_root" for mode in LOAD_MODES]
+    rrfs, scf_chord = np.concatenate(rrfs), np.concatenate(scf_chord)
+
+    # brace side toe locations use the thickness of their brace (the letter after the load mode)
+    thk_toe = np.stack([t[loc.split("_")[1]] if "brace" in loc else T for loc in toe_locs])
+    for idx, loc in enumerate(toe_locs):
+        df[f"scf_{loc}"] = scfs[idx]
+    for idx, loc in enumerate(root_locs):
+        df[f"rrf_{loc[:-len('_root')]}"] = rrfs[idx]
+    return _add_damages(df, histogram, toe_locs, scfs, thk_toe, root_locs, rrfs * scf_chord,
+                        np.broadcast_to(T, rrfs.shape), toe_sncurve, root_sncurve)
+
+
+def _add_damages(df, histogram, toe_locs, scf_toe, thk_toe, root_locs, scf_root, thk_root, toe_sncurve,
+                 root_sncurve):
+    """add the damage of every toe and root location (stress multipliers and thicknesses of shape (n_locs, n_joints))
+    to df, with the governing toe and root damages and location
+    """
+    cycles, ranges = np.asarray(histogram, dtype=float)
+    # all toe and root locations at once, shape (n_joints, n_locs)
+    scf_all = np.concatenate([scf_toe, scf_root]).T
+    thk_all = np.concatenate([thk_toe, thk_root]).T
+    sncurves = [get_sncurve(toe_sncurve)] * len(toe_locs) + [get_sncurve(root_sncurve)] * len(root_locs)
+    damages = damage_arr(cycles, ranges, sncurves, thk_all, scf_all).sum(axis=-1)
+
+    locs = list(toe_locs) + list(root_locs)
+    for idx, loc in enumerate(locs):
+        df[f"damage_{loc}"] = damages[:, idx]
+
+    n_toe = len(toe_locs)
+    df["damage_toe"] = damages[:, :n_toe].max(axis=1)
+    df["damage_root"] = damages[:, n_toe:].max(axis=1)
+    df["damage_max_loc"] = np.array(locs)[np.argmax(damages, axis=1)]
+    df["root_governed"] = df["damage_root"] > df["damage_toe"]
+    return df
@@ -0,0 +1,34 @@
+"""SCFs and plots of the K, KT, X and TY joint pages, cached on the page inputs (see resultcache)
+"""
+# local imports
+from resultcache import cached
+from tubularjointscfs.core import create_joint_plots
+from tubularjointscfs.scfs_kt_jts import KTJointSCFManager
+from tubularjointscfs.scfs_xty_jts import XTYJointSCFManager
+
+# joint type: (SCF manager, no of brace attachments)
+JOINT_MANAGERS = {"k": (KTJointSCFManager, 2), "kt": (KTJointSCFManager, 3),
+                  "x": (XTYJointSCFManager, 1), "ty": (XTYJointSCFManager, 1)}
+
+
+@cached("scf")
+def joint_scfs_and_plots(joint_type, x_axis_desc, input_fields, stress_adjusted, load_type):
+    """SCF manager of the joint (angles converted back to degrees) and its plots
+
+    Args:
+        joint_type: "k", "kt", "x" or "ty"
+        x_axis_desc: name of the input varied along the plot x axis, e.g. "D"
+        input_fields: dict of the joint inputs as floats, angles in radians
+        stress_adjusted: SCFs adjusted for the brace to chord stress ratio
+        load_type: load case of the SCFs, e.g. "balanced_axial_unbalanced_moment"
+
+    Returns:
+        jt_obj, tuple of the plot data (chord side and brace side plots of each brace) from create_joint_plots
+    """
+    manager, no_braces = JOINT_MANAGERS[joint_type]
+    jt_obj = manager(x_axis_desc, input_fields, stress_adjusted, joint_type=joint_type)
+    jt_obj.get_joint_scfs(load_type)
+    # convert theta angles back to degrees for plotting
+    jt_obj.convert_angles_to_degrees(x_axis_desc)
+
+    return jt_obj, create_joint_plots(jt_obj, x_axis_desc, stress_adjusted, no_braces=no_braces)
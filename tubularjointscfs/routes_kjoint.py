@@ -1,7 +1,7 @@
 from flask import request, render_template, flash
-from tubularjointscfs.core import create_joint_plots
 import numpy as np
-from tubularjointscfs.scfs_kt_jts import KTJointSCFManager, ChordPropertyManager
+from tubularjointscfs.jointresults import joint_scfs_and_plots
+from tubularjointscfs.scfs_kt_jts import ChordPropertyManager
 
 # Define default values
 DEFAULT_VALUES_K = {'D': 1000, 'T': 20, 'dA': 500, 'tA': 15, 'thetaA': 45,
@@ -69,14 +69,9 @@ def k_joint_route():
 
         stress_adjusted = True if scf_options == "scf_stress_adjusted" else False
 
-        kjt_obj = KTJointSCFManager(x_axis_desc, input_fields, stress_adjusted)
-        kjt_obj.get_joint_scfs(load_type)
-
-        # convert theta angles back to radians for plotting
-        kjt_obj.convert_angles_to_degrees(x_axis_desc)
-
-        # get the plot data for a K joint (no of brace attachments is 2
-        plot_data_a_cs, plot_data_a_bs, plot_data_b_cs, plot_data_b_bs = create_joint_plots(kjt_obj, x_axis_desc, stress_adjusted, no_braces=2)
+        # get the K joint SCFs and plot data (no of brace attachments is 2), cached on the inputs
+        kjt_obj, plots = joint_scfs_and_plots("k", x_axis_desc, input_fields, stress_adjusted, load_type)
+        plot_data_a_cs, plot_data_a_bs, plot_data_b_cs, plot_data_b_bs = plots
 
 
     except Exception as e:
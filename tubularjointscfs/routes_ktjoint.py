@@ -1,7 +1,6 @@
 from flask import request, render_template, flash
-from tubularjointscfs.core import create_plot, create_joint_plots
 import numpy as np
-from tubularjointscfs.scfs_kt_jts import KTJointSCFManager, ChordPropertyManager
+from tubularjointscfs.jointresults import joint_scfs_and_plots
 
 # Define default values
 DEFAULT_VALUES_KT = {'D_kt': 1000, 'T_kt': 20,
@@ -116,16 +115,11 @@ def kt_joint_route():
 
         stress_adjusted = True if scf_options == "scf_stress_adjusted" else False
 
-        ktjt_obj = KTJointSCFManager(x_axis_mapped, input_fields, stress_adjusted, joint_type="kt")
-        ktjt_obj.get_joint_scfs(load_type)
-
-        # convert theta angles back to radians for plotting
-        ktjt_obj.convert_angles_to_degrees(x_axis_mapped)
-
-        # get the plot data for a KT joint (no of brace attachments is 3)
+        # get the KT joint SCFs and plot data (no of brace attachments is 3), cached on the inputs
+        ktjt_obj, plots = joint_scfs_and_plots("kt", x_axis_mapped, input_fields, stress_adjusted, load_type)
         (plot_data_a_cs_kt, plot_data_a_bs_kt,
          plot_data_b_cs_kt, plot_data_b_bs_kt,
-         plot_data_c_cs_kt, plot_data_c_bs_kt) = create_joint_plots(ktjt_obj, x_axis_mapped, stress_adjusted, no_braces=3)
+         plot_data_c_cs_kt, plot_data_c_bs_kt) = plots
 
     except Exception as e:
         flash(f"An error occurred: {e}")
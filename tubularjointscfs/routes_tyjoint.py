@@ -1,8 +1,7 @@
 from flask import request, render_template, flash
 import numpy as np
 
-from tubularjointscfs.core import create_plot, create_joint_plots
-from tubularjointscfs.scfs_xty_jts import XTYJointSCFManager
+from tubularjointscfs.jointresults import joint_scfs_and_plots
 
 # Define default values
 DEFAULT_VALUES_TY = {'D_ty': 1000, 'T_ty': 20, 'd_ty': 500, 't_ty': 15, 'theta_ty': 45, 'L_ty': 5000, 'C_ty': 0.7,
@@ -57,12 +56,9 @@ def ty_joint_route():
         # get the plots and x joint object
         stress_adjusted = True if scf_options == "scf_stress_adjusted" else False
         # get scfs for the Joint type  # todo make Object a better name
-        tyjt_obj = XTYJointSCFManager(x_axis_mapped, input_fields, stress_adjusted, joint_type="ty")
-        tyjt_obj.get_joint_scfs(load_type)
-        # convert theta angles back to radians for plotting
-        tyjt_obj.convert_angles_to_degrees(x_axis_mapped)
-        # make the plots
-        plot_data_a_cs_ty, plot_data_a_bs_ty = create_joint_plots(tyjt_obj, x_axis_mapped, stress_adjusted, no_braces=1)
+        # and make the plots, cached on the inputs
+        tyjt_obj, (plot_data_a_cs_ty, plot_data_a_bs_ty) = joint_scfs_and_plots("ty", x_axis_mapped, input_fields,
+                                                                                stress_adjusted, load_type)
 
     except Exception as e:
         flash(f"An error occurred: {e}")
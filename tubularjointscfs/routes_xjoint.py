@@ -1,8 +1,7 @@
 from flask import request, render_template, flash
 import numpy as np
 
-from tubularjointscfs.core import create_joint_plots
-from tubularjointscfs.scfs_xty_jts import XTYJointSCFManager
+from tubularjointscfs.jointresults import joint_scfs_and_plots
 
 # Define default values
 DEFAULT_VALUES_X = {'Dx': 1000, 'Tx': 20, 'dax': 500, 'tax': 15, 'thetax': 45, 'Lx': 5000, 'Cx': 0.7,
@@ -58,12 +57,9 @@ def x_joint_route():
         # get the plots and x joint object
         stress_adjusted = True if scf_options == "scf_stress_adjusted" else False
         # get scfs for the Joint type  # todo make Object a better name
-        xjt_obj = XTYJointSCFManager(x_axis_mapped, input_fields, stress_adjusted, joint_type="x")
-        xjt_obj.get_joint_scfs(load_type)
-        # convert theta angles back to radians for plotting
-        xjt_obj.convert_angles_to_degrees(x_axis_mapped)
-        # make the plots
-        plot_data_a_cs_x, plot_data_a_bs_x = create_joint_plots(xjt_obj, x_axis_mapped, stress_adjusted, no_braces=1)
+        # and make the plots, cached on the inputs
+        xjt_obj, (plot_data_a_cs_x, plot_data_a_bs_x) = joint_scfs_and_plots("x", x_axis_mapped, input_fields,
+                                                                             stress_adjusted, load_type)
 
     except Exception as e:
         flash(f"An error occurred: {e}")
@@ -0,0 +1,123 @@
+"""array versions of the K and KT joint SCF calculations (Efthymiou equations, DNV-RP-C203 Table B-3 and B-4)
+
+All geometry inputs are broadcast against each other, angles in radians. Used by KTJointSCFManager (one joint at a
+time) and by the JSON api (many joints per call). X and TY joint SCFs are in tubularjointscfs.jointfatigue.toe_scfs_arr.
+"""
+import numpy as np
+# local imports
+from tubularjointscfs.efthymiou.scf import k1, k2, t8, t9, k4, k5, t5, t7, t6, t3, k7, k6, kt1, kt2, kt3, kt4, opb_brace
+
+K_LOAD_TYPES = ["balanced_axial_unbalanced_moment", "single_brace_load"]
+# same order as KTJointSCFManager._calculate_k_scfs / _calculate_kt_scfs
+K_LOCS = ["axial_a_chord_crown", "axial_a_brace_crown", "axial_b_chord_crown", "axial_b_brace_crown",
+          "axial_a_chord_saddle", "axial_a_brace_saddle", "axial_b_chord_saddle", "axial_b_brace_saddle",
+          "ipb_a_chord_crown", "ipb_a_brace_crown", "ipb_b_chord_crown", "ipb_b_brace_crown",
+          "opb_a_chord_saddle", "opb_a_brace_saddle", "opb_b_chord_saddle", "opb_b_brace_saddle"]
+KT_LOCS = ["axial_a_chord_crown", "axial_a_brace_crown", "axial_b_chord_crown", "axial_b_brace_crown",
+           "axial_c_chord_crown", "axial_c_brace_crown",
+           "axial_a_chord_saddle", "axial_a_brace_saddle", "axial_b_chord_saddle", "axial_b_brace_saddle",
+           "axial_c_chord_saddle", "axial_c_brace_saddle",
+           "ipb_a_chord_crown", "ipb_a_brace_crown", "ipb_b_chord_crown", "ipb_b_brace_crown",
+           "ipb_c_chord_crown", "ipb_c_brace_crown",
+           "opb_a_chord_saddle", "opb_a_brace_saddle", "opb_b_chord_saddle", "opb_b_brace_saddle",
+           "opb_c_chord_saddle", "opb_c_brace_saddle"]
+
+
+def k_joint_scfs_arr(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab, L,
+                     load_type="balanced_axial_unbalanced_moment", c=0.7):
+    """SCFs of K joints (braces A and B), theta in radians
+
+    Returns:
+        numpy array of shape (16, ...), rows in K_LOCS order
+    """
+    d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab, L = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab, L)))
+
+    if load_type == "balanced_axial_unbalanced_moment":
+        # AXIAL, brace A and B chord side and brace side (crowns and saddles use the same equations)
+        scf_axial_a_chord_crown, scf_axial_b_chord_crown, _ = k1(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab)
+        scf_axial_a_brace_crown, scf_axial_b_brace_crown, _ = k2(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab)
+        scf_axial_a_chord_saddle, scf_axial_b_chord_saddle = scf_axial_a_chord_crown, scf_axial_b_chord_crown
+        scf_axial_a_brace_saddle, scf_axial_b_brace_saddle = scf_axial_a_brace_crown, scf_axial_b_brace_crown
+        # OPB, brace A and brace B chord side and brace side saddles
+        scf_opb_a_chord_saddle, scf_opb_b_chord_saddle = k4(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab)
+        scf_opb_a_brace_saddle, scf_opb_b_brace_saddle = k5(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab)
+
+    elif load_type == "single_brace_load":
+        # AXIAL
+        scf_axial_a_chord_crown, scf_axial_b_chord_crown = t6(d1, d2_a, thk1, thk2_a, L, theta_a, c), t6(d1, d2_b, thk1, thk2_b, L, theta_b, c)
+        scf_axial_a_brace_crown, scf_axial_b_brace_crown = t7(d1, d2_a, thk1, thk2_a, L, c), t7(d1, d2_b, thk1, thk2_b, L, c)
+        scf_axial_a_chord_saddle, scf_axial_b_chord_saddle = t5(d1, d2_a, thk1, thk2_a, L, theta_a, c), t5(d1, d2_b, thk1, thk2_b, L, theta_b, c)
+        scf_axial_a_brace_saddle, scf_axial_b_brace_saddle = t3(d1, d2_a, thk1, thk2_a, L, theta_a), t3(d1, d2_b, thk1, thk2_b, L, theta_b)
+        # OPB
+        scf_opb_a_chord_saddle, scf_opb_b_chord_saddle = k6(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab)
+        scf_opb_a_brace_saddle, scf_opb_b_brace_saddle = k7(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab)
+
+    else:
+        raise ValueError(f"load_type {load_type} not allowed, use one of {K_LOAD_TYPES}")
+
+    # IPB, same for both load types
+    scf_ipb_a_chord_crown, scf_ipb_a_brace_crown = t8(d1, d2_a, thk1, thk2_a, theta_a), t9(d1, d2_a, thk1, thk2_a, theta_a)
+    scf_ipb_b_chord_crown, scf_ipb_b_brace_crown = t8(d1, d2_b, thk1, thk2_b, theta_b), t9(d1, d2_b, thk1, thk2_b, theta_b)
+
+    return np.stack(np.broadcast_arrays(
+        scf_axial_a_chord_crown, scf_axial_a_brace_crown, scf_axial_b_chord_crown, scf_axial_b_brace_crown,
+        scf_axial_a_chord_saddle, scf_axial_a_brace_saddle, scf_axial_b_chord_saddle, scf_axial_b_brace_saddle,
+        scf_ipb_a_chord_crown, scf_ipb_a_brace_crown, scf_ipb_b_chord_crown, scf_ipb_b_brace_crown,
+        scf_opb_a_chord_saddle, scf_opb_a_brace_saddle, scf_opb_b_chord_saddle, scf_opb_b_brace_saddle))
+
+
+def kt_joint_scfs_arr(d1, d2_a, d2_b, d2_c, thk1, thk2_a, thk2_b, thk2_c, theta_a, theta_b, theta_c, g_ab, g_bc, L,
+                      load_type="balanced_axial_unbalanced_moment", c=0.7):
+    """SCFs of KT joints (braces A, B and C, B is the middle brace), theta in radians
+
+    Returns:
+        numpy array of shape (24, ...), rows in KT_LOCS order
+    """
+    d1, d2_a, d2_b, d2_c, thk1, thk2_a, thk2_b, thk2_c, theta_a, theta_b, theta_c, g_ab, g_bc, L = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (d1, d2_a, d2_b, d2_c, thk1, thk2_a, thk2_b, thk2_c, theta_a, theta_b,
+                                               theta_c, g_ab, g_bc, L)))
+    d2s, thk2s, thetas = (d2_a, d2_b, d2_c), (thk2_a, thk2_b, thk2_c), (theta_a, theta_b, theta_c)
+
+    if load_type == "balanced_axial_unbalanced_moment":
+        # AXIAL, chord side and brace side (crowns and saddles use the same equations)
+        axial_chord = k1(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab, d2_c, thk2_c, theta_c, g_bc)
+        axial_brace = k2(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab, d2_c, thk2_c, theta_c, g_bc)
+        axial_chord_crowns = axial_chord_saddles = axial_chord
+        axial_brace_crowns = axial_brace_saddles = axial_brace
+        # OPB, chord side saddles
+        scf_opb_a_chord_saddle, scf_opb_c_chord_saddle = kt1(d1, d2_a, d2_b, d2_c, thk1, thk2_a, thk2_b, thk2_c,
+                                                             theta_a, theta_b, theta_c, g_ab, g_bc)
+        scf_opb_b_chord_saddle = kt2(d1, d2_a, d2_b, d2_c, thk1, thk2_a, thk2_b, thk2_c, theta_a, theta_b, theta_c,
+                                     g_ab, g_bc)
+
+    elif load_type == "single_brace_load":
+        # AXIAL
+        axial_chord_crowns = [t6(d1, d2, thk1, thk2, L, theta, c) for d2, thk2, theta in zip(d2s, thk2s, thetas)]
+        axial_brace_crowns = [t7(d1, d2, thk1, thk2, L, c) for d2, thk2 in zip(d2s, thk2s)]
+        axial_chord_saddles = [t5(d1, d2, thk1, thk2, L, theta, c) for d2, thk2, theta in zip(d2s, thk2s, thetas)]
+        axial_brace_saddles = [t3(d1, d2, thk1, thk2, L, theta) for d2, thk2, theta in zip(d2s, thk2s, thetas)]
+        # OPB, chord side saddles brace a and c, then brace b
+        scf_opb_a_chord_saddle, scf_opb_c_chord_saddle = kt3(d1, d2_a, d2_b, d2_c, thk1, thk2_a, thk2_c, theta_a,
+                                                             theta_c, g_ab, g_bc)
+        scf_opb_b_chord_saddle = kt4(d1, d2_a, d2_b, d2_c, thk1, thk2_b, theta_b, g_ab, g_bc)
+
+    else:
+        raise ValueError(f"load_type {load_type} not allowed, use one of {K_LOAD_TYPES}")
+
+    # IPB, same for both load types
+    ipb_chord_crowns = [t8(d1, d2, thk1, thk2, theta) for d2, thk2, theta in zip(d2s, thk2s, thetas)]
+    ipb_brace_crowns = [t9(d1, d2, thk1, thk2, theta) for d2, thk2, theta in zip(d2s, thk2s, thetas)]
+    # OPB brace side saddles from the chord side
+    opb_chord_saddles = (scf_opb_a_chord_saddle, scf_opb_b_chord_saddle, scf_opb_c_chord_saddle)
+    opb_brace_saddles = [opb_brace(d1, d2, thk1, thk2, scf_chord)
+                         for d2, thk2, scf_chord in zip(d2s, thk2s, opb_chord_saddles)]
+
+    # interleave chord side and brace side per brace, as KT_LOCS
+    scfs = []
+    for chord_side, brace_side in ((axial_chord_crowns, axial_brace_crowns), (axial_chord_saddles, axial_brace_saddles),
+                                   (ipb_chord_crowns, ipb_brace_crowns), (opb_chord_saddles, opb_brace_saddles)):
+        for scf_chord, scf_brace in zip(chord_side, brace_side):
+            scfs += [scf_chord, scf_brace]
+
+    return np.stack(np.broadcast_arrays(*scfs))
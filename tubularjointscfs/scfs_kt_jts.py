@@ -1,8 +1,9 @@
 import  numpy as np
-from tubularjointscfs.efthymiou.scf import k1, k2, t8, t9, k4, k5, t5, t7, t6, t3, k7, k6, kt1, kt2, kt3, kt4, opb_brace  # chord scfs
+from tubularjointscfs.scfengine import k_joint_scfs_arr, kt_joint_scfs_arr
 import copy
 
 from tubularjointscfs.core import tubular_cross_section_area, tubular_second_moment_of_area
+from timing import timed
 
 """
 Table B-3 Stress concentration factors for simple tubular K joints
@@ -114,6 +115,7 @@ class KTJointSCFManager:
         self.brace_c_area_ratios = []
         self.brace_c_bending_stiffness_ratios = []
 
+    @timed()
     def get_joint_scfs(self, load_type):
         """public method to calculate scfs for K- and KT- joint
         """
@@ -208,64 +210,9 @@ class KTJointSCFManager:
         self.params = np.linspace(param_strt, param_end, nvars)
 
     def _calculate_k_scfs(self, d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab, L, load_type="balanced_axial_unbalanced_moment", ndps=2):
-
-        # calculate SCFs with varied parameter
-        if load_type == "balanced_axial_unbalanced_moment":
-            # AXIAL LOAD SCFs-------------------------------------------------------------------------------------------------------
-            # brace A and B, crowns and saddles
-            scf_axial_a_chord_crown, scf_axial_b_chord_crown, _ = k1(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab)
-            scf_axial_a_brace_crown, scf_axial_b_brace_crown, _ = k2(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab)
-            # saddles
-            scf_axial_a_chord_saddle, scf_axial_b_chord_saddle, _ = k1(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab)
-            scf_axial_a_brace_saddle, scf_axial_b_brace_saddle, _ = k2(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab)
-            # IPB LOAD SCFs-------------------------------------------------------------------------------------------------------
-            # brace A
-            scf_ipb_a_chord_crown = t8(d1, d2_a, thk1, thk2_a, theta_a)  # chordside
-            scf_ipb_a_brace_crown = t9(d1, d2_a, thk1, thk2_a, theta_a)  # braceside
-            # brace B
-            scf_ipb_b_chord_crown = t8(d1, d2_b, thk1, thk2_b, theta_b)  # chordside
-            scf_ipb_b_brace_crown = t9(d1, d2_b, thk1, thk2_b, theta_b)  # braceside
-            # OPB LOAD SCFs-------------------------------------------------------------------------------------------------------
-            # brace A and brace B chord-side saddle SCFs
-            scf_opb_a_chord_saddle, scf_opb_b_chord_saddle = k4(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab)
-            # brace A and brace B brace-side saddle SCFs
-            scf_opb_a_brace_saddle, scf_opb_b_brace_saddle = k5(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab)
-
-        elif load_type == "single_brace_load":
-            c = 0.7  # chord end fixity default
-            ## AXIAL SCFs
-            # brace A
-            scf_axial_a_chord_crown = t6(d1, d2_a, thk1, thk2_a, L, theta_a, c)  # chordside
-            scf_axial_a_brace_crown = t7(d1, d2_a, thk1, thk2_a, L, c)  # braceside
-            scf_axial_a_chord_saddle = t5(d1, d2_a, thk1, thk2_a, L, theta_a, c) # chordside
-            scf_axial_a_brace_saddle = t3(d1, d2_a, thk1, thk2_a, L, theta_a) # braceside
-            # brace B
-            scf_axial_b_chord_crown = t6(d1, d2_b, thk1, thk2_b, L, theta_b, c)  # chordside
-            scf_axial_b_brace_crown = t7(d1, d2_b, thk1, thk2_b, L, c)  # braceside
-            scf_axial_b_chord_saddle = t5(d1, d2_b, thk1, thk2_b, L, theta_b, c)  # chordside
-            scf_axial_b_brace_saddle = t3(d1, d2_b, thk1, thk2_b, L, theta_b)  # braceside
-            ## IPB SCFs
-            # brace A
-            scf_ipb_a_chord_crown = t8(d1, d2_a, thk1, thk2_a, theta_a)  # chordside
-            scf_ipb_a_brace_crown = t9(d1, d2_a, thk1, thk2_a, theta_a)  # braceside
-            # brace B
-            scf_ipb_b_chord_crown = t8(d1, d2_b, thk1, thk2_b, theta_b)  # chordside
-            scf_ipb_b_brace_crown = t9(d1, d2_b, thk1, thk2_b, theta_b)  # braceside
-            ## OPB SCFs (for consistency, just written out equations twice)
-            # brace A
-            scf_opb_a_chord_saddle, _ = k6(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab)  # chordside
-            scf_opb_a_brace_saddle, _ = k7(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab)  # braceside
-            # brace B
-            _, scf_opb_b_chord_saddle = k6(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab)  # chordside
-            _, scf_opb_b_brace_saddle = k7(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab)  # braceside
-
-        else:
-            print("Load type not allowed...Try again.")
-
-        scfs = (scf_axial_a_chord_crown, scf_axial_a_brace_crown, scf_axial_b_chord_crown, scf_axial_b_brace_crown,  # brace a axial, brace b axial saddles
-                scf_axial_a_chord_saddle, scf_axial_a_brace_saddle, scf_axial_b_chord_saddle, scf_axial_b_brace_saddle,  # brace a axial, brace b axial saddles
-                scf_ipb_a_chord_crown, scf_ipb_a_brace_crown, scf_ipb_b_chord_crown, scf_ipb_b_brace_crown,  # brace a ipb, brace b ipb
-                scf_opb_a_chord_saddle, scf_opb_a_brace_saddle, scf_opb_b_chord_saddle, scf_opb_b_brace_saddle)  # brace a opb, brace b opb
+        """16 SCFs for brace A and B, see scfengine.K_LOCS for the order
+        """
+        scfs = k_joint_scfs_arr(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab, L, load_type)
 
         scfs = [round(scf, ndps) for scf in scfs]
 
@@ -278,105 +225,10 @@ class KTJointSCFManager:
                            theta_a, theta_b, theta_c,
                            g_ab, g_bc,
                            L, load_type="balanced_axial_unbalanced_moment", ndps=2):
-
-        # calculate SCFs with varied parameter
-        if load_type == "balanced_axial_unbalanced_moment":
-            # AXIAL LOAD SCFs-------------------------------------------------------------------------------------------------------
-            # brace A and B, crowns and saddles
-            # chord side crowns
-
-            (scf_axial_a_chord_crown,
-             scf_axial_b_chord_crown,
-             scf_axial_c_chord_crown) = k1(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab, d2_c, thk2_c, theta_c, g_bc)
-            # chord side saddles
-            (scf_axial_a_chord_saddle,
-             scf_axial_b_chord_saddle,
-             scf_axial_c_chord_saddle) = k1(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab, d2_c, thk2_c, theta_c, g_bc)
-
-            # brace side
-            (scf_axial_a_brace_crown,
-             scf_axial_b_brace_crown,
-             scf_axial_c_brace_crown) = k2(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab, d2_c, thk2_c, theta_c, g_bc)
-            # saddles
-            (scf_axial_a_brace_saddle,
-             scf_axial_b_brace_saddle,
-             scf_axial_c_brace_saddle) = k2(d1, d2_a, d2_b, thk1, thk2_a, thk2_b, theta_a, theta_b, g_ab, d2_c, thk2_c, theta_c, g_bc)
-
-            # IPB LOAD SCFs-------------------------------------------------------------------------------------------------------
-            # brace A
-            scf_ipb_a_chord_crown = t8(d1, d2_a, thk1, thk2_a, theta_a)  # chordside
-            scf_ipb_a_brace_crown = t9(d1, d2_a, thk1, thk2_a, theta_a)  # braceside
-            # brace B
-            scf_ipb_b_chord_crown = t8(d1, d2_b, thk1, thk2_b, theta_b)  # chordside
-            scf_ipb_b_brace_crown = t9(d1, d2_b, thk1, thk2_b, theta_b)  # braceside
-            # brace C
-            scf_ipb_c_chord_crown = t8(d1, d2_c, thk1, thk2_c, theta_c)  # chordside
-            scf_ipb_c_brace_crown = t9(d1, d2_c, thk1, thk2_c, theta_c)  # braceside
-
-            # OPB LOAD SCFs---------------------------------------------------------------------------------------------
-            # chord side saddles
-            (scf_opb_a_chord_saddle,
-             scf_opb_c_chord_saddle) = kt1(d1, d2_a, d2_b, d2_c, thk1, thk2_a, thk2_b, thk2_c, theta_a, theta_b, theta_c, g_ab, g_bc)
-
-            scf_opb_b_chord_saddle = kt2(d1, d2_a, d2_b, d2_c, thk1, thk2_a, thk2_b, thk2_c, theta_a, theta_b, theta_c,
-                                         g_ab, g_bc)
-
-            # brace side saddles
-            scf_opb_a_brace_saddle = opb_brace(d1, d2_a, thk1, thk2_a, scf_opb_a_chord_saddle)
-            scf_opb_b_brace_saddle = opb_brace(d1, d2_b, thk1, thk2_b, scf_opb_b_chord_saddle)
-            scf_opb_c_brace_saddle = opb_brace(d1, d2_c, thk1, thk2_c, scf_opb_c_chord_saddle)
-
-        elif load_type == "single_brace_load":
-            c = 0.7  # chord end fixity default
-            ## AXIAL SCFs
-            # brace A
-            scf_axial_a_chord_crown = t6(d1, d2_a, thk1, thk2_a, L, theta_a, c)  # chordside
-            scf_axial_a_brace_crown = t7(d1, d2_a, thk1, thk2_a, L, c)  # braceside
-            scf_axial_a_chord_saddle = t5(d1, d2_a, thk1, thk2_a, L, theta_a, c) # chordside
-            scf_axial_a_brace_saddle = t3(d1, d2_a, thk1, thk2_a, L, theta_a) # braceside
-            # brace B
-            scf_axial_b_chord_crown = t6(d1, d2_b, thk1, thk2_b, L, theta_b, c)  # chordside
-            scf_axial_b_brace_crown = t7(d1, d2_b, thk1, thk2_b, L, c)  # braceside
-            scf_axial_b_chord_saddle = t5(d1, d2_b, thk1, thk2_b, L, theta_b, c)  # chordside
-            scf_axial_b_brace_saddle = t3(d1, d2_b, thk1, thk2_b, L, theta_b)  # braceside
-            # brace C
-            scf_axial_c_chord_crown = t6(d1, d2_c, thk1, thk2_c, L, theta_c, c)  # chordside
-            scf_axial_c_brace_crown = t7(d1, d2_c, thk1, thk2_c, L, c)  # braceside
-            scf_axial_c_chord_saddle = t5(d1, d2_c, thk1, thk2_c, L, theta_c, c)  # chordside
-            scf_axial_c_brace_saddle = t3(d1, d2_c, thk1, thk2_c, L, theta_c) # braceside
-
-            ## IPB SCFs
-            # brace A
-            scf_ipb_a_chord_crown = t8(d1, d2_a, thk1, thk2_a, theta_a)  # chordside
-            scf_ipb_a_brace_crown = t9(d1, d2_a, thk1, thk2_a, theta_a)  # braceside
-            # brace B
-            scf_ipb_b_chord_crown = t8(d1, d2_b, thk1, thk2_b, theta_b)  # chordside
-            scf_ipb_b_brace_crown = t9(d1, d2_b, thk1, thk2_b, theta_b)  # braceside
-            # brace C
-            scf_ipb_c_chord_crown = t8(d1, d2_c, thk1, thk2_c, theta_c)  # chordside
-            scf_ipb_c_brace_crown = t9(d1, d2_c, thk1, thk2_c, theta_c)  # braceside
-
-            ## OPB SCFs (for consistency, just written out equations twice)
-            # chord side, brace a and c, then brace b
-            scf_opb_a_chord_saddle, scf_opb_c_chord_saddle = kt3(d1, d2_a, d2_b, d2_c, thk1, thk2_a, thk2_c, theta_a, theta_c, g_ab, g_bc)
-            scf_opb_b_chord_saddle = kt4(d1, d2_a, d2_b, d2_c, thk1, thk2_b, theta_b, g_ab, g_bc)
-            # brace side, brace a, b and c
-            scf_opb_a_brace_saddle = opb_brace(d1, d2_a, thk1, thk2_a, scf_opb_a_chord_saddle)
-            scf_opb_b_brace_saddle = opb_brace(d1, d2_b, thk1, thk2_b, scf_opb_b_chord_saddle)
-            scf_opb_c_brace_saddle = opb_brace(d1, d2_c, thk1, thk2_c, scf_opb_c_chord_saddle)
-
-        else:
-            print("Load type not allowed...Try again.")
-
-        # SCFs for braces A, B and C
-        scfs = (scf_axial_a_chord_crown, scf_axial_a_brace_crown, scf_axial_b_chord_crown, scf_axial_b_brace_crown,  # brace a axial, brace b axial saddles
-                scf_axial_c_chord_crown, scf_axial_c_brace_crown,
-                scf_axial_a_chord_saddle, scf_axial_a_brace_saddle, scf_axial_b_chord_saddle, scf_axial_b_brace_saddle,  # brace a axial, brace b axial saddles
-                scf_axial_c_chord_saddle, scf_axial_c_brace_saddle,
-                scf_ipb_a_chord_crown, scf_ipb_a_brace_crown, scf_ipb_b_chord_crown, scf_ipb_b_brace_crown,  # brace a ipb, brace b ipb
-                scf_ipb_c_chord_crown, scf_ipb_c_brace_crown,
-                scf_opb_a_chord_saddle, scf_opb_a_brace_saddle, scf_opb_b_chord_saddle, scf_opb_b_brace_saddle,
-                scf_opb_c_chord_saddle, scf_opb_c_brace_saddle)  # brace a opb, brace b opb, brace c opb
+        """24 SCFs for braces A, B and C, see scfengine.KT_LOCS for the order
+        """
+        scfs = kt_joint_scfs_arr(d1, d2_a, d2_b, d2_c, thk1, thk2_a, thk2_b, thk2_c, theta_a, theta_b, theta_c,
+                                 g_ab, g_bc, L, load_type)
 
         scfs = [round(scf, ndps) for scf in scfs]
 
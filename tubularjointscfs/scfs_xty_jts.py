@@ -3,6 +3,7 @@ import copy
 # local imports
 from tubularjointscfs.efthymiou.scf import x1, x2, x3, x4, t8, t9, x5, x6, x7, t1, t2, t3, t4, t6, x8, t7, t10, t11
 from tubularjointscfs.core import tubular_cross_section_area, tubular_second_moment_of_area
+from timing import timed
 
 
 class XTYJointSCFManager:
@@ -57,6 +58,7 @@ class XTYJointSCFManager:
         self.brace_a_area_ratios = []
         self.brace_a_bending_stiffness_ratios = []
 
+    @timed()
     def get_joint_scfs(self, load_type):
 
         if self.joint_type == "x":